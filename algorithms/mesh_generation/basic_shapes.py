@@ -1,5 +1,7 @@
 import math
+import numpy
 from mathutils import Vector
+from ... data_structures.vector_list import Vector3DList, toVector3DList
 
 def gridVertices(xDivisions, yDivisions, xDistance = 1, yDistance = 1, offset = Vector((0, 0, 0))):
     vertices = []
@@ -10,10 +12,32 @@ def gridVertices(xDivisions, yDivisions, xDistance = 1, yDistance = 1, offset =
     return vertices
 
 def tubeVertices(centerPoints, ringPoints, tangents, resolution):
-    vertices = []
-    for center, pointOnCircle, tangent in zip(centerPoints, ringPoints, tangents):
-        vertices.extend(alignedCircleVertices(center, pointOnCircle, tangent, resolution))
-    return vertices
+    '''
+    Creates a circle of vertices around every center point.
+    All circles are calculated at once.
+    '''
+    centers = toVector3DList(centerPoints).asNumpyArray().astype(numpy.float64)
+    ringPoints = toVector3DList(ringPoints).asNumpyArray().astype(numpy.float64)
+    tangents = toVector3DList(tangents).asNumpyArray().astype(numpy.float64)
+
+    dirX = ringPoints - centers
+    radii = numpy.sqrt(numpy.einsum("ij,ij->i", dirX, dirX))
+    dirY = normalizeRows(numpy.cross(tangents, dirX))
+    dirX = normalizeRows(dirX)
+
+    angles = numpy.arange(resolution) * (2 * math.pi / resolution)
+    cos = numpy.cos(angles)[numpy.newaxis, :, numpy.newaxis]
+    sin = numpy.sin(angles)[numpy.newaxis, :, numpy.newaxis]
+
+    offsets = cos * dirX[:, numpy.newaxis, :] + sin * dirY[:, numpy.newaxis, :]
+    vertices = centers[:, numpy.newaxis, :] + radii[:, numpy.newaxis, numpy.newaxis] * offsets
+    return Vector3DList.fromNumpyArray(vertices.reshape(-1, 3))
+
+def normalizeRows(vectors):
+    # zero vectors stay zero like in Vector.normalized()
+    lengths = numpy.sqrt(numpy.einsum("ij,ij->i", vectors, vectors))
+    lengths[lengths == 0] = 1
+    return vectors / lengths[:, numpy.newaxis]
 
 def alignedCircleVertices(center, pointOnCircle, tangent, resolution):
     dirX = pointOnCircle - center
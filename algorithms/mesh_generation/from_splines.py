@@ -1,3 +1,6 @@
+import numpy
+from mathutils import Vector
+from ... data_structures.vector_list import Vector3DList
 from ... data_structures.splines.bezier_spline import BezierSpline
 from ... data_structures.splines.poly_spline import PolySpline
 from . indices_utils import gridQuadPolygonIndices, tubeQuadPolygonIndices
@@ -12,8 +15,6 @@ def loftSplines(splines,
                 uniformConverterResolution = 100, splineDistributionType = "RESOLUTION", surfaceDistributionType = "RESOLUTION",
                 startSurfaceParameter = 0.0, endSurfaceParameter = 1.0):
 
-    vertices = []
-
     isRealCyclic = cyclic and startSurfaceParameter <= 0.0 and endSurfaceParameter >= 1.0
 
     if splineDistributionType == "RESOLUTION":
@@ -21,7 +22,12 @@ def loftSplines(splines,
     elif splineDistributionType == "UNIFORM":
         samples = [spline.getUniformSamples(nSplineSamples, resolution = uniformConverterResolution) for spline in splines]
 
-    for points in zip(*samples):
+    # shape: (splines, spline samples, 3)
+    sampleArray = numpy.array([points.asNumpyArray() for points in samples]).reshape(len(splines), nSplineSamples, 3)
+
+    surfaceVertices = []
+    for points in sampleArray.transpose(1, 0, 2):
+        points = [Vector(point) for point in points]
         if type == "BEZIER":
             spline = BezierSpline.fromLocations(points)
             spline.isCyclic = cyclic
@@ -34,11 +40,15 @@ def loftSplines(splines,
         amount = nSurfaceSamples + int(isRealCyclic)
 
         if surfaceDistributionType == "RESOLUTION":
-            vertices.extend(spline.getSamples(amount, start = startSurfaceParameter, end = endSurfaceParameter))
+            vertices = spline.getSamples(amount, start = startSurfaceParameter, end = endSurfaceParameter)
         elif surfaceDistributionType == "UNIFORM":
-            vertices.extend(spline.getUniformSamples(amount, resolution = uniformConverterResolution, start = startSurfaceParameter, end = endSurfaceParameter))
+            vertices = spline.getUniformSamples(amount, resolution = uniformConverterResolution, start = startSurfaceParameter, end = endSurfaceParameter)
+
+        vertices = vertices.asNumpyArray()
+        if isRealCyclic: vertices = vertices[:-1]
+        surfaceVertices.append(vertices)
 
-        if isRealCyclic: del vertices[-1]
+    vertices = Vector3DList.fromNumpyArray(numpy.concatenate(surfaceVertices or [numpy.zeros((0, 3))]))
 
     if isRealCyclic:
         polygons = tubeQuadPolygonIndices(nSplineSamples, nSurfaceSamples)
@@ -53,17 +63,11 @@ def loftSplines(splines,
 
 def revolveProfileAroundAxis(axis, profile, nSplineSamples, nSurfaceSamples, type = "PARAMETER"):
     if type == "PARAMETER":
-        axisSamples = axis.getSamples(nSplineSamples)
+        axisSamples, tangents = axis.getSamplesAndTangents(nSplineSamples)
         profileSamples = profile.getSamples(nSplineSamples)
-        tangents = axis.getTangentSamples(nSplineSamples)
     if type == "PROJECT":
         profileSamples = profile.getSamples(nSplineSamples)
-        axisSamples = []
-        tangents = []
-        for point in profileSamples:
-            location, tangent = axis.projectExtended(point)
-            axisSamples.append(location)
-            tangents.append(tangent)
+        axisSamples, tangents = axis.projectExtendedMany(profileSamples)
 
     vertices = tubeVertices(axisSamples, profileSamples, tangents, nSurfaceSamples)
     polygons = tubeQuadPolygonIndices(nSplineSamples, nSurfaceSamples)
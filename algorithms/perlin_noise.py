@@ -1,10 +1,19 @@
-from . random import getUniformRandom
+import numpy
+from . random import getRandomNumberCache, cacheSize
 
 # setup a cache for faster results
 smoothNoiseCacheSize = 50000
-smoothNoiseCache = []
-for i in range(smoothNoiseCacheSize):
-    smoothNoiseCache.append(getUniformRandom(i, -1, 1)/2.0 + getUniformRandom(i-1, -1, 1)/4.0 + getUniformRandom(i+1, -1, 1)/4.0)
+smoothNoiseCache = None
+
+def getSmoothNoiseCache():
+    global smoothNoiseCache
+    if smoothNoiseCache is None:
+        randomNumbers = getRandomNumberCache()
+        indices = numpy.arange(-1, smoothNoiseCacheSize + 1) % cacheSize
+        uniform = -1 + randomNumbers[indices] * 2
+        smoothNoise = uniform[1:-1] / 2.0 + uniform[:-2] / 4.0 + uniform[2:] / 4.0
+        smoothNoiseCache = smoothNoise.tolist()
+    return smoothNoiseCache
 
 # http://freespace.virgin.net/hugo.elias/models/m_perlin.htm
 def perlinNoise(x, persistance, octaves):
@@ -17,6 +26,7 @@ def perlinNoise(x, persistance, octaves):
 
 def interpolatedNoise(x):
     intX = int(x)
+    smoothNoiseCache = getSmoothNoiseCache()
     v1 = smoothNoiseCache[intX % smoothNoiseCacheSize]
     v2 = smoothNoiseCache[(intX+1) % smoothNoiseCacheSize]
     v3 = smoothNoiseCache[(intX+2) % smoothNoiseCacheSize]
@@ -1,18 +1,72 @@
+import os
+import tempfile
 import numpy
 import random
 from mathutils import Vector, Color
 from .. utils.timing import measureTime
+from .. utils.path import getAddonDataDirectory
 
-randomNumberCache = []
+# The cache is created when it is needed for the first time.
+# It is stored in the addon data folder and memory-mapped afterwards,
+# so that only the pages that are actually used are loaded.
 cacheSize = int(2e7)
-numpy.random.seed(1234)
-randomNumberCache = numpy.random.random(cacheSize)
+cacheSeed = 1234
+cacheFileName = "random_number_cache_{}_{}.npy".format(cacheSeed, cacheSize)
+randomNumberCache = None
 
 def getRandomNumberCache():
+    global randomNumberCache
+    if randomNumberCache is None:
+        randomNumberCache = loadRandomNumberCache()
+        if randomNumberCache is None:
+            randomNumberCache = createRandomNumberCache()
+            saveRandomNumberCache(randomNumberCache)
     return randomNumberCache
 
 def getUniformRandom(seed, min, max):
-    return min + randomNumberCache[seed % cacheSize] * (max - min)
+    return min + getRandomNumberCache()[seed % cacheSize] * (max - min)
+
+def createRandomNumberCache():
+    # same values as the previous numpy.random.seed(1234); numpy.random.random(...)
+    # without changing the global random state of numpy
+    return numpy.random.RandomState(cacheSeed).random_sample(cacheSize)
+
+def loadRandomNumberCache():
+    path = getRandomNumberCachePath()
+    if path is None or not os.path.exists(path): return None
+
+    try: cache = numpy.load(path, mmap_mode = "r")
+    except: return None
+
+    if not isValidRandomNumberCache(cache): return None
+    # indexing a plain array is faster, the memory stays mapped
+    return cache.view(numpy.ndarray)
+
+def isValidRandomNumberCache(cache):
+    if cache.shape != (cacheSize, ) or cache.dtype != numpy.float64: return False
+    expectedStart = numpy.random.RandomState(cacheSeed).random_sample(16)
+    return numpy.array_equal(cache[:16], expectedStart)
+
+def saveRandomNumberCache(cache):
+    path = getRandomNumberCachePath()
+    if path is None: return
+
+    try:
+        # other Blender instances can write the same file at the same time
+        fileDescriptor, temporaryPath = tempfile.mkstemp(dir = os.path.dirname(path), suffix = ".tmp")
+        try:
+            with os.fdopen(fileDescriptor, "wb") as f:
+                numpy.save(f, cache)
+            os.replace(temporaryPath, path)
+        except:
+            os.remove(temporaryPath)
+            raise
+    except: pass
+
+def getRandomNumberCachePath():
+    directory = getAddonDataDirectory("random")
+    if directory is None: return None
+    return os.path.join(directory, cacheFileName)
 
 def getRandomColor(seed = None, hue = None, saturation = None, value = None):
     if seed is None: random.seed()
@@ -0,0 +1,213 @@
+import os
+import wave
+import numpy
+
+# Decoders get a file path and return (samples, sampleRate).
+# The samples are a float array with the shape (sampleAmount, channelAmount).
+soundDecoders = {}
+
+def registerSoundDecoder(extension, decoder):
+    soundDecoders[extension.lower()] = decoder
+
+def readSoundFile(path):
+    '''
+    Returns the mono samples as float array in [-1, 1] and the sample rate.
+    Raises a SoundDecodingError when the file cannot be decoded.
+    '''
+    extension = os.path.splitext(path)[1].lower()
+    decoders = [soundDecoders[extension]] if extension in soundDecoders else []
+    decoders.append(readSoundWithAudaspace)
+
+    for decoder in decoders:
+        try: samples, sampleRate = decoder(path)
+        except SoundDecodingError: continue
+        samples = numpy.asarray(samples, dtype = numpy.float32)
+        if samples.ndim == 2: samples = samples.mean(axis = 1)
+        return samples, sampleRate
+
+    raise SoundDecodingError("Cannot decode sound file: " + path)
+
+class SoundDecodingError(Exception):
+    pass
+
+
+# Decoders
+################################
+
+def readWaveFile(path):
+    try:
+        with wave.open(path, "rb") as file:
+            channelAmount = file.getnchannels()
+            sampleWidth = file.getsampwidth()
+            sampleRate = file.getframerate()
+            data = file.readframes(file.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise SoundDecodingError(str(e))
+
+    if sampleWidth == 1:
+        samples = (numpy.frombuffer(data, dtype = numpy.uint8).astype(numpy.float32) - 128) / 128
+    elif sampleWidth == 2:
+        samples = numpy.frombuffer(data, dtype = "<i2").astype(numpy.float32) / 2 ** 15
+    elif sampleWidth == 3:
+        parts = numpy.frombuffer(data, dtype = numpy.uint8).reshape(-1, 3).astype(numpy.int32)
+        values = parts[:, 0] | (parts[:, 1] << 8) | (parts[:, 2] << 16)
+        values -= (values & 0x800000) << 1
+        samples = values.astype(numpy.float32) / 2 ** 23
+    elif sampleWidth == 4:
+        samples = numpy.frombuffer(data, dtype = "<i4").astype(numpy.float32) / 2 ** 31
+    else:
+        raise SoundDecodingError("Unsupported sample width: {}".format(sampleWidth))
+
+    return samples.reshape(-1, channelAmount), sampleRate
+
+def readSoundWithAudaspace(path):
+    # the aud module of newer Blender versions can decode all formats Blender supports
+    try:
+        import aud
+        sound = aud.Sound(path)
+        sampleRate = sound.specs[0]
+        return sound.data(), sampleRate
+    except Exception as e:
+        raise SoundDecodingError(str(e))
+
+registerSoundDecoder(".wav", readWaveFile)
+registerSoundDecoder(".wave", readWaveFile)
+
+
+# Baking
+################################
+
+def bakeFrequencyBands(samples, sampleRate, fps, frequencyRanges, attack = 0.005, release = 0.2, chunkSize = 256):
+    '''
+    Returns an array with the shape (frameAmount, len(frequencyRanges)).
+    All bands are computed from the same short-time fourier transform
+    with one window per frame. The values are the peak amplitudes of a sine
+    wave with the power of the band, smoothed with the attack and release times.
+    This is the scale of the graph editor sound bake for tonal sounds, noisy
+    sounds get lower values because the graph editor follows every peak.
+    '''
+    for progress, result in iterFrequencyBandBaking(samples, sampleRate, fps, frequencyRanges, attack, release, chunkSize):
+        pass
+    return result
+
+def iterFrequencyBandBaking(samples, sampleRate, fps, frequencyRanges, attack = 0.005, release = 0.2, chunkSize = 256):
+    '''Yields (progress, None) after every chunk of frames and (1.0, result) at the end'''
+    samples = numpy.asarray(samples, dtype = numpy.float32).ravel()
+    frequencyRanges = numpy.asarray(frequencyRanges, dtype = numpy.float64).reshape(-1, 2)
+    samplesPerFrame = sampleRate / fps
+    frameAmount = int(numpy.ceil(len(samples) / samplesPerFrame)) if len(samples) > 0 else 0
+    if frameAmount == 0 or len(frequencyRanges) == 0:
+        yield 1.0, numpy.zeros((frameAmount, len(frequencyRanges)), dtype = numpy.float32)
+        return
+
+    windowSize = getWindowSize(samplesPerFrame)
+    window = numpy.hanning(windowSize).astype(numpy.float32)
+    binFrequencies = numpy.fft.rfftfreq(windowSize, 1 / sampleRate)
+    firstBins = numpy.searchsorted(binFrequencies, frequencyRanges[:, 0], side = "left")
+    lastBins = numpy.searchsorted(binFrequencies, frequencyRanges[:, 1], side = "right")
+
+    # Parseval: the mean power of the windowed signal is the sum over the spectrum
+    binWeights = numpy.full(len(binFrequencies), 2.0)
+    binWeights[0] = 1
+    if windowSize % 2 == 0: binWeights[-1] = 1
+    binWeights /= windowSize * numpy.sum(window.astype(numpy.float64) ** 2)
+
+    # the window of every frame is centered at the frame
+    paddedSamples = numpy.pad(samples, (windowSize, windowSize + int(samplesPerFrame) + 1), mode = "constant")
+    frameCenters = numpy.round(numpy.arange(frameAmount) * samplesPerFrame).astype(numpy.int64) + windowSize
+    windowOffsets = numpy.arange(windowSize) - windowSize // 2
+
+    amplitudes = numpy.empty((frameAmount, len(frequencyRanges)), dtype = numpy.float32)
+    for start in range(0, frameAmount, chunkSize):
+        centers = frameCenters[start:start + chunkSize]
+        frames = paddedSamples[centers[:, numpy.newaxis] + windowOffsets] * window
+        power = numpy.abs(numpy.fft.rfft(frames, axis = 1)) ** 2 * binWeights
+        cumulativePower = numpy.zeros((len(frames), power.shape[1] + 1))
+        numpy.cumsum(power, axis = 1, out = cumulativePower[:, 1:])
+        bandPower = cumulativePower[:, lastBins] - cumulativePower[:, firstBins]
+        # peak amplitude of a sine wave with this power
+        amplitudes[start:start + len(frames)] = numpy.sqrt(2 * numpy.maximum(bandPower, 0))
+        yield (start + len(frames)) / frameAmount * 0.9, None
+
+    yield 1.0, applyEnvelope(amplitudes, 1 / fps, attack, release)
+
+def getWindowSize(samplesPerFrame):
+    # two frames long, so that neighboring windows overlap
+    return int(2 ** numpy.ceil(numpy.log2(max(samplesPerFrame * 2, 16))))
+
+
+# Envelope
+################################
+
+def applyEnvelope(values, timeStep, attack, release, maxIterations = 20):
+    '''
+    Follows rising values with the attack time and falling values with the release time.
+    The recurrence is linear once it is known which frames are rising. The guess is
+    improved until it matches the result, all frames before the first wrong guess
+    are always correct. The sequential loop is only used when this does not converge.
+    '''
+    attackFactor = getSmoothingFactor(timeStep, attack)
+    releaseFactor = getSmoothingFactor(timeStep, release)
+    values = numpy.asarray(values, dtype = numpy.float64)
+    if len(values) == 0: return values.astype(numpy.float32)
+
+    isRising = values > getPreviousValues(values)
+    for i in range(maxIterations):
+        factors = numpy.where(isRising, attackFactor, releaseFactor)
+        result = solveLinearRecurrence(factors, (1 - factors) * values)
+        newIsRising = values > getPreviousValues(result)
+        if numpy.array_equal(newIsRising, isRising):
+            return result.astype(numpy.float32)
+        isRising = newIsRising
+
+    return applyEnvelopeSequentially(values, attackFactor, releaseFactor).astype(numpy.float32)
+
+def applyEnvelopeSequentially(values, attackFactor, releaseFactor):
+    result = numpy.empty_like(values)
+    current = numpy.zeros(values.shape[1:], dtype = values.dtype)
+    for i, value in enumerate(values):
+        factors = numpy.where(value > current, attackFactor, releaseFactor)
+        current = value + factors * (current - value)
+        result[i] = current
+    return result
+
+def getPreviousValues(values):
+    previous = numpy.zeros_like(values)
+    previous[1:] = values[:-1]
+    return previous
+
+def solveLinearRecurrence(a, b):
+    '''
+    Returns y with y[i] = a[i] * y[i - 1] + b[i] and y[-1] = 0 along the first axis.
+    The blocks are solved at the same time, only their start values are
+    computed one after another. This needs about 2 * sqrt(n) numpy operations.
+    '''
+    length = len(a)
+    blockSize = max(int(numpy.sqrt(length)), 1)
+    blockAmount = -(-length // blockSize)
+    padding = blockAmount * blockSize - length
+    shape = (blockAmount, blockSize) + a.shape[1:]
+    a = numpy.concatenate([a, numpy.ones((padding, ) + a.shape[1:])]).reshape(shape)
+    b = numpy.concatenate([b, numpy.zeros((padding, ) + b.shape[1:])]).reshape(shape)
+
+    # solution of every block when it starts with 0
+    local = numpy.empty(shape)
+    current = numpy.zeros((blockAmount, ) + shape[2:])
+    for i in range(blockSize):
+        current = a[:, i] * current + b[:, i]
+        local[:, i] = current
+    products = numpy.cumprod(a, axis = 1)
+
+    starts = numpy.empty((blockAmount, ) + shape[2:])
+    end = numpy.zeros(shape[2:])
+    for k in range(blockAmount):
+        starts[k] = end
+        end = local[k, -1] + products[k, -1] * end
+
+    result = local + products * starts[:, numpy.newaxis]
+    return result.reshape((-1, ) + shape[2:])[:length]
+
+def getSmoothingFactor(timeStep, duration):
+    # like the graph editor bake: the distance to the target falls to 10 percent in this time
+    if duration <= 0: return 0.0
+    return float(0.1 ** (timeStep / duration))
@@ -0,0 +1,98 @@
+import numpy
+from itertools import product
+from .. data_structures.kd_tree import expandRanges
+
+neighborCellOffsets = numpy.array(list(product((-1, 0, 1), repeat = 3)), dtype = numpy.int64)
+
+class UniformGrid:
+    '''
+    Sorts points into cubic cells with the given size.
+    Points closer than the cell size are always in neighboring cells.
+    '''
+    def __init__(self, points, cellSize):
+        self.points = points
+        self.cellSize = cellSize
+
+        cells = numpy.floor(points / cellSize).astype(numpy.int64)
+        self.cellOffset = cells.min(axis = 0) - 1 if len(points) > 0 else numpy.zeros(3, dtype = numpy.int64)
+        # one more cell on every side, so that neighbor keys never wrap around
+        self.dimensions = (cells.max(axis = 0) - self.cellOffset + 2) if len(points) > 0 else numpy.ones(3, dtype = numpy.int64)
+        self.cells = cells
+
+        keys = self.getCellKeys(cells)
+        # kind = "stable" needs NumPy 1.15, mergesort is stable as well
+        self.order = numpy.argsort(keys, kind = "mergesort")
+        self.keys, self.starts, self.counts = numpy.unique(keys[self.order], return_index = True, return_counts = True)
+
+    def getCellKeys(self, cells):
+        # for very large extents the keys can overflow and act as a hash,
+        # points of other cells are removed by the distance test then
+        cells = cells - self.cellOffset
+        return (cells[:, 0] * self.dimensions[1] + cells[:, 1]) * self.dimensions[2] + cells[:, 2]
+
+    def findPairsInRadius(self, queryIndices, radius):
+        '''
+        Returns (queryIndices, pointIndices, distances) of all
+        pairs that are closer than the radius (radius <= cell size)
+        '''
+        pairQueries, pairPoints = [], []
+        queryCells = self.cells[queryIndices]
+        for offset in neighborCellOffsets:
+            keys = self.getCellKeys(queryCells + offset)
+            positions = numpy.minimum(numpy.searchsorted(self.keys, keys), len(self.keys) - 1)
+            found = self.keys[positions] == keys
+            cellIndices = positions[found]
+
+            rangeIndices, sortedIndices = expandRanges(self.starts[cellIndices], self.counts[cellIndices])
+            pairQueries.append(queryIndices[found][rangeIndices])
+            pairPoints.append(self.order[sortedIndices])
+
+        pairQueries = numpy.concatenate(pairQueries)
+        pairPoints = numpy.concatenate(pairPoints)
+        differences = self.points[pairPoints] - self.points[pairQueries]
+        distances = numpy.sqrt(numpy.einsum("ij,ij->i", differences, differences))
+        isInside = distances <= radius
+        return pairQueries[isInside], pairPoints[isInside], distances[isInside]
+
+
+def findCloseVertexEdges(vertices, searchAmount, connections, minDistance, maxDistance, chunkSize = 20000):
+    '''
+    Connects each of the first 'searchAmount' vertices with up to 'connections'
+    of its nearest vertices whose distance is in (minDistance, maxDistance].
+    Returns a sorted Ex2 array without duplicates.
+    '''
+    points = numpy.asarray(vertices, dtype = numpy.float64).reshape(-1, 3)
+    searchAmount = min(max(searchAmount, 0), len(points))
+    if searchAmount == 0 or connections <= 0 or maxDistance <= 0:
+        return numpy.zeros((0, 2), dtype = numpy.int64)
+
+    grid = UniformGrid(points, maxDistance)
+
+    edges = []
+    for start in range(0, searchAmount, chunkSize):
+        queryIndices = numpy.arange(start, min(start + chunkSize, searchAmount))
+        pairQueries, pairPoints, distances = grid.findPairsInRadius(queryIndices, maxDistance)
+
+        isValid = (pairQueries != pairPoints) & (distances > minDistance)
+        pairQueries, pairPoints, distances = pairQueries[isValid], pairPoints[isValid], distances[isValid]
+
+        # keep the closest connections of every search vertex
+        order = numpy.lexsort((pairPoints, distances, pairQueries))
+        pairQueries, pairPoints = pairQueries[order], pairPoints[order]
+        isFirst = numpy.ones(len(pairQueries), dtype = bool)
+        isFirst[1:] = (pairQueries[1:] != pairQueries[:-1]) | (pairPoints[1:] != pairPoints[:-1])
+        pairQueries, pairPoints = pairQueries[isFirst], pairPoints[isFirst]
+        groupStarts = numpy.searchsorted(pairQueries, pairQueries, side = "left")
+        isKept = numpy.arange(len(pairQueries)) - groupStarts < connections
+
+        edges.append(numpy.stack((pairQueries[isKept], pairPoints[isKept]), axis = 1))
+
+    edges = numpy.sort(numpy.concatenate(edges), axis = 1)
+    return removeDuplicateRows(edges)
+
+def removeDuplicateRows(edges):
+    # numpy.unique(axis = 0) needs NumPy 1.13
+    edges = edges[numpy.lexsort((edges[:, 1], edges[:, 0]))]
+    isFirst = numpy.ones(len(edges), dtype = bool)
+    isFirst[1:] = numpy.any(edges[1:] != edges[:-1], axis = 1)
+    return edges[isFirst]
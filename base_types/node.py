@@ -29,7 +29,11 @@ class AnimationNode:
 
     searchTags = []
     onlySearchTags = False
-    # can contain: 'No Execution', 'No Subprogram', 'No Auto Execution'
+    # can contain: 'No Execution', 'No Subprogram', 'No Auto Execution', 'Pure', 'No Side Effects', 'Random Number Cache'
+    # 'Pure' means that the outputs only depend on the inputs and node properties
+    # 'No Side Effects' means that the node only computes its outputs (it can still read Blender data);
+    #     nodes without it or 'Pure' are always executed, the others only when their outputs are used
+    # 'Random Number Cache' makes 'random_number_cache' available in the execution code
     options = set()
 
     # can be "NONE", "ALWAYS" or "HIDDEN_ONLY"
@@ -8,6 +8,7 @@ from .. nodes.generic.debug_loop import clearDebugLoopTextBlocks
 from .. utils.blender_ui import iterActiveScreens, isViewportRendering
 from .. preferences import getBlenderVersion, getAnimationNodesVersion
 from .. tree_info import getNetworksByNodeTree, getSubprogramNetworksByNodeTree
+from .. execution.parallel import startParallelExecution
 from .. execution.units import getMainUnitsByNodeTree, setupExecutionUnits, finishExecutionUnits
 
 class AutoExecutionProperties(bpy.types.PropertyGroup):
@@ -72,7 +73,7 @@ class AnimationNodeTree(bpy.types.NodeTree):
     editNodeLabels = BoolProperty(name = "Edit Node Labels", default = False)
 
     def update(self):
-        treeChanged()
+        treeChanged(self)
 
     def canAutoExecute(self, events):
         def isAnimationPlaying():
@@ -117,6 +118,7 @@ class AnimationNodeTree(bpy.types.NodeTree):
 
         clearDebugLoopTextBlocks(self)
         start = time.clock()
+        startParallelExecution(units)
         for unit in units:
             unit.execute()
         end = time.clock()
@@ -0,0 +1,213 @@
+import numpy
+from mathutils import Vector
+from . vector_list import Vector3DList, toVector3DList
+
+leafSize = 16
+
+class KDTree:
+    '''
+    KDTree that is stored in flat arrays. It is built from all vectors at once
+    and can answer many queries with a few numpy operations.
+    Single queries use a mathutils KDTree because that is faster for one point.
+    Both trees are only built when they are used the first time.
+    '''
+    __slots__ = ("points", "order", "starts", "ends", "children", "boxMin", "boxMax", "_blenderKDTree")
+
+    @classmethod
+    def fromVectors(cls, vectors):
+        tree = cls()
+        tree.points = toVector3DList(vectors).asNumpyArray().astype(numpy.float64)
+        tree.order = None
+        tree._blenderKDTree = None
+        return tree
+
+    def ensureBuilt(self):
+        if self.order is not None: return
+        self.order = numpy.arange(len(self.points))
+        starts, ends, children = [], [], []
+        self.buildNode(0, len(self.points), starts, ends, children)
+        self.starts = numpy.array(starts, dtype = numpy.int64)
+        self.ends = numpy.array(ends, dtype = numpy.int64)
+        self.children = numpy.array(children, dtype = numpy.int64).reshape(-1, 2)
+        self.calculateBoundingBoxes()
+
+    def buildNode(self, start, end, starts, ends, children):
+        nodeIndex = len(starts)
+        starts.append(start)
+        ends.append(end)
+        children.append((-1, -1))
+
+        if end - start > leafSize:
+            # split at the median of the axis with the largest extent
+            indices = self.order[start:end]
+            points = self.points[indices]
+            axis = numpy.argmax(points.max(axis = 0) - points.min(axis = 0))
+            half = (end - start) // 2
+            self.order[start:end] = indices[numpy.argpartition(points[:, axis], half)]
+
+            left = self.buildNode(start, start + half, starts, ends, children)
+            right = self.buildNode(start + half, end, starts, ends, children)
+            children[nodeIndex] = (left, right)
+        return nodeIndex
+
+    def calculateBoundingBoxes(self):
+        nodeAmount = len(self.starts)
+        self.boxMin = numpy.zeros((nodeAmount, 3))
+        self.boxMax = numpy.zeros((nodeAmount, 3))
+        sortedPoints = self.points[self.order]
+        for i, (start, end) in enumerate(zip(self.starts.tolist(), self.ends.tolist())):
+            if start == end: continue
+            self.boxMin[i] = sortedPoints[start:end].min(axis = 0)
+            self.boxMax[i] = sortedPoints[start:end].max(axis = 0)
+
+    def __len__(self):
+        return len(self.points)
+
+
+    # Single Queries
+    ##########################################
+
+    def find(self, co):
+        return self.getBlenderKDTree().find(co)
+
+    def find_n(self, co, n):
+        return self.getBlenderKDTree().find_n(co, n)
+
+    def find_range(self, co, radius):
+        return self.getBlenderKDTree().find_range(co, radius)
+
+    def getBlenderKDTree(self):
+        if self._blenderKDTree is None:
+            from mathutils.kdtree import KDTree as BlenderKDTree
+            kdTree = BlenderKDTree(len(self.points))
+            for i, point in enumerate(self.points.tolist()):
+                kdTree.insert(point, i)
+            kdTree.balance()
+            self._blenderKDTree = kdTree
+        return self._blenderKDTree
+
+
+    # Batched Queries
+    ##########################################
+
+    def batchFindRange(self, vectors, radius):
+        '''
+        Returns (lengths, indices, distances):
+        - lengths: amount of found points for every search vector
+        - indices, distances: results of all search vectors in one flat array,
+          the results of every search vector are sorted by distance
+        '''
+        self.ensureBuilt()
+        queries = toQueryArray(vectors)
+        radii = numpy.full(len(queries), max(radius, 0.0))
+        return self.findInRadii(queries, radii)
+
+    def batchFindN(self, vectors, n):
+        '''
+        Returns (indices, distances) with the shape (len(vectors), min(n, len(tree)))
+        '''
+        self.ensureBuilt()
+        queries = toQueryArray(vectors)
+        n = min(max(n, 0), len(self.points))
+        if n == 0 or len(queries) == 0:
+            return numpy.zeros((len(queries), n), dtype = numpy.int64), numpy.zeros((len(queries), n))
+
+        # the n-th distance inside a small subtree is an upper bound for the search radius
+        radii = self.estimateRadii(queries, n)
+        lengths, indices, distances = self.findInRadii(queries, radii * (1 + 1e-9) + 1e-12)
+
+        # every query has at least n results, take the n closest of each
+        firstIndices = numpy.cumsum(lengths) - lengths
+        selection = (firstIndices[:, numpy.newaxis] + numpy.arange(n)).ravel()
+        return indices[selection].reshape(-1, n), distances[selection].reshape(-1, n)
+
+    def batchFind(self, vectors):
+        '''
+        Returns (indices, distances) of the nearest point for every search vector
+        '''
+        indices, distances = self.batchFindN(vectors, 1)
+        return indices[:, 0] if indices.shape[1] > 0 else indices.ravel(), distances.ravel()
+
+    def estimateRadii(self, queries, n):
+        # descend as long as the subtree contains at least n points
+        nodes = numpy.zeros(len(queries), dtype = numpy.int64)
+        while True:
+            children = self.children[nodes]
+            canDescend = children[:, 0] >= 0
+            if not numpy.any(canDescend): break
+
+            left, right = children[:, 0], children[:, 1]
+            goLeft = self.getBoxDistances(queries, left) <= self.getBoxDistances(queries, right)
+            nextNodes = numpy.where(goLeft, left, right)
+            largeEnough = self.ends[nextNodes] - self.starts[nextNodes] >= n
+            descend = canDescend & largeEnough
+            if not numpy.any(descend): break
+            nodes = numpy.where(descend, nextNodes, nodes)
+
+        lengths = self.ends[nodes] - self.starts[nodes]
+        queryIndices, pointIndices = expandRanges(self.starts[nodes], lengths)
+        distances = self.getDistances(queries, queryIndices, pointIndices)
+        order = numpy.lexsort((distances, queryIndices))
+        firstIndices = numpy.cumsum(lengths) - lengths
+        return distances[order][firstIndices + n - 1]
+
+    def findInRadii(self, queries, radii):
+        squaredRadii = radii ** 2
+
+        # traverse the tree for all queries at once
+        queryIndices = numpy.arange(len(queries))
+        nodes = numpy.zeros(len(queries), dtype = numpy.int64)
+        leafQueries, leafNodes = [queryIndices[:0]], [nodes[:0]]
+        while len(nodes) > 0:
+            isClose = self.getBoxDistances(queries[queryIndices], nodes) <= squaredRadii[queryIndices]
+            isClose &= self.ends[nodes] > self.starts[nodes]
+            queryIndices, nodes = queryIndices[isClose], nodes[isClose]
+
+            isLeaf = self.children[nodes, 0] < 0
+            leafQueries.append(queryIndices[isLeaf])
+            leafNodes.append(nodes[isLeaf])
+
+            queryIndices = numpy.repeat(queryIndices[~isLeaf], 2)
+            nodes = self.children[nodes[~isLeaf]].ravel()
+
+        leafQueries = numpy.concatenate(leafQueries)
+        leafNodes = numpy.concatenate(leafNodes)
+        lengths = self.ends[leafNodes] - self.starts[leafNodes]
+        pairIndices, pointIndices = expandRanges(self.starts[leafNodes], lengths)
+        queryIndices = leafQueries[pairIndices]
+
+        distances = self.getDistances(queries, queryIndices, pointIndices)
+        isInside = distances <= radii[queryIndices]
+        queryIndices, pointIndices, distances = queryIndices[isInside], pointIndices[isInside], distances[isInside]
+
+        order = numpy.lexsort((pointIndices, distances, queryIndices))
+        resultLengths = numpy.bincount(queryIndices, minlength = len(queries))
+        return resultLengths, self.order[pointIndices[order]], distances[order]
+
+    def getBoxDistances(self, queries, nodes):
+        '''Squared distances between the points and the bounding boxes of the nodes'''
+        offsets = (numpy.maximum(self.boxMin[nodes] - queries, 0) +
+                   numpy.maximum(queries - self.boxMax[nodes], 0))
+        return numpy.einsum("ij,ij->i", offsets, offsets)
+
+    def getDistances(self, queries, queryIndices, sortedPointIndices):
+        differences = self.points[self.order[sortedPointIndices]] - queries[queryIndices]
+        return numpy.sqrt(numpy.einsum("ij,ij->i", differences, differences))
+
+    def getVectors(self, indices):
+        return Vector3DList.fromNumpyArray(self.points[numpy.asarray(indices, dtype = numpy.int64).ravel()])
+
+
+def toQueryArray(vectors):
+    if isinstance(vectors, Vector): vectors = [vectors]
+    return toVector3DList(vectors).asNumpyArray().astype(numpy.float64)
+
+def expandRanges(starts, lengths):
+    '''
+    Returns the range index and the value for every element of all ranges
+    e.g. starts = [2, 7], lengths = [3, 1] -> [0, 0, 0, 1], [2, 3, 4, 7]
+    '''
+    rangeIndices = numpy.repeat(numpy.arange(len(starts)), lengths)
+    firstIndices = numpy.cumsum(lengths) - lengths
+    values = numpy.arange(int(lengths.sum())) - numpy.repeat(firstIndices - starts, lengths)
+    return rangeIndices, values
@@ -1,18 +1,102 @@
 import bpy
 import bmesh
+import numpy
 import itertools
 from mathutils import Vector
+from . vector_list import Vector3DList, copyVectorList, toVector3DList
+from .. utils.math import transformVectorArray, transformNormalArray
 
 class MeshData:
-    __slots__ = ("vertices", "edges", "polygons")
+    '''
+    Stores the mesh in flat arrays similar to Blender's own layout:
+    vertex locations, edge index pairs and the polygon indices
+    together with the start and length of every polygon.
+
+    The vertices, edges and polygons properties convert from and to these arrays.
+    The returned edge and polygon lists are new lists, so changing them in place
+    (e.g. 'meshData.edges.append(edge)') does not change the mesh data.
+    Changed lists have to be assigned again: 'meshData.edges = edges'.
+    Script and Expression nodes get an EditableMeshData with normal lists instead.
+    '''
+    __slots__ = ("vertexLocations", "edgeIndices", "hasValidEdgeTuples",
+                 "polygonIndices", "polygonStarts", "polygonLengths")
 
     def __init__(self, vertices, edges, polygons):
-        self.vertices = vertices
-        self.edges = edges
-        self.polygons = polygons
+        self.vertexLocations = toVector3DList(vertices)
+        self.edgeIndices, self.hasValidEdgeTuples = edgesToArray(edges)
+        self.polygonIndices, self.polygonStarts, self.polygonLengths = polygonsToArrays(polygons)
+
+    @classmethod
+    def fromArrays(cls, vertexLocations, edgeIndices, polygonIndices, polygonLengths):
+        meshData = cls.__new__(cls)
+        meshData.vertexLocations = vertexLocations
+        meshData.edgeIndices = edgeIndices
+        meshData.hasValidEdgeTuples = True
+        meshData.polygonIndices = polygonIndices
+        meshData.polygonLengths = polygonLengths
+        meshData.polygonStarts = getStartsFromLengths(polygonLengths)
+        return meshData
+
+    @classmethod
+    def join(cls, meshDataList):
+        '''
+        Offsets the indices of every mesh by the amount of vertices
+        of all previous meshes.
+        '''
+        meshDataList = list(meshDataList)
+        if len(meshDataList) == 0: return cls([], [], [])
+
+        vertexAmounts = [len(meshData.vertexLocations) for meshData in meshDataList]
+        offsets = numpy.cumsum([0] + vertexAmounts[:-1]).astype(numpy.int32)
+
+        vertexLocations = Vector3DList.fromNumpyArray(numpy.concatenate(
+            [meshData.vertexLocations.asNumpyArray() for meshData in meshDataList]))
+
+        edgeIndices = numpy.concatenate([meshData.edgeIndices for meshData in meshDataList])
+        edgeAmounts = [len(meshData.edgeIndices) for meshData in meshDataList]
+        edgeIndices += numpy.repeat(offsets, edgeAmounts)[:, numpy.newaxis]
+
+        polygonIndices = numpy.concatenate([meshData.polygonIndices for meshData in meshDataList])
+        indexAmounts = [len(meshData.polygonIndices) for meshData in meshDataList]
+        polygonIndices += numpy.repeat(offsets, indexAmounts)
+
+        polygonLengths = numpy.concatenate([meshData.polygonLengths for meshData in meshDataList])
+
+        meshData = cls.fromArrays(vertexLocations, edgeIndices, polygonIndices, polygonLengths)
+        meshData.hasValidEdgeTuples = all(mesh.hasValidEdgeTuples for mesh in meshDataList)
+        return meshData
+
+    @property
+    def vertices(self):
+        return self.vertexLocations
+
+    @vertices.setter
+    def vertices(self, vertices):
+        self.vertexLocations = toVector3DList(vertices)
+
+    @property
+    def edges(self):
+        return [tuple(edge) for edge in self.edgeIndices.tolist()]
+
+    @edges.setter
+    def edges(self, edges):
+        self.edgeIndices, self.hasValidEdgeTuples = edgesToArray(edges)
+
+    @property
+    def polygons(self):
+        indices = self.polygonIndices.tolist()
+        return [tuple(indices[start:start + length]) for start, length
+                in zip(self.polygonStarts.tolist(), self.polygonLengths.tolist())]
+
+    @polygons.setter
+    def polygons(self, polygons):
+        self.polygonIndices, self.polygonStarts, self.polygonLengths = polygonsToArrays(polygons)
 
     def copy(self):
-        return MeshData(copyVectorList(self.vertices), copy2dList(self.edges), copy2dList(self.polygons))
+        meshData = MeshData.fromArrays(self.vertexLocations.copy(), self.edgeIndices.copy(),
+                                       self.polygonIndices.copy(), self.polygonLengths.copy())
+        meshData.hasValidEdgeTuples = self.hasValidEdgeTuples
+        return meshData
 
     def isValid(self, checkTupleLengths = True, checkIndices = True):
         try:
@@ -26,21 +110,76 @@ class MeshData:
         return True
 
     def hasValidEdgeTupleLengths(self):
-        return all(len(edge) == 2 for edge in self.edges)
+        return self.hasValidEdgeTuples
 
     def hasValidPolygonTupleLengths(self):
-        return all(len(polygon) >= 3 for polygon in self.polygons)
+        return bool(numpy.all(self.polygonLengths >= 3))
 
     def hasValidIndices(self):
-        maxEdgeIndex = max(itertools.chain([-1], *self.edges))
-        maxPolygonIndex = max(itertools.chain([-1], *self.polygons))
+        vertexAmount = len(self.vertexLocations)
+        for indices in (self.edgeIndices, self.polygonIndices):
+            if indices.size == 0: continue
+            if indices.min() < 0 or indices.max() >= vertexAmount: return False
+        return True
 
-        minEdgeIndex = min(itertools.chain([0], *self.edges))
-        minPolygonIndex = min(itertools.chain([0], *self.polygons))
 
-        return max(maxEdgeIndex, maxPolygonIndex) < len(self.vertices) and min(minEdgeIndex, minPolygonIndex) >= 0
+class EditableMeshData:
+    '''
+    Mesh data with normal lists like before the mesh data used arrays.
+    User code can change it in place, toMeshData converts it back.
+    '''
+    __slots__ = ("vertices", "edges", "polygons")
+
+    def __init__(self, vertices, edges, polygons):
+        self.vertices = vertices
+        self.edges = edges
+        self.polygons = polygons
+
+    def copy(self):
+        return EditableMeshData(copyVectorList(self.vertices),
+                                [edge[:] for edge in self.edges],
+                                [polygon[:] for polygon in self.polygons])
+
+    def toMeshData(self):
+        return MeshData(self.vertices, self.edges, self.polygons)
+
+def toEditableMeshData(value):
+    '''Converts mesh data and lists of mesh data for user code'''
+    if isinstance(value, MeshData):
+        return EditableMeshData(list(value.vertices), value.edges, value.polygons)
+    if isinstance(value, list):
+        return [toEditableMeshData(element) for element in value]
+    return value
+
+def toMeshData(value):
+    '''Converts the result of user code back'''
+    if isinstance(value, EditableMeshData):
+        return value.toMeshData()
+    if isinstance(value, list) and any(isinstance(element, EditableMeshData) for element in value):
+        return [toMeshData(element) for element in value]
+    return value
 
 
+def edgesToArray(edges):
+    '''Returns the Ex2 index array and if all edges had two indices'''
+    if len(edges) == 0:
+        return numpy.zeros((0, 2), dtype = numpy.int32), True
+    try: array = numpy.array(edges, dtype = numpy.int32)
+    except (ValueError, TypeError): array = None
+    if array is None or array.ndim != 2 or array.shape[1] != 2:
+        return numpy.zeros((0, 2), dtype = numpy.int32), False
+    return array, True
+
+def polygonsToArrays(polygons):
+    lengths = numpy.fromiter(map(len, polygons), dtype = numpy.int32, count = len(polygons))
+    indices = numpy.fromiter(itertools.chain.from_iterable(polygons), dtype = numpy.int32, count = int(lengths.sum()))
+    return indices, getStartsFromLengths(lengths), lengths
+
+def getStartsFromLengths(lengths):
+    starts = numpy.zeros(len(lengths), dtype = numpy.int32)
+    numpy.cumsum(lengths[:-1], out = starts[1:])
+    return starts
+
 
 
 class Vertex:
@@ -60,6 +199,27 @@ class Vertex:
                  normalTransformation * meshVertex.normal,
                  [group.weight for group in meshVertex.groups])
 
+    @staticmethod
+    def listFromMeshVertices(meshVertices, transformation = None):
+        '''
+        Transforms all locations and normals at once.
+        The normals are transformed with the inverse transpose of the matrix.
+        '''
+        amount = len(meshVertices)
+        locations = numpy.zeros(amount * 3, dtype = numpy.float32)
+        normals = numpy.zeros(amount * 3, dtype = numpy.float32)
+        meshVertices.foreach_get("co", locations)
+        meshVertices.foreach_get("normal", normals)
+        locations = locations.reshape(-1, 3)
+        normals = normals.reshape(-1, 3)
+
+        if transformation is not None:
+            locations = transformVectorArray(locations, transformation)
+            normals = transformNormalArray(normals, transformation)
+
+        return [Vertex(Vector(location), Vector(normal), [group.weight for group in meshVertex.groups])
+                for meshVertex, location, normal in zip(meshVertices, locations, normals)]
+
     def __init__(self, location, normal, groupWeights):
         self.location = location
         self.normal = normal
@@ -106,10 +266,3 @@ class Polygon:
     def __repr__(self):
         return "<Polygon - Center: ({:.3f}, {:.3f}, {:.3f}), Verts: {}>".format(
             self.center.x, self.center.y, self.center.z, len(self.vertexLocations))
-
-
-def copyVectorList(list):
-    return [vertex.copy() for vertex in list]
-
-def copy2dList(list):
-    return [element[:] for element in list]
@@ -1,6 +1,7 @@
 import copy
+import numpy
 from mathutils import Vector
-from . utils import findNearestParameterOnLine
+from .. vector_list import Vector3DList, toVector3DList
 
 '''
 How to use Splines:
@@ -9,6 +10,7 @@ How to use Splines:
 - call the update function on the spline before evaluation, projection, ...
 - check the isEvaluable after updating the spline. There may be exceptions when you evaluate the spline when it isn't evaluable
 - call the ensureUniformConverter function before converting normal parameters to parameters which have the same distances
+  (the arc length table it creates is kept until the spline changes)
 '''
 
 class Spline:
@@ -48,6 +50,30 @@ class Spline:
         return Vector((0, 0, 1))
 
 
+    # batch evaluation, subclasses can implement faster versions
+    def evaluateArray(self, parameters):
+        return numpy.array([tuple(self.evaluate(par)) for par in parameters], dtype = numpy.float64).reshape(-1, 3)
+
+    def evaluateTangentArray(self, parameters):
+        return numpy.array([tuple(self.evaluateTangent(par)) for par in parameters], dtype = numpy.float64).reshape(-1, 3)
+
+    def evaluateMany(self, parameters):
+        '''Returns the positions and tangents for all parameters'''
+        positions = Vector3DList.fromNumpyArray(self.evaluateArray(parameters))
+        tangents = Vector3DList.fromNumpyArray(self.evaluateTangentArray(parameters))
+        return positions, tangents
+
+    def toSegmentIndicesAndParameters(self, parameters):
+        '''Vectorized version of toSegmentsIndexAndParameter'''
+        p = numpy.maximum(numpy.asarray(parameters, dtype = numpy.float64), 0.0) * self.segmentAmount
+        indices = p.astype(numpy.int64)
+        segmentParameters = p - indices
+        isOutside = indices >= self.segmentAmount
+        indices[isOutside] = self.segmentAmount - 1
+        segmentParameters[isOutside] = 1.0
+        return indices, segmentParameters
+
+
     def appendPoints(self, points):
         for point in points:
             self.appendPoint(point)
@@ -55,25 +81,32 @@ class Spline:
 
     def getSamples(self, amount, start = 0.0, end = 1.0):
         parameters = self.getParameters(amount, start, end)
-        return [self.evaluate(par) for par in parameters]
+        return Vector3DList.fromNumpyArray(self.evaluateArray(parameters))
 
     def getTangentSamples(self, amount, start = 0.0, end = 1.0):
         parameters = self.getParameters(amount, start, end)
-        return [self.evaluateTangent(par) for par in parameters]
+        return Vector3DList.fromNumpyArray(self.evaluateTangentArray(parameters))
+
+    def getSamplesAndTangents(self, amount, start = 0.0, end = 1.0):
+        return self.evaluateMany(self.getParameters(amount, start, end))
 
     def getUniformSamples(self, amount, start = 0.0, end = 1.0, resolution = 100):
         self.ensureUniformConverter(resolution)
         parameters = self.toUniformParameters(amount, start, end)
-        return [self.evaluate(par) for par in parameters]
+        return Vector3DList.fromNumpyArray(self.evaluateArray(parameters))
 
     def getUniformTangentSamples(self, amount, start = 0.0, end = 1.0, resolution = 100):
         self.ensureUniformConverter(resolution)
         parameters = self.toUniformParameters(amount, start, end)
-        return [self.evaluateTangent(par) for par in parameters]
+        return Vector3DList.fromNumpyArray(self.evaluateTangentArray(parameters))
+
+    def getUniformSamplesAndTangents(self, amount, start = 0.0, end = 1.0, resolution = 100):
+        self.ensureUniformConverter(resolution)
+        return self.evaluateMany(self.toUniformParameters(amount, start, end))
 
 
     def toUniformParameters(self, amount, start = 0.0, end = 1.0):
-        return [self.toUniformParameter(par) for par in self.getParameters(amount, start, end)]
+        return self.uniformConverter.lookUpMany(self.getParameters(amount, start, end))
 
     def getParameters(self, amount, start = 0.0, end = 1.0):
         start = min(max(start, 0.0), 1.0)
@@ -101,8 +134,19 @@ class Spline:
 
     def getPartialLength(self, resolution = 50, start = 0.0, end = 1.0):
         if not self.isEvaluable: return 0.0
-        samples = self.getSamples(resolution, start, end)
-        return self.calculateDistanceSum(samples)
+        start = min(max(start, 0.0), 1.0)
+        end = min(max(end, 0.0), 1.0)
+        if start > end: start, end = end, start
+
+        self.ensureUniformConverter(resolution)
+        table = self.uniformConverter
+
+        # the table interpolates linearly between its samples,
+        # that is too inaccurate when the range only covers a few of them
+        if (end - start) * table.resolution < 4:
+            parameters = numpy.linspace(start, end, max(resolution, 1) + 1)
+            return ArcLengthTable.fromSamples(parameters, self.evaluateArray(parameters)).totalLength
+        return table.getLengthAtParameter(end) - table.getLengthAtParameter(start)
 
     def calculateDistanceSum(self, vectors):
         distance = 0.0
@@ -120,47 +164,63 @@ class Spline:
     def getProjectedParameters(self, coordinates):
         return [i / 100 for i in range(101)]
 
+    # subclasses can implement a faster version
+    def projectMany(self, points):
+        return numpy.array([self.project(Vector(point)) for point in toPointArray(points)], dtype = numpy.float64)
+
 
     # find the nearest point and tangent on the spline + the straight lines at the end
     def projectExtended(self, coordinates):
-        def findNearestPointOnLine(linePosition, lineDirection, point):
-            lineDirection = lineDirection.normalized()
-            dotProduct = lineDirection.dot(point - linePosition)
-            return linePosition + (lineDirection * dotProduct)
+        positions, tangents = self.projectExtendedMany([coordinates])
+        return positions[0], tangents[0]
 
-        parameter = self.project(coordinates)
-        splineProjection = self.evaluate(parameter)
-        splineTangent = self.evaluateTangent(parameter)
-        projectionData = [(splineProjection, splineTangent)]
+    def projectExtendedMany(self, points):
+        points = toPointArray(points)
+        parameters = self.projectMany(points)
+        positions = self.evaluateArray(parameters)
+        tangents = self.evaluateTangentArray(parameters)
 
-        # TODO: can cause division by zero here
         if not self.isCyclic:
-            startPoint = self.evaluate(0)
-            startTangent = self.evaluateTangent(0)
-            parameter = findNearestParameterOnLine(startPoint, startTangent, coordinates)
-            if parameter <= 0:
-                startLineProjection = startPoint + parameter * startTangent
-                projectionData.append((startLineProjection, startTangent))
+            distances = numpy.sum((points - positions) ** 2, axis = 1)
+            for lineParameter, isOnLine in ((0.0, lambda p: p <= 0), (1.0, lambda p: p >= 0)):
+                linePoint = self.evaluateArray([lineParameter])[0]
+                lineTangent = self.evaluateTangentArray([lineParameter])[0]
+                squaredTangentLength = lineTangent.dot(lineTangent)
+                if squaredTangentLength == 0: lineParameters = numpy.zeros(len(points))
+                else: lineParameters = numpy.dot(points - linePoint, lineTangent) / squaredTangentLength
+
+                linePositions = linePoint + lineParameters[:, numpy.newaxis] * lineTangent
+                lineDistances = numpy.sum((points - linePositions) ** 2, axis = 1)
+                isCloser = isOnLine(lineParameters) & (lineDistances < distances)
 
-            endPoint = self.evaluate(1)
-            endTangent = self.evaluateTangent(1)
-            parameter = findNearestParameterOnLine(endPoint, endTangent, coordinates)
-            if parameter >= 0:
-                endLineProjection = endPoint + parameter * endTangent
-                projectionData.append((endLineProjection, endTangent))
+                positions[isCloser] = linePositions[isCloser]
+                tangents[isCloser] = lineTangent
+                distances[isCloser] = lineDistances[isCloser]
 
-        return min(projectionData, key = lambda item: (coordinates - item[0]).length_squared)
+        return Vector3DList.fromNumpyArray(positions), Vector3DList.fromNumpyArray(tangents)
 
 
 
-    def getTrimmedVersion(self, start, end):
+    def getTrimmedVersion(self, start, end, resolution = 100):
         from . poly_spline import PolySpline
 
         self.update()
         if not self.isEvaluable: return self.copy()
 
+        start = min(max(start, 0.0), 1.0)
+        end = min(max(end, 0.0), 1.0)
+        if start > end: start, end = end, start
+
+        # distribute the points evenly over the length of the trimmed part
+        self.ensureUniformConverter(resolution)
+        table = self.uniformConverter
+        startLength = table.getLengthAtParameter(start)
+        endLength = table.getLengthAtParameter(end)
+        lengths = numpy.linspace(startLength, endLength, 100)
+        parameters = table.lookUpLengths(lengths)
+
         trimmedSpline = PolySpline()
-        trimmedSpline.appendPoints(self.getSamples(100, start, end))
+        trimmedSpline.appendPoints(list(Vector3DList.fromNumpyArray(self.evaluateArray(parameters))))
         return trimmedSpline
 
 
@@ -170,32 +230,56 @@ class Spline:
             self.newUniformConverter(resolution)
 
     def newUniformConverter(self, resolution = 100):
-        from . poly_spline import PolySpline
-        samples = self.getSamples(resolution)
+        parameters = numpy.linspace(0.0, 1.0, resolution + 1)
+        self.uniformConverter = ArcLengthTable.fromSamples(parameters, self.evaluateArray(parameters))
+
 
-        polySpline = PolySpline()
-        polySpline.appendPoints(samples)
-        polySpline.update()
+def toPointArray(points):
+    return toVector3DList(points).asNumpyArray().astype(numpy.float64)
 
-        uniformPolySpline = PolySpline()
-        equalDistanceParameters = polySpline.getEqualDistanceParameters(resolution)
-        converter = ParameterConverter(equalDistanceParameters)
-        self.uniformConverter = converter
 
-# Mainly used to get parameters which have the same distance on the spline
-class ParameterConverter:
-    def __init__(self, parameterList):
-        self.parameters = parameterList
-        self.length = len(parameterList)
+class ArcLengthTable:
+    '''
+    Cumulative length of the spline at sampled parameters.
+    Used to get parameters which have the same distances on the spline.
+    '''
+    def __init__(self, parameters, lengths, resolution = None):
+        self.parameters = numpy.asarray(parameters, dtype = numpy.float64)
+        self.lengths = numpy.asarray(lengths, dtype = numpy.float64)
+        self.totalLength = float(self.lengths[-1])
+        self.resolution = len(self.parameters) - 1 if resolution is None else resolution
+
+    @classmethod
+    def fromSamples(cls, parameters, samples, resolution = None):
+        distances = numpy.sqrt(numpy.sum(numpy.diff(samples, axis = 0) ** 2, axis = 1))
+        lengths = numpy.concatenate(([0.0], numpy.cumsum(distances)))
+        return cls(parameters, lengths, resolution)
 
     def lookUp(self, parameter):
-        maxIndex = self.length - 1
-        p = min(max(parameter * maxIndex, 0), maxIndex)
-        before = int(p)
-        after = min(before + 1, maxIndex)
-        influence = p - before
-        return self.parameters[before] * (1 - influence) + self.parameters[after] * influence
-
-    @property
-    def resolution(self):
-        return self.length - 1
+        return float(self.lookUpMany([parameter])[0])
+
+    def lookUpMany(self, parameters):
+        '''Converts fractions of the total length to spline parameters'''
+        factors = numpy.clip(numpy.asarray(parameters, dtype = numpy.float64), 0.0, 1.0)
+        return self.lookUpLengths(factors * self.totalLength)
+
+    def lookUpLengths(self, lengths):
+        if self.totalLength == 0:
+            return numpy.full(len(lengths), self.parameters[0])
+
+        lengths = numpy.clip(numpy.asarray(lengths, dtype = numpy.float64), 0.0, self.totalLength)
+        # binary search for the sample before each length
+        indices = numpy.searchsorted(self.lengths, lengths, side = "right") - 1
+        indices = numpy.clip(indices, 0, len(self.lengths) - 2)
+
+        lengthBefore = self.lengths[indices]
+        segmentLengths = self.lengths[indices + 1] - lengthBefore
+        safeSegmentLengths = numpy.where(segmentLengths > 0, segmentLengths, 1.0)
+        influences = numpy.where(segmentLengths > 0, (lengths - lengthBefore) / safeSegmentLengths, 0.0)
+
+        parameterBefore = self.parameters[indices]
+        parameterAfter = self.parameters[indices + 1]
+        return parameterBefore + (parameterAfter - parameterBefore) * influences
+
+    def getLengthAtParameter(self, parameter):
+        return float(numpy.interp(parameter, self.parameters, self.lengths))
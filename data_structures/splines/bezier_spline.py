@@ -1,7 +1,8 @@
 import numpy
 from mathutils import Vector, Matrix
 from numpy.polynomial import Polynomial
-from . base_spline import Spline
+from numpy.polynomial.polynomial import polyroots
+from . base_spline import Spline, toPointArray
 
 
 class BezierSpline(Spline):
@@ -51,10 +52,20 @@ class BezierSpline(Spline):
                 self.segments.append(BezierSegment(self.points[-1], self.points[0]))
             self.segmentAmount = len(self.segments)
 
+        def recreateArrays():
+            # shape: (segments, 4, 3)
+            self.controlPoints = numpy.array([(segment.left.location, segment.left.rightHandle,
+                                               segment.right.leftHandle, segment.right.location)
+                                              for segment in self.segments], dtype = numpy.float64).reshape(-1, 4, 3)
+            self.coefficients = numpy.einsum("ij,sjk->sik", bezierCoefficientMatrix, self.controlPoints)
+            # a bezier segment is inside the convex hull of its control points
+            self.boundingBoxes = self.controlPoints.min(axis = 1), self.controlPoints.max(axis = 1)
+
         if self.isChanged:
             recreateSegments()
+            recreateArrays()
             self.isEvaluable = len(self.segments) > 0
-            self.uniformParameterConverter = None
+            self.uniformConverter = None
             self.isChanged = False
 
     def getProjectedParameters(self, coordinates):
@@ -64,6 +75,70 @@ class BezierSpline(Spline):
                 parameters.append((parameter + i) / len(self.segments))
         return parameters
 
+    def project(self, coordinates):
+        return float(self.projectMany([coordinates])[0])
+
+    def projectMany(self, points):
+        points = toPointArray(points)
+        parameters = numpy.zeros(len(points), dtype = numpy.float64)
+        chunkSize = max(2 ** 20 // max(self.segmentAmount, 1), 1)
+        for start in range(0, len(points), chunkSize):
+            parameters[start:start + chunkSize] = self.projectChunk(points[start:start + chunkSize])
+        return parameters
+
+    def projectChunk(self, points):
+        # only segments whose bounding box is closer than the nearest
+        # segment end point can contain the projection
+        boxMin, boxMax = self.boundingBoxes
+        offsets = (numpy.maximum(boxMin[numpy.newaxis] - points[:, numpy.newaxis], 0) +
+                   numpy.maximum(points[:, numpy.newaxis] - boxMax[numpy.newaxis], 0))
+        lowerBounds = numpy.einsum("nsk,nsk->ns", offsets, offsets)
+
+        endPoints = self.controlPoints[:, (0, 3)].reshape(-1, 3)
+        endPointOffsets = points[:, numpy.newaxis] - endPoints[numpy.newaxis]
+        upperBounds = numpy.einsum("nsk,nsk->ns", endPointOffsets, endPointOffsets).min(axis = 1)
+
+        tolerance = upperBounds * 1e-9 + 1e-12
+        pointIndices, segmentIndices = numpy.nonzero(lowerBounds <= (upperBounds + tolerance)[:, numpy.newaxis])
+
+        # http://jazzros.blogspot.be/2011/03/projecting-point-on-bezier-curve.html
+        targets = points[pointIndices]
+        p0, p1, p2, p3 = (self.controlPoints[segmentIndices, i] - targets for i in range(4))
+        a = p3 - 3 * p2 + 3 * p1 - p0
+        b = 3 * p2 - 6 * p1 + 3 * p0
+        c = 3 * (p1 - p0)
+
+        dot = lambda x, y: numpy.einsum("ij,ij->i", x, y)
+        coeffs = numpy.stack((
+            dot(c, p0),
+            dot(c, c) + dot(b, p0) * 2.0,
+            dot(b, c) * 3.0 + dot(a, p0) * 3.0,
+            dot(a, c) * 4.0 + dot(b, b) * 2.0,
+            dot(a, b) * 5.0,
+            dot(a, a) * 3.0), axis = 1)
+
+        roots = numpy.clip(findQuinticRootsRealParts(coeffs), 0.0, 1.0)
+        candidates = numpy.concatenate((roots, numpy.zeros((len(roots), 1)), numpy.ones((len(roots), 1))), axis = 1)
+
+        co = self.coefficients[segmentIndices][:, numpy.newaxis]
+        t = candidates[:, :, numpy.newaxis]
+        positions = co[:, :, 0] + t * (co[:, :, 1] + t * (co[:, :, 2] + t * co[:, :, 3]))
+        distances = numpy.sum((positions - targets[:, numpy.newaxis]) ** 2, axis = 2)
+
+        bestCandidates = numpy.argmin(distances, axis = 1)
+        pairRange = numpy.arange(len(bestCandidates))
+        pairDistances = distances[pairRange, bestCandidates]
+        pairParameters = (candidates[pairRange, bestCandidates] + segmentIndices) / self.segmentAmount
+
+        # pick the closest pair per point, the first segment wins on equal distances
+        order = numpy.lexsort((segmentIndices, pairDistances, pointIndices))
+        sortedPointIndices = pointIndices[order]
+        firstIndices = numpy.unique(sortedPointIndices, return_index = True)[1]
+
+        parameters = numpy.zeros(len(points), dtype = numpy.float64)
+        parameters[sortedPointIndices[firstIndices]] = pairParameters[order[firstIndices]]
+        return parameters
+
     def calculateSmoothHandles(self, strength = 0.3333):
         neighborSegments = self.getNeighborSegments()
         for segment in neighborSegments:
@@ -103,6 +178,50 @@ class BezierSpline(Spline):
         else:
             return self.segmentAmount - 1, 1
 
+    def evaluateArray(self, parameters):
+        indices, t = self.toSegmentIndicesAndParameters(parameters)
+        c = self.coefficients[indices]
+        t = t[:, numpy.newaxis]
+        return c[:, 0] + t * (c[:, 1] + t * (c[:, 2] + t * c[:, 3]))
+
+    def evaluateTangentArray(self, parameters):
+        indices, t = self.toSegmentIndicesAndParameters(parameters)
+        c = self.coefficients[indices]
+        t = t[:, numpy.newaxis]
+        return c[:, 1] + t * (c[:, 2] * 2 + t * c[:, 3] * 3)
+
+
+bezierCoefficientMatrix = numpy.array((
+    ( 1.0,  0.0,  0.0, 0.0),
+    (-3.0,  3.0,  0.0, 0.0),
+    ( 3.0, -6.0,  3.0, 0.0),
+    (-1.0,  3.0, -3.0, 1.0)))
+
+def findQuinticRootsRealParts(coeffs):
+    '''
+    Real parts of the roots of many polynomials of degree 5.
+    The coefficients are in increasing order (shape: (n, 6)).
+    '''
+    roots = numpy.zeros((len(coeffs), 5), dtype = numpy.float64)
+    scales = numpy.abs(coeffs).max(axis = 1) if len(coeffs) > 0 else numpy.zeros(0)
+    isRegular = numpy.abs(coeffs[:, 5]) > scales * 1e-10
+
+    # the eigenvalues of the companion matrices are the roots
+    regularCoeffs = coeffs[isRegular]
+    companions = numpy.zeros((len(regularCoeffs), 5, 5), dtype = numpy.float64)
+    companions[:, numpy.arange(1, 5), numpy.arange(4)] = 1.0
+    companions[:, :, 4] = -regularCoeffs[:, :5] / regularCoeffs[:, 5:6]
+    if len(companions) > 0:
+        roots[isRegular] = numpy.linalg.eigvals(companions).real
+
+    # lower degree polynomials, e.g. when the segment is a straight line
+    for index in numpy.nonzero(~isRegular)[0]:
+        c = numpy.where(numpy.abs(coeffs[index]) > scales[index] * 1e-10, coeffs[index], 0.0)
+        if numpy.any(c[1:] != 0):
+            realParts = polyroots(c).real
+            roots[index, :len(realParts)] = realParts
+    return roots
+
 
 class BezierPoint:
     def __init__(self, location, leftHandle, rightHandle):
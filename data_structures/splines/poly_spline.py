@@ -1,4 +1,5 @@
-from . base_spline import Spline
+import numpy
+from . base_spline import Spline, ArcLengthTable, toPointArray
 from . utils import findNearestParameterOnLine
 
 
@@ -47,11 +48,18 @@ class PolySpline(Spline):
             if self.isCyclic:
                 self.segments.append(PolySegment(self.points[-1], self.points[0]))
             self.segmentAmount = len(self.segments)
+
+        def recreatePointArray():
+            points = numpy.array([tuple(point) for point in self.points], dtype = numpy.float64).reshape(-1, 3)
+            if self.isCyclic and len(points) > 1:
+                points = numpy.append(points, points[:1], axis = 0)
+            self.pointArray = points
              
         if self.isChanged:
             recreateSegments()
+            recreatePointArray()
             self.isEvaluable = len(self.segments) > 0
-            self.uniformParameterConverter = None
+            self.uniformConverter = None
             self.isChanged = False
         
     def getLength(self, resolution = 0):
@@ -60,12 +68,46 @@ class PolySpline(Spline):
             length += segment.getLength()
         return length
         
+    def newUniformConverter(self, resolution = 100):
+        # the control points give the exact lengths, independent of the resolution
+        parameters = numpy.arange(len(self.pointArray)) / max(self.segmentAmount, 1)
+        self.uniformConverter = ArcLengthTable.fromSamples(parameters, self.pointArray, resolution = float("inf"))
+
     def getProjectedParameters(self, coordinates):
         parameters = []
         for i, segment in enumerate(self.segments):
             parameter = segment.project(coordinates)
             parameters.append((parameter + i) / len(self.segments))
         return parameters
+
+    def project(self, coordinates):
+        return float(self.projectMany([coordinates])[0])
+
+    def projectMany(self, points):
+        points = toPointArray(points)
+        parameters = numpy.zeros(len(points), dtype = numpy.float64)
+        chunkSize = max(2 ** 20 // max(self.segmentAmount, 1), 1)
+        for start in range(0, len(points), chunkSize):
+            parameters[start:start + chunkSize] = self.projectChunk(points[start:start + chunkSize])
+        return parameters
+
+    def projectChunk(self, points):
+        lefts = self.pointArray[:-1]
+        directions = self.pointArray[1:] - lefts
+        squaredLengths = numpy.einsum("ij,ij->i", directions, directions)
+        safeSquaredLengths = numpy.where(squaredLengths > 0, squaredLengths, 1.0)
+
+        offsets = points[:, numpy.newaxis] - lefts[numpy.newaxis]
+        segmentParameters = numpy.einsum("nsk,sk->ns", offsets, directions) / safeSquaredLengths
+        segmentParameters = numpy.clip(segmentParameters, 0.0, 1.0)
+
+        differences = offsets - segmentParameters[:, :, numpy.newaxis] * directions[numpy.newaxis]
+        distances = numpy.einsum("nsk,nsk->ns", differences, differences)
+
+        # the first segment wins on equal distances
+        bestSegments = numpy.argmin(distances, axis = 1)
+        bestParameters = segmentParameters[numpy.arange(len(points)), bestSegments]
+        return (bestParameters + bestSegments) / self.segmentAmount
         
         
     # evaluation
@@ -86,6 +128,15 @@ class PolySpline(Spline):
             return floorP, p - floorP
         else:
             return self.segmentAmount - 1, 1
+
+    def evaluateArray(self, parameters):
+        indices, t = self.toSegmentIndicesAndParameters(parameters)
+        t = t[:, numpy.newaxis]
+        return self.pointArray[indices] * (1 - t) + self.pointArray[indices + 1] * t
+
+    def evaluateTangentArray(self, parameters):
+        indices, t = self.toSegmentIndicesAndParameters(parameters)
+        return self.pointArray[indices + 1] - self.pointArray[indices]
         
         
     # point distribution
@@ -0,0 +1,138 @@
+import numpy
+from mathutils import Vector
+from collections.abc import MutableSequence
+from .. utils.math import transformVectorArray
+
+class Vector3DList(MutableSequence):
+    '''
+    List of 3D vectors that stores all coordinates in one contiguous
+    float32 buffer. This allows to exchange the data with Blender using foreach_get/foreach_set.
+
+    The elements are returned as new mathutils.Vector objects, so changing them
+    in place (e.g. 'vectors[0].x = 1' or 'for v in vectors: v.z += 1') does not
+    change the list. Changed vectors have to be assigned again: 'vectors[0] = v'.
+    Script and Expression nodes and loop iterators get a normal list of vectors with toVectorList.
+    '''
+    __slots__ = ("data", "length")
+
+    def __init__(self, length = 0, capacity = None):
+        capacity = max(length, capacity or 0)
+        self.data = numpy.zeros((capacity, 3), dtype = numpy.float32)
+        self.length = length
+
+    @classmethod
+    def fromNumpyArray(cls, array):
+        array = numpy.asarray(array, dtype = numpy.float32).reshape(-1, 3)
+        vectors = cls()
+        vectors.data = numpy.array(array, dtype = numpy.float32, order = "C")
+        vectors.length = len(array)
+        return vectors
+
+    @classmethod
+    def fromValues(cls, values):
+        if isinstance(values, Vector3DList): return values.copy()
+        values = [tuple(value) for value in values]
+        if len(values) == 0: return cls()
+        return cls.fromNumpyArray(values)
+
+    @classmethod
+    def fromMeshVertices(cls, meshVertices):
+        vectors = cls(len(meshVertices))
+        meshVertices.foreach_get("co", vectors.data.ravel())
+        return vectors
+
+    def asNumpyArray(self):
+        '''Returns a view on the used part of the buffer'''
+        return self.data[:self.length]
+
+    def applyToMeshVertices(self, meshVertices):
+        meshVertices.foreach_set("co", self.asNumpyArray().ravel())
+
+    def transform(self, matrix):
+        data = self.asNumpyArray()
+        data[:] = transformVectorArray(data, matrix)
+
+    def copy(self):
+        return Vector3DList.fromNumpyArray(self.asNumpyArray())
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Vector3DList.fromNumpyArray(self.asNumpyArray()[index])
+        return Vector(self.asNumpyArray()[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = Vector3DList.fromValues(value).asNumpyArray()
+        self.asNumpyArray()[index] = value
+
+    def __delitem__(self, index):
+        data = numpy.delete(self.asNumpyArray(), index, axis = 0)
+        self.data = numpy.ascontiguousarray(data)
+        self.length = len(data)
+
+    def __eq__(self, other):
+        if isinstance(other, Vector3DList):
+            return numpy.array_equal(self.asNumpyArray(), other.asNumpyArray())
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __iter__(self):
+        for co in self.asNumpyArray():
+            yield Vector(co)
+
+    def insert(self, index, value):
+        if index < 0: index = max(self.length + index, 0)
+        index = min(index, self.length)
+        self.reserve(self.length + 1)
+        data = self.data
+        data[index + 1:self.length + 1] = data[index:self.length]
+        data[index] = value
+        self.length += 1
+
+    def append(self, value):
+        self.reserve(self.length + 1)
+        self.data[self.length] = value
+        self.length += 1
+
+    def extend(self, values):
+        values = Vector3DList.fromValues(values).asNumpyArray()
+        self.reserve(self.length + len(values))
+        self.data[self.length:self.length + len(values)] = values
+        self.length += len(values)
+
+    def reserve(self, capacity):
+        if capacity <= len(self.data): return
+        newData = numpy.zeros((max(capacity, len(self.data) * 2), 3), dtype = numpy.float32)
+        newData[:self.length] = self.asNumpyArray()
+        self.data = newData
+
+    def __add__(self, other):
+        result = self.copy()
+        result.extend(other)
+        return result
+
+    def __radd__(self, other):
+        result = Vector3DList.fromValues(other)
+        result.extend(self)
+        return result
+
+    def __repr__(self):
+        return "<Vector3DList - Length: {}>".format(self.length)
+
+
+def copyVectorList(vectors):
+    if isinstance(vectors, Vector3DList): return vectors.copy()
+    return [vector.copy() for vector in vectors]
+
+def toVectorList(vectors):
+    '''Returns a list of vectors that can be changed in place like before'''
+    if isinstance(vectors, Vector3DList): return list(vectors)
+    return vectors
+
+def toVector3DList(vectors):
+    if isinstance(vectors, Vector3DList): return vectors
+    return Vector3DList.fromValues(vectors)
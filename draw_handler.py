@@ -1,10 +1,12 @@
 import bpy
+from . ui.node_times_overlay import drawNodeTimes
 from . nodes.generic.debug_drawer import drawDebugTextBoxes
 from . nodes.interpolation.debug import drawInterpolationPreviews
 
 def drawNodeEditor():
     drawDebugTextBoxes()
     drawInterpolationPreviews()
+    drawNodeTimes()
 
 _nodeDrawHandler = None
 def register():
@@ -1,6 +1,7 @@
 import bpy
 import itertools
 from . import problems
+from . import tree_info
 from . update import updateEverything
 from . utils.recursion import noRecursion
 from . tree_info import iterSocketsThatNeedUpdate
@@ -14,7 +15,10 @@ def update(events):
         print("Skip event: cannot write to ID classes")
         return
 
-    if events.intersection({"File", "Addon", "Tree"}) or didNameChange():
+    if didNameChange():
+        tree_info.treeChanged()
+        updateEverything()
+    elif events.intersection({"File", "Addon", "Tree"}):
         updateEverything()
 
     updateSocketProperties()
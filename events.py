@@ -3,6 +3,8 @@ from . import tree_info
 from . import file_tests
 from . import event_handler
 from . utils.handlers import eventHandler
+from . execution.incremental import tagChangedProperty
+from . execution.parallel_loop import terminateProcessPool
 
 class EventState:
     def __init__(self):
@@ -51,6 +53,8 @@ def frameChanged(scene):
 
 def propertyChanged(self = None, context = None):
     event.propertyChanged = True
+    tagChangedProperty(self)
+    terminateProcessPool()
 
 @eventHandler("FILE_LOAD_POST")
 def fileLoaded():
@@ -64,14 +68,20 @@ def addonChanged():
     treeChanged()
 
 def executionCodeChanged(self = None, context = None):
-    treeChanged()
+    treeChanged(self)
 
 def networkChanged(self = None, context = None):
-    treeChanged()
+    treeChanged(self)
 
 def treeChanged(self = None, context = None):
     event.treeChanged = True
-    tree_info.treeChanged()
+    terminateProcessPool()
+    tree_info.treeChanged(getAnimationNodeTree(self))
+
+def getAnimationNodeTree(owner):
+    tree = getattr(owner, "id_data", None)
+    if getattr(tree, "bl_idname", None) == "an_AnimationNodeTree": return tree
+    return None
 
 
 @eventHandler("RENDER_INIT")
@@ -3,7 +3,9 @@ import traceback
 from itertools import chain
 from collections import defaultdict
 from .. problems import NodeFailesToCreateExecutionCode
-from .. preferences import addonName, generateCompactCode
+from . memory_profiling import setCopyAmount
+from .. preferences import (addonName, generateCompactCode,
+                           nodeTimeMeasurementIsEnabled, nodeMemoryProfilingIsEnabled)
 
 
 # Initial Socket Variables
@@ -29,7 +31,12 @@ def getSetupCode(nodes, variables):
     lines = []
     lines.append(get_ImportModules(nodes))
     lines.append(get_ImportAnimationNodes())
-    lines.append(get_LoadRandomNumberCache())
+    if needsRandomNumberCache(nodes):
+        lines.append(get_LoadRandomNumberCache())
+    if nodeTimeMeasurementIsEnabled():
+        lines.extend(get_LoadNodeTimer())
+    if nodeMemoryProfilingIsEnabled():
+        lines.extend(get_LoadNodeMemoryProfiler())
     lines.extend(tuple(get_GetNodeReferences(nodes)))
     lines.extend(tuple(get_GetSocketValues(nodes, variables)))
     return "\n".join(lines)
@@ -57,11 +64,24 @@ def get_ImportAnimationNodes():
     return "animation_nodes = sys.modules.get({})".format(repr(addonName))
 
 
+def needsRandomNumberCache(nodes):
+    # the cache is only loaded when a node uses it
+    return any("Random Number Cache" in node.options for node in nodes)
+
 def get_LoadRandomNumberCache():
     return "random_number_cache = animation_nodes.algorithms.random.getRandomNumberCache()"
 
 
+def get_LoadNodeTimer():
+    yield "node_timer = animation_nodes.execution.measurements.timer"
+    yield "record_node_time = animation_nodes.execution.measurements.recordNodeTime"
+
+def get_LoadNodeMemoryProfiler():
+    yield "start_node_memory = animation_nodes.execution.memory_profiling.startNodeMemory"
+    yield "record_node_memory = animation_nodes.execution.memory_profiling.recordNodeMemory"
+
 def get_GetNodeReferences(nodes):
+    if len(nodes) == 0: return
     yield "nodes = bpy.data.node_groups[{}].nodes".format(repr(nodes[0].nodeTree.name))
     for node in nodes:
         yield "{} = nodes[{}]".format(node.identifier, repr(node.name))
@@ -98,10 +118,19 @@ def getGlobalizeStatement(nodes, variables):
 def getNodeExecutionLines(node, variables):
     lines = []
     if not generateCompactCode(): lines.extend(getNodeCommentLines(node))
+    lines.extend(getNodeCodeLines(node, variables))
+    return lines
+
+def getNodeCodeLines(node, variables):
+    lines = []
     lines.extend(getInputCopyLines(node, variables))
+    if nodeMemoryProfilingIsEnabled():
+        setCopyAmount(node.identifier, "inputs", len(lines))
     try:
         taggedLines = node.getTaggedExecutionCodeLines()
         lines.extend([replaceTaggedLine(line, node, variables) for line in taggedLines])
+        if nodeMemoryProfilingIsEnabled(): lines = getMemoryProfiledLines(node, lines, variables)
+        if nodeTimeMeasurementIsEnabled(): lines = getMeasuredLines(node, lines)
         return lines
     except:
         print("\n"*5)
@@ -110,6 +139,23 @@ def getNodeExecutionLines(node, variables):
         raise Exception("Node failed to create execution code")
 
 
+def getMeasuredLines(node, lines):
+    measuredLines = ["node_start_time = node_timer()"]
+    measuredLines.extend(lines)
+    measuredLines.append("record_node_time({}, node_timer() - node_start_time)".format(repr(node.identifier)))
+    return measuredLines
+
+def getMemoryProfiledLines(node, lines, variables):
+    # outputs of inner links are not assigned by the node
+    innerLinkOutputs = {outputName for inputName, outputName in node.innerLinks}
+    outputNames = [variables[socket] for socket in node.linkedOutputs if socket.identifier not in innerLinkOutputs]
+
+    profiledLines = ["node_memory_start = start_node_memory()"]
+    profiledLines.extend(lines)
+    profiledLines.append("record_node_memory({}, node_memory_start, ({}))".format(
+        repr(node.identifier), "".join(name + ", " for name in outputNames)))
+    return profiledLines
+
 def getNodeCommentLines(node):
     return ["\n", "# Node: {} - {}".format(repr(node.nodeTree.name), repr(node.name))]
 
@@ -150,11 +196,11 @@ def replace_DollarSign_OutputSocketVariable(line, node, variables):
 # Modify Socket Variables
 ##########################################
 
-def linkOutputSocketsToTargets(node, variables):
+def linkOutputSocketsToTargets(node, variables, positions = None):
     resolveInnerLinks(node, variables)
     lines = []
     for socket in node.linkedOutputs:
-        lines.extend(linkSocketToTargets(socket, variables))
+        lines.extend(linkSocketToTargets(socket, variables, positions = positions))
     return lines
 
 def resolveInnerLinks(node, variables):
@@ -162,11 +208,11 @@ def resolveInnerLinks(node, variables):
     for inputName, outputName in node.innerLinks:
         variables[outputs[outputName]] = variables[inputs[inputName]]
 
-def linkSocketToTargets(socket, variables):
+def linkSocketToTargets(socket, variables, copyAlways = False, positions = None):
     lines = []
 
-    targets = socket.dataTargets
-    needACopy = getTargetsThatNeedACopy(socket, targets)
+    targets = getExecutedTargets(socket, variables)
+    needACopy = getTargetsThatNeedACopy(socket, targets, copyAlways, positions)
 
     for target in targets:
         if target in needACopy:
@@ -174,18 +220,326 @@ def linkSocketToTargets(socket, variables):
         else:
             variables[target] = variables[socket]
 
+    if nodeMemoryProfilingIsEnabled():
+        setCopyAmount(socket.node.identifier, socket.identifier, len(needACopy))
     return lines
 
-def getTargetsThatNeedACopy(socket, targets):
+def getExecutedTargets(socket, variables):
+    # removed nodes have no variables
+    return [target for target in socket.dataTargets if target in variables]
+
+def getTargetsThatNeedACopy(socket, targets, copyAlways = False, positions = None, followInnerLinks = False):
     if not socket.isCopyable: return []
-    modifiedTargets = [target for target in targets if target.dataIsModified]
-    if socket.loop.copyAlways: return modifiedTargets
+    if followInnerLinks: modifiedTargets = [target for target in targets if isModifiedThroughInnerLinks(target)]
+    else: modifiedTargets = [target for target in targets if target.dataIsModified]
+    if socket.loop.copyAlways or copyAlways: return modifiedTargets
     if len(targets) == 1: return []
+    if positions is not None:
+        owner = getOwningTarget(targets, modifiedTargets, positions)
+        if owner is not None: return [target for target in modifiedTargets if target != owner]
     if len(targets) > len(modifiedTargets): return modifiedTargets
     else: return modifiedTargets[1:]
 
+def isModifiedThroughInnerLinks(target):
+    '''
+    Nodes with inner links pass the value on without a copy,
+    so it can also be modified by the targets of the linked output.
+    '''
+    if target.dataIsModified: return True
+    outputs = target.node.outputsByIdentifier
+    for inputName, outputName in target.node.innerLinks:
+        if inputName == target.identifier:
+            if any(isModifiedThroughInnerLinks(nextTarget) for nextTarget in outputs[outputName].dataTargets):
+                return True
+    return False
+
 def getCopyLine(fromSocket, targetName, variables):
     return "{} = {}".format(targetName, getCopyExpression(fromSocket, variables))
 
 def getCopyExpression(socket, variables):
     return socket.getCopyExpression().replace("value", variables[socket])
+
+
+
+# Dead Node Elimination
+##########################################
+
+def hasSideEffects(node):
+    return "Pure" not in node.options and "No Side Effects" not in node.options
+
+def removeUnusedNodes(nodes):
+    '''
+    Only nodes with side effects and the nodes they depend on have to be executed.
+    The results of all other nodes are never used.
+    The nodes have to be sorted.
+    '''
+    usedIdentifiers = set()
+    for node in reversed(nodes):
+        if hasSideEffects(node) or any(target.node.identifier in usedIdentifiers
+                                       for socket in node.linkedOutputs
+                                       for target in socket.dataTargets):
+            usedIdentifiers.add(node.identifier)
+    return [node for node in nodes if node.identifier in usedIdentifiers]
+
+
+
+# Copy Elimination
+##########################################
+
+def getExecutionPositions(nodes):
+    return {node.identifier : index for index, node in enumerate(nodes)}
+
+def getOwningTarget(targets, modifiedTargets, positions):
+    '''
+    The modifying target that is executed last can use the original value
+    when all reading targets are finished before it. Copies for the other modifying
+    targets are created directly after the origin node, so they don't matter.
+    Returns None when the order of the nodes does not prove this.
+    '''
+    if len(modifiedTargets) == 0: return None
+    owner = max(modifiedTargets, key = lambda target: positions.get(target.node.identifier, -1))
+    ownerPosition = positions.get(owner.node.identifier, -1)
+    if ownerPosition == -1: return None
+
+    readingTargets = [target for target in targets if not target.dataIsModified]
+    for node in getNodesThatMightReference(readingTargets, positions):
+        if positions[node.identifier] >= ownerPosition: return None
+        # other nodes could keep a reference to the value after their execution
+        if not isPureNode(node): return None
+        # the data could be changed through a reference before the owner gets it
+        if any(socket.dataIsModified for socket in node.inputs): return None
+    return owner
+
+def getNodesThatMightReference(sockets, positions):
+    '''
+    Executed nodes that read the sockets and all executed nodes that read copyable
+    outputs of them. Outputs of copyable types could contain references to the inputs.
+    '''
+    nodes = {}
+    sockets = list(sockets)
+    while len(sockets) > 0:
+        node = sockets.pop().node
+        if node.identifier in nodes or node.identifier not in positions: continue
+        nodes[node.identifier] = node
+        for socket in node.linkedOutputs:
+            if socket.isCopyable: sockets.extend(socket.dataTargets)
+    return list(nodes.values())
+
+
+
+# Incremental Execution
+##########################################
+
+def getIncrementalSetupLines():
+    yield "update_cached_value = animation_nodes.execution.incremental.updateCachedValue"
+
+def isPureNode(node):
+    return "Pure" in node.options
+
+def getIncrementalNodeExecutionLines(node, variables, changeFlags, pendingCopyLines):
+    '''
+    Pure nodes are only executed when one of their inputs changed.
+    Otherwise the outputs of the previous execution are restored.
+    Copies for modifying targets are created inside the target block,
+    so that cached values are never changed in place.
+    '''
+    lines = []
+    if not generateCompactCode(): lines.extend(getNodeCommentLines(node))
+
+    isPure = isPureNode(node)
+    if isPure: condition = getIncrementalCondition(node, variables, changeFlags)
+
+    bodyLines = []
+    bodyLines.extend(pendingCopyLines.pop(node.identifier, []))
+    bodyLines.extend(getNodeCodeLines(node, variables))
+
+    resolveInnerLinks(node, variables)
+    outputs = node.linkedOutputs
+    for socket in outputs:
+        changeFlags[socket] = getSocketVariableName(socket) + "_changed"
+
+    bodyLines.extend(getStoreOutputLines(outputs, variables, changeFlags, isPure))
+
+    if isPure:
+        bodyLines.append("incremental_cache[{}] = True".format(repr(node.identifier)))
+        lines.append("if {}:".format(condition))
+        lines.extend(indent(bodyLines))
+        lines.append("else:")
+        lines.extend(indent(getRestoreOutputLines(outputs, variables, changeFlags)))
+        lines.append("    pass")
+    else:
+        lines.extend(bodyLines)
+
+    for socket in outputs:
+        linkSocketToTargetsDeferred(socket, variables, pendingCopyLines,
+                                    copyAlways = isPure, followInnerLinks = isPure)
+    return lines
+
+def getCacheKey(socket):
+    # inputs and outputs with the same identifier have the same variable name
+    prefix = "out:" if socket.isOutput else "in:"
+    return repr(prefix + getSocketVariableName(socket))
+
+def getIncrementalCondition(node, variables, changeFlags):
+    checks = []
+    for socket in node.inputs:
+        if socket.isUnlinked:
+            key = getCacheKey(socket)
+            checks.append("update_cached_value(incremental_cache, {}, {})".format(key, variables[socket]))
+        else:
+            checks.append(changeFlags[socket.dataOrigin])
+
+    conditions = []
+    # all checks have to run, so that the cached values stay up to date
+    if len(checks) > 0: conditions.append("any(({}, ))".format(", ".join(checks)))
+    conditions.append("{} not in incremental_cache".format(repr(node.identifier)))
+    conditions.append("{} in incremental_tagged_nodes".format(repr(node.identifier)))
+    return " or ".join(conditions)
+
+def getStoreOutputLines(outputs, variables, changeFlags, isPure):
+    lines = []
+    for socket in outputs:
+        key = getCacheKey(socket)
+        if socket.comparable:
+            lines.append("{} = update_cached_value(incremental_cache, {}, {})".format(changeFlags[socket], key, variables[socket]))
+        else:
+            if isPure: lines.append("incremental_cache[{}] = {}".format(key, variables[socket]))
+            lines.append("{} = True".format(changeFlags[socket]))
+    return lines
+
+def getRestoreOutputLines(outputs, variables, changeFlags):
+    lines = []
+    for socket in outputs:
+        key = getCacheKey(socket)
+        lines.append("{} = incremental_cache[{}]".format(variables[socket], key))
+        lines.append("{} = False".format(changeFlags[socket]))
+    return lines
+
+def linkSocketToTargetsDeferred(socket, variables, pendingCopyLines, copyAlways = False, followInnerLinks = False):
+    targets = getExecutedTargets(socket, variables)
+    needACopy = getTargetsThatNeedACopy(socket, targets, copyAlways, followInnerLinks = followInnerLinks)
+
+    for target in targets:
+        if target in needACopy:
+            line = getCopyLine(socket, getSocketVariableName(target), variables)
+            pendingCopyLines[target.node.identifier].append(line)
+            variables[target] = getSocketVariableName(target)
+        else:
+            variables[target] = variables[socket]
+
+    if nodeMemoryProfilingIsEnabled():
+        setCopyAmount(socket.node.identifier, socket.identifier, len(needACopy))
+
+def indent(lines, amount = 1):
+    return [" " * (4 * amount) + line for line in lines]
+
+
+
+# Constant Folding
+##########################################
+
+def getConstantNodeIdentifiers(nodes):
+    '''
+    Pure nodes whose inputs are unlinked or linked to other constant nodes.
+    Their outputs can only change when a property or an unlinked input changes.
+    Properties that are only read during the execution have to use
+    propertyChanged as update function, all others regenerate the code.
+    The nodes have to be sorted.
+    '''
+    return getIndependentPureNodeIdentifiers(nodes)
+
+def getConstantExecutionLines(nodes, variables, pendingCopyLines):
+    '''
+    The constant nodes are only executed when one of their unlinked inputs
+    or properties changed. Otherwise the cached outputs are restored.
+    Outputs that are used by other nodes are always copied for modifying
+    targets, so that cached values are never changed in place.
+    '''
+    identifiers = {node.identifier for node in nodes}
+    checks = []
+    bodyLines = []
+    cachedOutputs = []
+
+    for node in nodes:
+        for socket in node.inputs:
+            if socket.isUnlinked:
+                key = getCacheKey(socket)
+                checks.append("update_cached_value(constant_cache, {}, {})".format(key, variables[socket]))
+
+        if not generateCompactCode(): bodyLines.extend(getNodeCommentLines(node))
+        bodyLines.extend(pendingCopyLines.pop(node.identifier, []))
+        bodyLines.extend(getNodeCodeLines(node, variables))
+
+        resolveInnerLinks(node, variables)
+        for socket in node.linkedOutputs:
+            isCached = any(target.node.identifier not in identifiers for target in getExecutedTargets(socket, variables))
+            if isCached: cachedOutputs.append(socket)
+            # cached values must not be changed in place, also not behind inner links
+            linkSocketToTargetsDeferred(socket, variables, pendingCopyLines,
+                                        copyAlways = isCached, followInnerLinks = isCached)
+
+    for socket in cachedOutputs:
+        key = getCacheKey(socket)
+        bodyLines.append("constant_cache[{}] = {}".format(key, variables[socket]))
+    bodyLines.append("constant_cache['is_valid'] = True")
+
+    conditions = []
+    # all checks have to run, so that the cached values stay up to date
+    if len(checks) > 0: conditions.append("any(({}, ))".format(", ".join(checks)))
+    conditions.append("len(constant_tagged_nodes) > 0")
+    conditions.append("not constant_cache.get('is_valid', False)")
+
+    lines = []
+    lines.append("if {}:".format(" or ".join(conditions)))
+    lines.extend(indent(bodyLines))
+    lines.append("else:")
+    for socket in cachedOutputs:
+        key = getCacheKey(socket)
+        lines.append("    {} = constant_cache[{}]".format(variables[socket], key))
+    lines.append("    pass")
+    return lines
+
+
+
+# Parallel Execution
+##########################################
+
+def getIndependentPureNodeIdentifiers(nodes):
+    '''
+    Pure nodes that only depend on other nodes of this set.
+    The nodes have to be sorted.
+    '''
+    identifiers = set()
+    for node in nodes:
+        if isPureNode(node) and all(origin.identifier in identifiers for origin in node.originNodes):
+            identifiers.add(node.identifier)
+    return identifiers
+
+def getParallelExecutionParts(nodes, constantIdentifiers):
+    '''
+    Returns the identifiers of the nodes that are executed in the main thread before the
+    worker threads start and the identifiers of the nodes that are executed in the workers.
+    - input part: nodes without side effects that read Blender data and everything they depend on
+    - worker part: all other pure nodes that only depend on nodes of these two parts
+    All remaining nodes are executed after all workers finished.
+    The nodes have to be sorted.
+    '''
+    sideEffectFreeIdentifiers = set()
+    for node in nodes:
+        if not hasSideEffects(node) and all(origin.identifier in sideEffectFreeIdentifiers for origin in node.originNodes):
+            sideEffectFreeIdentifiers.add(node.identifier)
+
+    inputIdentifiers = set()
+    for node in reversed(nodes):
+        if node.identifier not in sideEffectFreeIdentifiers: continue
+        if not isPureNode(node) or any(target.node.identifier in inputIdentifiers
+                                       for socket in node.linkedOutputs
+                                       for target in socket.dataTargets):
+            inputIdentifiers.add(node.identifier)
+
+    # the constant nodes are executed together
+    if not inputIdentifiers.isdisjoint(constantIdentifiers):
+        inputIdentifiers.update(constantIdentifiers)
+
+    workerIdentifiers = sideEffectFreeIdentifiers - inputIdentifiers
+    return inputIdentifiers, workerIdentifiers
@@ -1,31 +1,134 @@
+import os
 import sys
+import marshal
+import hashlib
+import tempfile
+from collections import OrderedDict
+from importlib.util import MAGIC_NUMBER
 from .. problems import InvalidSyntax
+from .. utils.path import getAddonDataDirectory
 
-cache = {}
+memoryCacheSize = 500
+diskCacheSize = 5000
+
+memoryCache = OrderedDict()
+diskEntryAmount = None
+_cacheDirectory = None
 
 def compileScript(script, name = "<string>"):
-    # clear the cache once in a while
-    if len(cache) == 500:
-        cache.clear()
+    key = getScriptKey(script, name)
+
+    if key in memoryCache:
+        memoryCache.move_to_end(key)
+        return memoryCache[key]
+
+    compiledCode = loadCompiledCode(key)
+    if compiledCode is None:
+        try: compiledCode = compile(script, name, "exec")
+        except SyntaxError:
+            printSyntaxError(script)
+            InvalidSyntax().report()
+            return None
+        saveCompiledCode(key, compiledCode)
+
+    memoryCache[key] = compiledCode
+    if len(memoryCache) > memoryCacheSize:
+        memoryCache.popitem(last = False)
+    return compiledCode
+
+def getScriptKey(script, name):
+    # the builtin hash is randomized per process
+    sha1 = hashlib.sha1()
+    sha1.update(name.encode("utf-8"))
+    sha1.update(b"\0")
+    sha1.update(script.encode("utf-8"))
+    return sha1.hexdigest()
+
+def printSyntaxError(script):
+    lines = script.split("\n")
+    lineNumber = sys.exc_info()[1].lineno
+    lineNumberWidth = len(str(len(lines)))
+
+    print("\n"*5)
+    for i, line in enumerate(lines):
+        linePrefix = str(i + 1).rjust(lineNumberWidth) + ". "
+        linesSuffix = "        <-------------- Error happens here" if lineNumber == i + 1 else ""
+        print(linePrefix + line + linesSuffix)
+    print("\n"*5)
+
+
+
+# Disk Cache
+##########################################
+
+def loadCompiledCode(key):
+    path = getCachePath(key)
+    if path is None: return None
 
     try:
-        scriptHash = hash(script)
-        if scriptHash not in cache:
-            compiledCode = compile(script, name, "exec")
-            cache[scriptHash] = compiledCode
-
-        return cache[scriptHash]
-
-    except SyntaxError:
-        lines = script.split("\n")
-        lineNumber = sys.exc_info()[1].lineno
-        lineNumberWidth = len(str(len(lines)))
-
-        print("\n"*5)
-        for i, line in enumerate(lines):
-            linePrefix = str(i + 1).rjust(lineNumberWidth) + ". "
-            linesSuffix = "        <-------------- Error happens here" if lineNumber == i + 1 else ""
-            print(linePrefix + line + linesSuffix)
-        print("\n"*5)
-
-        InvalidSyntax().report()
+        with open(path, "rb") as f:
+            data = f.read()
+        # the marshal format depends on the python version
+        if not data.startswith(MAGIC_NUMBER): return None
+        compiledCode = marshal.loads(data[len(MAGIC_NUMBER):])
+        # update the access time to make the eviction least recently used
+        os.utime(path)
+        return compiledCode
+    except: return None
+
+def saveCompiledCode(key, compiledCode):
+    global diskEntryAmount
+
+    path = getCachePath(key)
+    if path is None: return
+
+    try:
+        # other Blender instances can write the same file at the same time
+        fileDescriptor, temporaryPath = tempfile.mkstemp(dir = os.path.dirname(path), suffix = ".tmp")
+        try:
+            with os.fdopen(fileDescriptor, "wb") as f:
+                f.write(MAGIC_NUMBER)
+                f.write(marshal.dumps(compiledCode))
+            os.replace(temporaryPath, path)
+        except:
+            os.remove(temporaryPath)
+            raise
+    except: return
+
+    if diskEntryAmount is None:
+        diskEntryAmount = len(getCacheFiles())
+    else:
+        diskEntryAmount += 1
+
+    if diskEntryAmount > diskCacheSize:
+        removeLeastRecentlyUsedFiles(int(diskCacheSize * 0.8))
+
+def removeLeastRecentlyUsedFiles(remainingAmount):
+    global diskEntryAmount
+
+    paths = getCacheFiles()
+    paths.sort(key = getModificationTime)
+    for path in paths[:max(len(paths) - remainingAmount, 0)]:
+        try: os.remove(path)
+        except: pass
+    diskEntryAmount = len(getCacheFiles())
+
+def getCacheFiles():
+    directory = getCacheDirectory()
+    if directory is None: return []
+    return [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".pyc")]
+
+def getModificationTime(path):
+    try: return os.path.getmtime(path)
+    except: return 0
+
+def getCachePath(key):
+    directory = getCacheDirectory()
+    if directory is None: return None
+    return os.path.join(directory, key + ".pyc")
+
+def getCacheDirectory():
+    global _cacheDirectory
+    if _cacheDirectory is None:
+        _cacheDirectory = getAddonDataDirectory("compiled_scripts")
+    return _cacheDirectory
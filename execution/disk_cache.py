@@ -0,0 +1,251 @@
+import os
+import bpy
+import json
+import numpy
+import shutil
+import hashlib
+import tempfile
+from mathutils import Vector, Matrix, Euler, Quaternion, Color
+from .. data_structures.vector_list import Vector3DList
+
+# Results of subprograms are stored per frame in a folder next to the .blend file.
+# The file names contain a fingerprint of the inputs, the code, the unlinked socket values
+# and the node properties of the subprogram and of all subprograms it invokes,
+# so that outdated results are never loaded.
+# The folder can be shared with other machines, so the files must not contain pickled
+# data that could execute code when it is loaded. They are .npz files with the serialized
+# structure as JSON and the arrays stored separately.
+
+fileExtension = ".ancache"
+
+def loadFrame(subprogramIdentifier, frame, fingerprint):
+    '''Returns (found, outputs)'''
+    path = getFramePath(subprogramIdentifier, frame, fingerprint)
+    if path is None or not os.path.exists(path): return False, None
+    try:
+        with open(path, "rb") as f:
+            return True, readCacheFile(f)
+    except: return False, None
+
+def saveFrame(subprogramIdentifier, frame, fingerprint, outputs):
+    path = getFramePath(subprogramIdentifier, frame, fingerprint)
+    if path is None: return
+
+    try: structure, arrays = extractArrays(serializeValue(outputs))
+    except TypeError: return # e.g. outputs that reference Blender data
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        # the folder can be shared by many machines, so the temporary file needs a unique name
+        fileDescriptor, temporaryPath = tempfile.mkstemp(dir = os.path.dirname(path), suffix = ".tmp")
+        try:
+            with os.fdopen(fileDescriptor, "wb") as f:
+                writeCacheFile(f, structure, arrays)
+            os.replace(temporaryPath, path)
+        except:
+            os.remove(temporaryPath)
+            raise
+    except OSError: pass
+
+def clearSubprogramDiskCache(subprogramIdentifier):
+    directory = getSubprogramCacheDirectory(subprogramIdentifier)
+    if directory is not None and os.path.isdir(directory):
+        shutil.rmtree(directory, ignore_errors = True)
+
+def getFramePath(subprogramIdentifier, frame, fingerprint):
+    if fingerprint is None: return None
+    directory = getSubprogramCacheDirectory(subprogramIdentifier)
+    if directory is None: return None
+    return os.path.join(directory, "{}_{}{}".format(frame, fingerprint, fileExtension))
+
+def getSubprogramCacheDirectory(subprogramIdentifier):
+    # unsaved files have no folder to store the cache in
+    if bpy.data.filepath == "": return None
+    blendName = os.path.splitext(os.path.basename(bpy.data.filepath))[0]
+    return os.path.join(os.path.dirname(bpy.path.abspath(bpy.data.filepath)),
+                        blendName + "_an_cache", subprogramIdentifier)
+
+
+# Fingerprints
+################################
+
+def getFingerprint(subprogramIdentifier, inputs):
+    '''
+    Returns a hex string that only depends on the input values and the subprograms
+    or None when a value has no stable representation.
+    '''
+    sha1 = hashlib.sha1()
+    try:
+        updateFingerprint(sha1, inputs)
+        if not updateSubprogramFingerprint(sha1, subprogramIdentifier, set()): return None
+    except TypeError: return None
+    return sha1.hexdigest()[:20]
+
+def updateSubprogramFingerprint(sha1, subprogramIdentifier, visitedIdentifiers):
+    '''Returns False when a subprogram does not exist'''
+    from . units import getSubprogramUnitByIdentifier
+    if subprogramIdentifier in visitedIdentifiers: return True
+    visitedIdentifiers.add(subprogramIdentifier)
+
+    unit = getSubprogramUnitByIdentifier(subprogramIdentifier)
+    if unit is None: return False
+
+    sha1.update("subprogram {!r};".format(subprogramIdentifier).encode("utf-8"))
+    for code in unit.getCodes():
+        sha1.update(code.encode("utf-8"))
+
+    # the generated code reads these values during the execution
+    for node in sorted(unit.network.getAnimationNodes(), key = lambda node: node.identifier):
+        updateNodeFingerprint(sha1, node)
+
+    for identifier in sorted(unit.network.getInvokedSubprogramIdentifiers()):
+        if not updateSubprogramFingerprint(sha1, identifier, visitedIdentifiers): return False
+    return True
+
+def updateNodeFingerprint(sha1, node):
+    sha1.update("node {!r};".format(node.identifier).encode("utf-8"))
+    updatePropertiesFingerprint(sha1, node, ignoredNodeProperties())
+    for socket in node.inputs:
+        if socket.isLinked: continue
+        if socket.hasValueCode: updateFingerprint(sha1, socket.getValueCode())
+        else: updateFingerprint(sha1, socket.getValue())
+
+def updatePropertiesFingerprint(sha1, owner, ignoredProperties = (), depth = 0):
+    if depth > 5: raise TypeError("property groups are nested too deep")
+    for prop in owner.bl_rna.properties:
+        name = prop.identifier
+        if name in ignoredProperties or name == "rna_type": continue
+        value = getattr(owner, name, None)
+        sha1.update("{}=".format(name).encode("utf-8"))
+        if prop.type == "COLLECTION":
+            sha1.update("[{}:".format(len(value)).encode())
+            for item in value:
+                updatePropertiesFingerprint(sha1, item, depth = depth + 1)
+            sha1.update(b"]")
+        elif prop.type == "POINTER" and not isinstance(value, bpy.types.ID) and value is not None:
+            updatePropertiesFingerprint(sha1, value, depth = depth + 1)
+        elif isinstance(value, set):
+            updateFingerprint(sha1, sorted(value))
+        elif hasattr(value, "__len__") and not isinstance(value, (str, bpy.types.ID)):
+            updateFingerprint(sha1, tuple(value))
+        else:
+            updateFingerprint(sha1, value)
+
+def ignoredNodeProperties():
+    # location, selection, colors and other properties that don't influence the results
+    return {prop.identifier for prop in bpy.types.Node.bl_rna.properties}
+
+def updateFingerprint(sha1, value):
+    if isinstance(value, (list, tuple)):
+        sha1.update("[{}:".format(len(value)).encode())
+        for element in value:
+            updateFingerprint(sha1, element)
+        sha1.update(b"]")
+    elif isinstance(value, numpy.ndarray):
+        sha1.update("array {} {}".format(value.dtype.str, value.shape).encode())
+        sha1.update(numpy.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (bool, int, float, str)) or value is None:
+        sha1.update("{} {!r};".format(type(value).__name__, value).encode("utf-8"))
+    elif isinstance(value, bpy.types.ID):
+        # datablocks have the same name on all machines
+        sha1.update("ID {} {!r} {!r};".format(type(value).__name__, value.name,
+            getattr(value.library, "filepath", "")).encode("utf-8"))
+    elif isinstance(value, (Vector, Euler, Quaternion, Color)):
+        sha1.update("{} {!r};".format(type(value).__name__, tuple(value)).encode())
+    elif isinstance(value, Matrix):
+        sha1.update("Matrix {!r};".format([tuple(row) for row in value]).encode())
+    elif hasattr(value, "asNumpyArray"):
+        updateFingerprint(sha1, value.asNumpyArray())
+    else:
+        raise TypeError("no stable fingerprint for {}".format(type(value).__name__))
+
+
+# Serialization
+################################
+
+# mathutils types cannot be pickled, they are stored as tuples or arrays.
+# Other objects are only kept for the parallel loops, they cannot be stored on disk.
+
+arrayDataTypes = {"ARRAY", "VECTOR_LIST", "MATRIX_LIST", "VECTOR_3D_LIST"}
+
+def serializeValue(value):
+    if isinstance(value, list):
+        arrayData = serializeMathutilsList(value)
+        if arrayData is not None: return arrayData
+        return ("LIST", [serializeValue(element) for element in value])
+    if isinstance(value, tuple):
+        return ("TUPLE", [serializeValue(element) for element in value])
+    if isinstance(value, (bool, int, float, str)) or value is None: return ("VALUE", value)
+    if isinstance(value, Vector): return ("VECTOR", tuple(value))
+    if isinstance(value, Matrix): return ("MATRIX", [tuple(row) for row in value])
+    if isinstance(value, Euler): return ("EULER", tuple(value), value.order)
+    if isinstance(value, Quaternion): return ("QUATERNION", tuple(value))
+    if isinstance(value, Color): return ("COLOR", tuple(value))
+    if isinstance(value, numpy.ndarray): return ("ARRAY", value)
+    if isinstance(value, Vector3DList): return ("VECTOR_3D_LIST", value.asNumpyArray())
+    return ("OBJECT", value)
+
+def serializeMathutilsList(values):
+    if len(values) == 0: return None
+    if all(isinstance(value, Vector) and len(value) == 3 for value in values):
+        return ("VECTOR_LIST", numpy.array(values, dtype = numpy.float32))
+    if all(isinstance(value, Matrix) and len(value) == 4 and len(value.col) == 4 for value in values):
+        return ("MATRIX_LIST", numpy.array([[tuple(row) for row in value] for value in values], dtype = numpy.float32))
+    return None
+
+def deserializeValue(data):
+    type = data[0]
+    if type == "VALUE": return data[1]
+    if type == "LIST": return [deserializeValue(element) for element in data[1]]
+    if type == "TUPLE": return tuple(deserializeValue(element) for element in data[1])
+    if type == "VECTOR": return Vector(data[1])
+    if type == "MATRIX": return Matrix(data[1])
+    if type == "EULER": return Euler(data[1], data[2])
+    if type == "QUATERNION": return Quaternion(data[1])
+    if type == "COLOR": return Color(data[1])
+    if type == "ARRAY": return data[1]
+    if type == "VECTOR_LIST": return [Vector(co) for co in data[1].tolist()]
+    if type == "MATRIX_LIST": return [Matrix(rows) for rows in data[1].tolist()]
+    if type == "VECTOR_3D_LIST": return Vector3DList.fromNumpyArray(data[1])
+    if type == "OBJECT": return data[1]
+    raise ValueError("Unknown cache data type: " + str(type))
+
+
+# Cache Files
+################################
+
+def extractArrays(data, arrays = None):
+    '''
+    Returns a JSON compatible copy of the serialized data and the arrays,
+    the copy contains the indices of the arrays instead.
+    '''
+    if arrays is None: arrays = []
+    type = data[0]
+    if type in ("LIST", "TUPLE"):
+        return (type, [extractArrays(element, arrays)[0] for element in data[1]]), arrays
+    if type in arrayDataTypes:
+        if data[1].dtype.hasobject: raise TypeError("arrays of objects cannot be stored")
+        arrays.append(data[1])
+        return (type, len(arrays) - 1), arrays
+    if type == "OBJECT":
+        raise TypeError("cannot store {}".format(data[1].__class__.__name__))
+    return data, arrays
+
+def insertArrays(data, arrays):
+    type = data[0]
+    if type in ("LIST", "TUPLE"):
+        return (type, [insertArrays(element, arrays) for element in data[1]])
+    if type in arrayDataTypes:
+        return (type, arrays[data[1]])
+    return data
+
+def writeCacheFile(file, structure, arrays):
+    namedArrays = {"array_{}".format(i) : array for i, array in enumerate(arrays)}
+    namedArrays["structure"] = numpy.frombuffer(json.dumps(structure).encode("utf-8"), dtype = numpy.uint8)
+    numpy.savez(file, **namedArrays)
+
+def readCacheFile(file):
+    with numpy.load(file, allow_pickle = False) as content:
+        structure = json.loads(content["structure"].tobytes().decode("utf-8"))
+        arrays = [content["array_{}".format(i)] for i in range(len(content.files) - 1)]
+    return deserializeValue(insertArrays(structure, arrays))
@@ -4,7 +4,9 @@ from . code_generator import (getInitialVariables,
                               getSetupCode,
                               getGlobalizeStatement,
                               getNodeExecutionLines,
-                              linkOutputSocketsToTargets)
+                              linkOutputSocketsToTargets,
+                              getExecutionPositions,
+                              removeUnusedNodes)
 
 class GroupExecutionUnit:
     def __init__(self, network):
@@ -39,6 +41,7 @@ class GroupExecutionUnit:
     def generateScript(self):
         try: nodes = self.network.getSortedAnimationNodes()
         except: return
+        nodes = removeUnusedNodes(nodes)
 
         variables = getInitialVariables(nodes)
         self.setupScript = getSetupCode(nodes, variables)
@@ -64,10 +67,11 @@ class GroupExecutionUnit:
     def getExecutionScriptLines(self, nodes, variables):
         lines = []
         lines.extend(linkOutputSocketsToTargets(self.network.groupInputNode, variables))
+        positions = getExecutionPositions(nodes)
         for node in nodes:
             if node.bl_idname in ("an_GroupInputNode", "an_GroupOutputNode"): continue
             lines.extend(getNodeExecutionLines(node, variables))
-            lines.extend(linkOutputSocketsToTargets(node, variables))
+            lines.extend(linkOutputSocketsToTargets(node, variables, positions))
         return lines
 
     def getReturnStatement(self, outputNode, variables):
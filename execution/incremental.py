@@ -0,0 +1,41 @@
+import bpy
+
+# Node properties that are read during the execution are not part of the
+# generated code, so changes to them have to be tracked separately.
+_taggedNodeIdentifiers = set()
+_invalidationCounter = 0
+
+def tagChangedProperty(owner):
+    global _invalidationCounter
+    if isinstance(owner, bpy.types.NodeSocket):
+        # unlinked socket values are compared in the execution code
+        return
+    if getattr(owner, "isAnimationNode", False):
+        _taggedNodeIdentifiers.add(owner.identifier)
+    else:
+        # the owner of the property is unknown
+        _invalidationCounter += 1
+
+def popTaggedNodeIdentifiers(identifiers):
+    taggedIdentifiers = _taggedNodeIdentifiers.intersection(identifiers)
+    _taggedNodeIdentifiers.difference_update(taggedIdentifiers)
+    return taggedIdentifiers
+
+def getInvalidationCounter():
+    return _invalidationCounter
+
+
+def updateCachedValue(cache, key, value):
+    '''
+    Store the value in the cache and return True
+    when it is different from the previous one.
+    '''
+    if key in cache and not valuesDiffer(cache[key], value):
+        return False
+    cache[key] = value
+    return True
+
+def valuesDiffer(a, b):
+    if a is b: return False
+    try: return bool(a != b)
+    except: return True
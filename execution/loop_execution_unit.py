@@ -1,12 +1,15 @@
 from . compile_scripts import compileScript
+from .. preferences import measurementsForceSerialExecution
 from .. problems import ExecutionUnitNotSetup
+from . parallel_loop import ParallelLoop, canExecuteLoopInParallel
 from . code_generator import (getInitialVariables,
                               getSetupCode,
                               getCopyExpression,
                               getGlobalizeStatement,
                               getNodeExecutionLines,
                               linkOutputSocketsToTargets,
-                              getLoadSocketValueLine)
+                              getLoadSocketValueLine,
+                              getExecutionPositions)
 
 class LoopExecutionUnit:
     def __init__(self, network):
@@ -14,6 +17,7 @@ class LoopExecutionUnit:
         self.setupScript = ""
         self.setupCodeObject = None
         self.executionData = {}
+        self.isParallel = False
 
         self.generateScript()
         self.compileScript()
@@ -24,6 +28,20 @@ class LoopExecutionUnit:
         self.executionData = {}
         exec(self.setupCodeObject, self.executionData, self.executionData)
         self.execute = self.executionData["main"]
+        if self.isParallel:
+            self.execute = self.createParallelLoop(self.execute)
+
+    def createParallelLoop(self, function):
+        inputNode = self.network.loopInputNode
+        iterators = inputNode.getIteratorSockets()
+        outputIteratorAmount = len([socket for socket in iterators if socket.loop.useAsOutput])
+        generatorAmount = len(inputNode.getSortedGeneratorNodes())
+        outputParameterAmount = len([socket for socket in inputNode.getParameterSockets() if socket.loop.useAsOutput])
+        return ParallelLoop(function, self.setupScript,
+            iterateThroughLists = inputNode.iterateThroughLists,
+            iteratorAmount = len(iterators),
+            joinedIndices = list(range(outputIteratorAmount + generatorAmount)),
+            outputAmount = outputIteratorAmount + generatorAmount + outputParameterAmount)
 
     def insertSubprogramFunctions(self, data):
         self.executionData.update(data)
@@ -42,6 +60,10 @@ class LoopExecutionUnit:
         try: nodes = self.network.getSortedAnimationNodes()
         except: return
 
+        inputNode = self.network.loopInputNode
+        self.isParallel = (inputNode.useParallelExecution and not measurementsForceSerialExecution()
+                           and canExecuteLoopInParallel(inputNode, nodes))
+
         variables = getInitialVariables(nodes)
         self.setupScript = getSetupCode(nodes, variables)
         self.setupScript += "\n"*3
@@ -75,13 +97,12 @@ class LoopExecutionUnit:
                 variables[socket] = name
                 parameterNames.append(name)
 
-        header = "def main({}):".format(", ".join(parameterNames))
-        return header
+        return self.getMainHeader(parameterNames)
 
     def get_IterationsAmount_PrepareLoop(self, inputNode, variables):
         lines = []
         variables[inputNode.indexSocket] = "current_loop_index"
-        lines.append("for current_loop_index in range(loop_iterations):")
+        lines.append("for current_loop_index in {}:".format(self.getLoopIndices()))
         return lines
 
 
@@ -106,14 +127,26 @@ class LoopExecutionUnit:
                 variables[socket] = name
                 parameterNames.append(name)
 
-        header = "def main({}):".format(", ".join(parameterNames))
-        return header
+        return self.getMainHeader(parameterNames)
+
+    def getMainHeader(self, parameterNames):
+        # a parallel loop executes only a part of the iterations in each process
+        if self.isParallel: parameterNames = parameterNames + ["loop_chunk_range = None"]
+        return "def main({}):".format(", ".join(parameterNames))
+
+    def getLoopIndices(self):
+        if self.isParallel: return "(range(loop_iterations) if loop_chunk_range is None else loop_chunk_range)"
+        return "range(loop_iterations)"
 
     def get_IteratorLength_PrepareLoop(self, inputNode, variables):
         lines = []
 
         iterators = inputNode.getIteratorSockets()
         iteratorNames = ["loop_iterator_" + str(i) for i in range(len(iterators))]
+        for name, socket in zip(iteratorNames, iterators):
+            if socket.dataType == "Vector":
+                # changes of the elements have to be visible in the returned iterator list
+                lines.append("{0} = animation_nodes.data_structures.vector_list.toVectorList({0})".format(name))
         zipLine = "loop_zipped_list = list(zip({}))".format(", ".join(iteratorNames))
         iterationsLine = "loop_iterations = len(loop_zipped_list)"
 
@@ -122,7 +155,12 @@ class LoopExecutionUnit:
             name = "loop_iterator_element_" + str(i)
             variables[socket] = name
             names.append(name)
-        loopLine = "for current_loop_index, ({}, ) in enumerate(loop_zipped_list):".format(", ".join(names))
+        if self.isParallel:
+            loopLine = "for current_loop_index in {}:".format(self.getLoopIndices())
+            if len(names) > 0:
+                loopLine += "\n" + " " * 8 + "{}, = loop_zipped_list[current_loop_index]".format(", ".join(names))
+        else:
+            loopLine = "for current_loop_index, ({}, ) in enumerate(loop_zipped_list):".format(", ".join(names))
 
         variables[inputNode.indexSocket] = "current_loop_index"
         variables[inputNode.iterationsSocket] = "loop_iterations"
@@ -152,10 +190,11 @@ class LoopExecutionUnit:
     def get_LoopBody(self, inputNode, nodes, variables):
         lines = []
         lines.extend(linkOutputSocketsToTargets(inputNode, variables))
+        positions = getExecutionPositions(nodes)
         for node in nodes:
             if node.bl_idname in ("an_LoopInputNode", "an_LoopGeneratorOutputNode", "an_ReassignLoopParameterNode"): continue
             lines.extend(getNodeExecutionLines(node, variables))
-            lines.extend(linkOutputSocketsToTargets(node, variables))
+            lines.extend(linkOutputSocketsToTargets(node, variables, positions))
         lines.extend(self.get_LoopBreak(inputNode, variables))
         lines.extend(self.get_AddToGenerators(inputNode, variables))
         lines.extend(self.get_ReassignParameters(inputNode, variables))
@@ -197,13 +236,22 @@ class LoopExecutionUnit:
 
     def get_ReturnStatement(self, inputNode, variables):
         names = []
-        names.extend(["loop_iterator_" + str(i) for i, socket in enumerate(inputNode.getIteratorSockets()) if socket.loop.useAsOutput])
+        for i, socket in enumerate(inputNode.getIteratorSockets()):
+            if socket.loop.useAsOutput:
+                names.append(self.getIteratorOutputExpression("loop_iterator_" + str(i)))
         names.extend([variables[node] for node in inputNode.getSortedGeneratorNodes()])
         names.extend([variables[socket] for socket in inputNode.getParameterSockets() if socket.loop.useAsOutput])
         return "return {}".format(", ".join(names))
 
 
 
+    def getIteratorOutputExpression(self, name):
+        # every chunk of a parallel loop only returns its own elements, the last one also the rest
+        if not self.isParallel: return name
+        return ("{0} if loop_chunk_range is None else {0}[loop_chunk_range.start:"
+                "loop_chunk_range.stop if loop_chunk_range.stop < loop_iterations else None]").format(name)
+
+
     def compileScript(self):
         self.setupCodeObject = compileScript(self.setupScript, name = "group: {}".format(repr(self.network.name)))
 
@@ -1,11 +1,22 @@
 import sys, traceback
 from .. import problems
+from itertools import chain
+from collections import defaultdict
 from . compile_scripts import compileScript
+from .. preferences import incrementalExecutionIsEnabled, parallelExecutionIsEnabled, constantFoldingIsEnabled
 from .. problems import ExecutionUnitNotSetup, ExceptionDuringExecution
+from . incremental import popTaggedNodeIdentifiers, getInvalidationCounter
 from . code_generator import (getInitialVariables,
                               getSetupCode,
                               getNodeExecutionLines,
-                              linkOutputSocketsToTargets)
+                              linkOutputSocketsToTargets,
+                              getIncrementalSetupLines,
+                              getIncrementalNodeExecutionLines,
+                              getParallelExecutionParts,
+                              getExecutionPositions,
+                              getConstantNodeIdentifiers,
+                              getConstantExecutionLines,
+                              removeUnusedNodes)
 
 class MainExecutionUnit:
     def __init__(self, network):
@@ -16,6 +27,28 @@ class MainExecutionUnit:
         self.executeCodeObject = None
         self.executionData = {}
 
+        # the input script contains nodes that only read Blender data and runs in the main thread,
+        # the parallel script contains pure nodes that can run afterwards in a worker thread,
+        # the serial script all other nodes that run in the main thread after all workers finished
+        self.inputScript = ""
+        self.parallelScript = ""
+        self.serialScript = ""
+        self.inputCodeObject = None
+        self.parallelCodeObject = None
+        self.serialCodeObject = None
+        self.parallelFuture = None
+        self.parallelError = None
+        self.serialPartPending = False
+
+        self.isIncremental = False
+        self.nodeIdentifiers = set()
+        self.incrementalCache = {}
+        self.invalidationCounter = getInvalidationCounter()
+
+        # outputs of constant nodes, kept until an input or property of them changes
+        self.constantNodeIdentifiers = set()
+        self.constantCache = {}
+
         self.generateScripts()
         self.compileScripts()
         self.execute = self.raiseNotSetupException
@@ -24,19 +57,89 @@ class MainExecutionUnit:
     def setup(self):
         self.executionData = {}
         exec(self.setupCodeObject, self.executionData, self.executionData)
+        if len(self.constantNodeIdentifiers) > 0: self.insertConstantData()
         self.execute = self.executeUnit
 
+    def insertIncrementalData(self):
+        if self.invalidationCounter != getInvalidationCounter():
+            self.invalidationCounter = getInvalidationCounter()
+            self.incrementalCache.clear()
+        self.executionData["incremental_cache"] = self.incrementalCache
+        self.executionData["incremental_tagged_nodes"] = popTaggedNodeIdentifiers(self.nodeIdentifiers)
+
+    def insertConstantData(self):
+        if self.invalidationCounter != getInvalidationCounter():
+            self.invalidationCounter = getInvalidationCounter()
+            self.constantCache.clear()
+        self.executionData["constant_cache"] = self.constantCache
+        self.executionData["constant_tagged_nodes"] = popTaggedNodeIdentifiers(self.constantNodeIdentifiers)
+
     def insertSubprogramFunctions(self, data):
         self.executionData.update(data)
 
     def finish(self):
+        self.waitForParallelPart()
+        self.serialPartPending = False
+        self.parallelError = None
         self.executionData.clear()
         self.execute = self.raiseNotSetupException
 
     def executeUnit(self):
+        if self.serialPartPending:
+            self.serialPartPending = False
+            self.executeSerialPart()
+            return
+
         try:
+            if self.isIncremental: self.insertIncrementalData()
             exec(self.executeCodeObject, self.executionData, self.executionData)
         except:
+            # partially updated caches cannot be trusted anymore
+            self.incrementalCache.clear()
+            self.constantCache.clear()
+            print("\n"*5)
+            traceback.print_exc()
+            ExceptionDuringExecution().report()
+
+
+    def canStartParallelPart(self):
+        return (self.execute == self.executeUnit and
+                self.parallelCodeObject is not None and
+                not self.serialPartPending)
+
+    def startParallelPart(self, pool):
+        '''Executes the input part and starts the worker, the serial part follows in execute()'''
+        self.serialPartPending = True
+        self.parallelError = self.executePart(self.inputCodeObject)
+        if self.parallelError is None:
+            self.parallelFuture = pool.submit(self.executePart, self.parallelCodeObject)
+
+    def executePart(self, codeObject):
+        '''Returns the formatted exception or None'''
+        try: exec(codeObject, self.executionData, self.executionData)
+        except: return traceback.format_exc()
+        return None
+
+    def waitForParallelPart(self):
+        if self.parallelFuture is None: return
+        error = self.parallelFuture.result()
+        self.parallelFuture = None
+        if self.parallelError is None:
+            self.parallelError = error
+
+    def executeSerialPart(self):
+        self.waitForParallelPart()
+        if self.parallelError is not None:
+            self.constantCache.clear()
+            print("\n"*5)
+            print(self.parallelError)
+            self.parallelError = None
+            ExceptionDuringExecution().report()
+            return
+
+        try: exec(self.serialCodeObject, self.executionData, self.executionData)
+        except:
+            self.constantCache.clear()
             print("\n"*5)
             traceback.print_exc()
             ExceptionDuringExecution().report()
@@ -50,21 +153,90 @@ class MainExecutionUnit:
     def generateScripts(self):
         try: nodes = self.network.getSortedAnimationNodes()
         except: return
+        nodes = removeUnusedNodes(nodes)
 
         variables = getInitialVariables(nodes)
         self.setupScript = getSetupCode(nodes, variables)
-        self.executeScript = self.getExecutionScript(nodes, variables)
 
-    def getExecutionScript(self, nodes, variables):
-        lines = []
+        if incrementalExecutionIsEnabled():
+            self.isIncremental = True
+            self.nodeIdentifiers = {node.identifier for node in nodes}
+            self.setupScript += "\n" + "\n".join(getIncrementalSetupLines())
+            self.executeScript = self.getIncrementalExecutionScript(nodes, variables)
+        else:
+            if constantFoldingIsEnabled():
+                self.constantNodeIdentifiers = getConstantNodeIdentifiers(nodes)
+            if len(self.constantNodeIdentifiers) > 0:
+                self.setupScript += "\n" + "\n".join(getIncrementalSetupLines())
+            if parallelExecutionIsEnabled():
+                inputIdentifiers, workerIdentifiers = getParallelExecutionParts(nodes, self.constantNodeIdentifiers)
+                nodes = self.getNodesInOrder(nodes, [inputIdentifiers, workerIdentifiers])
+            else:
+                nodes = self.getNodesInOrder(nodes, [])
+            linesByNode = self.getExecutionLinesByNode(nodes, variables)
+            self.executeScript = "\n".join(chain.from_iterable(linesByNode))
+            if parallelExecutionIsEnabled():
+                self.generateParallelScripts(nodes, linesByNode, inputIdentifiers, workerIdentifiers)
+
+    def getNodesInOrder(self, nodes, parts):
+        '''
+        Puts the nodes of every part before the remaining nodes and the constant
+        nodes first within their part. The copy elimination needs the real order.
+        '''
+        def getSortKey(node):
+            partIndex = next((i for i, identifiers in enumerate(parts) if node.identifier in identifiers), len(parts))
+            return (partIndex, node.identifier not in self.constantNodeIdentifiers)
+        # sorted() is stable, so the nodes stay sorted within their group
+        return sorted(nodes, key = getSortKey)
+
+    def getExecutionLinesByNode(self, nodes, variables):
+        linesByNode = []
+        pendingCopyLines = defaultdict(list)
+        constantNodes = [node for node in nodes if node.identifier in self.constantNodeIdentifiers]
+
+        positions = getExecutionPositions(nodes)
         for node in nodes:
+            lines = []
+            if node.identifier in self.constantNodeIdentifiers:
+                # the lines of all constant nodes belong to the first one
+                if node.identifier == constantNodes[0].identifier:
+                    lines.extend(getConstantExecutionLines(constantNodes, variables, pendingCopyLines))
+                linesByNode.append(lines)
+                continue
+
+            lines.extend(pendingCopyLines.pop(node.identifier, []))
             lines.extend(getNodeExecutionLines(node, variables))
-            lines.extend(linkOutputSocketsToTargets(node, variables))
+            lines.extend(linkOutputSocketsToTargets(node, variables, positions))
+            linesByNode.append(lines)
+        return linesByNode
+
+    def generateParallelScripts(self, nodes, linesByNode, inputIdentifiers, workerIdentifiers):
+        if len(workerIdentifiers) == 0: return
+
+        inputLines, parallelLines, serialLines = [], [], []
+        for node, lines in zip(nodes, linesByNode):
+            if node.identifier in inputIdentifiers: inputLines.extend(lines)
+            elif node.identifier in workerIdentifiers: parallelLines.extend(lines)
+            else: serialLines.extend(lines)
+        self.inputScript = "\n".join(inputLines)
+        self.parallelScript = "\n".join(parallelLines)
+        self.serialScript = "\n".join(serialLines)
+
+    def getIncrementalExecutionScript(self, nodes, variables):
+        lines = []
+        changeFlags = {}
+        pendingCopyLines = defaultdict(list)
+        for node in nodes:
+            lines.extend(getIncrementalNodeExecutionLines(node, variables, changeFlags, pendingCopyLines))
         return "\n".join(lines)
 
     def compileScripts(self):
         self.setupCodeObject = compileScript(self.setupScript, name = "setup: {}".format(repr(self.network.treeName)))
         self.executeCodeObject = compileScript(self.executeScript, name = "execution: {}".format(repr(self.network.treeName)))
+        if self.parallelScript != "":
+            self.inputCodeObject = compileScript(self.inputScript, name = "input execution: {}".format(repr(self.network.treeName)))
+            self.parallelCodeObject = compileScript(self.parallelScript, name = "parallel execution: {}".format(repr(self.network.treeName)))
+            self.serialCodeObject = compileScript(self.serialScript, name = "serial execution: {}".format(repr(self.network.treeName)))
 
 
     def raiseNotSetupException(self, *args, **kwargs):
@@ -0,0 +1,41 @@
+from time import perf_counter as timer
+
+# Execution times of nodes, collected when the generated code contains timers.
+# Nodes in loops and groups are measured once per call.
+
+class NodeMeasurement:
+    __slots__ = ("totalTime", "calls")
+
+    def __init__(self):
+        self.totalTime = 0.0
+        self.calls = 0
+
+    @property
+    def averageTime(self):
+        return self.totalTime / self.calls if self.calls > 0 else 0.0
+
+    def __repr__(self):
+        return "<NodeMeasurement - Total: {:.6f} s, Calls: {}>".format(self.totalTime, self.calls)
+
+_measurementsByNode = {}
+
+def recordNodeTime(identifier, duration):
+    measurement = _measurementsByNode.get(identifier)
+    if measurement is None:
+        measurement = _measurementsByNode[identifier] = NodeMeasurement()
+    measurement.totalTime += duration
+    measurement.calls += 1
+
+def getNodeMeasurement(identifier):
+    return _measurementsByNode.get(identifier, None)
+
+def getNodeMeasurements():
+    return dict(_measurementsByNode)
+
+def getSlowestNodes(amount = 10):
+    '''Returns (identifier, measurement) pairs sorted by the total time'''
+    items = sorted(_measurementsByNode.items(), key = lambda item: item[1].totalTime, reverse = True)
+    return items[:amount]
+
+def resetMeasurements():
+    _measurementsByNode.clear()
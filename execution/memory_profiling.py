@@ -0,0 +1,99 @@
+import json
+import tracemalloc
+from .. utils.lru_cache import estimateSize
+
+# Memory usage of nodes, collected when the generated code contains the profiling calls.
+# tracemalloc only sees allocations made by Python and by libraries
+# that report to it (like NumPy), not allocations inside of Blender.
+
+class NodeMemoryRecord:
+    __slots__ = ("calls", "allocatedBytes", "peakBytes", "outputBytes", "outputElements")
+
+    def __init__(self):
+        self.calls = 0
+        self.allocatedBytes = 0
+        self.peakBytes = 0
+        self.outputBytes = 0
+        self.outputElements = 0
+
+# without tracemalloc.reset_peak (Python 3.9) the peak is the one of the whole session
+canMeasurePeaks = hasattr(tracemalloc, "reset_peak")
+
+_recordsByNode = {}
+_copyAmountsBySocket = {}
+
+def startTracing():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def stopTracing():
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def startNodeMemory():
+    # tracing is not active yet when the setting was saved in the preferences
+    if not tracemalloc.is_tracing(): tracemalloc.start()
+    if canMeasurePeaks:
+        tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+def recordNodeMemory(identifier, startMemory, outputs):
+    current, peak = tracemalloc.get_traced_memory()
+    record = _recordsByNode.get(identifier)
+    if record is None:
+        record = _recordsByNode[identifier] = NodeMemoryRecord()
+
+    record.calls += 1
+    record.allocatedBytes += max(current - startMemory, 0)
+    if canMeasurePeaks:
+        record.peakBytes = max(record.peakBytes, peak - startMemory)
+    record.outputBytes = sum(estimateSize(output) for output in outputs)
+    record.outputElements = sum(getElementAmount(output) for output in outputs)
+
+def getElementAmount(value):
+    if hasattr(value, "vertices") and hasattr(value, "polygons"):
+        return len(value.vertices) + len(value.edges) + len(value.polygons)
+    try: return len(value)
+    except TypeError: return 1
+
+def setCopyAmount(nodeIdentifier, socketIdentifier, amount):
+    '''Called during code generation with the amount of copies the socket makes per execution'''
+    _copyAmountsBySocket[(nodeIdentifier, socketIdentifier)] = amount
+
+def getCopyAmount(nodeIdentifier):
+    return sum(amount for (identifier, _), amount in _copyAmountsBySocket.items() if identifier == nodeIdentifier)
+
+
+# Report
+################################
+
+def getMemoryReport(amount = None):
+    '''
+    Returns a list of dictionaries sorted by the peak memory of the nodes
+    or by the allocated memory when peaks cannot be measured.
+    '''
+    items = []
+    for identifier, record in _recordsByNode.items():
+        item = {
+            "identifier" : identifier,
+            "calls" : record.calls,
+            "allocatedBytes" : record.allocatedBytes,
+            "outputBytes" : record.outputBytes,
+            "outputElements" : record.outputElements,
+            "copiesPerCall" : getCopyAmount(identifier) }
+        if canMeasurePeaks: item["peakBytes"] = record.peakBytes
+        items.append(item)
+    items.sort(key = lambda item: item[getSortKey()], reverse = True)
+    return items if amount is None else items[:amount]
+
+def getSortKey():
+    return "peakBytes" if canMeasurePeaks else "allocatedBytes"
+
+def getMemoryReportJSON(nodeNames = None):
+    items = getMemoryReport()
+    for item in items:
+        item["name"] = (nodeNames or {}).get(item["identifier"], "")
+    return json.dumps(items, indent = 4)
+
+def resetMemoryRecords():
+    _recordsByNode.clear()
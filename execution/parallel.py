@@ -0,0 +1,43 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .. preferences import parallelExecutionIsEnabled
+
+# Every main unit of a node tree first executes the nodes that only read Blender data
+# in the main thread. The pure nodes depending on them are executed in worker threads afterwards.
+# All workers have to finish before the first node that can change Blender data
+# is executed, because the workers still read node properties.
+# Main networks of one node tree have no defined order, so their input parts can run
+# before the serial parts of the others. Node trees are still executed one after another,
+# so a tree always sees the changes of the trees that were executed before.
+# NumPy and mathutils release the GIL in many operations.
+
+_threadPool = None
+
+def getThreadPool():
+    global _threadPool
+    if _threadPool is None:
+        # thread_name_prefix does not exist before Python 3.6
+        _threadPool = ThreadPoolExecutor(max_workers = max(os.cpu_count() or 1, 2))
+    return _threadPool
+
+def startParallelExecution(units):
+    '''
+    Executes the input and parallel parts of all units of one node tree.
+    The serial parts are executed afterwards when the units are executed.
+    Nothing happens when only one unit could benefit from it.
+    '''
+    if not parallelExecutionIsEnabled(): return
+    units = [unit for unit in units if unit.canStartParallelPart()]
+    if len(units) < 2: return
+
+    pool = getThreadPool()
+    for unit in units:
+        unit.startParallelPart(pool)
+    for unit in units:
+        unit.waitForParallelPart()
+
+def shutdownThreadPool():
+    global _threadPool
+    if _threadPool is not None:
+        _threadPool.shutdown(wait = True)
+        _threadPool = None
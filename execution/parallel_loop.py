@@ -0,0 +1,115 @@
+import os
+import pickle
+import threading
+import multiprocessing
+from itertools import chain
+from . disk_cache import serializeValue, deserializeValue
+
+# Loops are executed in a pool of forked processes that is reused until a node
+# property or a node tree changes. The child processes still see the Blender data
+# of the moment they were forked in, so they can execute the setup script of the
+# loop themselves. Only the arguments, chunk ranges and results are pickled.
+
+minIterationsPerChunk = 1000
+_processPool = None
+_workerFunctions = {}
+
+def canExecuteLoopInParallel(inputNode, nodes):
+    '''
+    All nodes in the loop have to be pure and the iterations must not
+    depend on each other (no break conditions and no reassigned parameters).
+    '''
+    if len(inputNode.getBreakNodes()) > 0: return False
+    if len(inputNode.getReassignParameterNodes()) > 0: return False
+    for node in nodes:
+        if node.bl_idname in ("an_LoopInputNode", "an_LoopGeneratorOutputNode"): continue
+        if "Pure" not in node.options: return False
+    return True
+
+class ParallelLoop:
+    def __init__(self, function, script, iterateThroughLists, iteratorAmount, joinedIndices, outputAmount):
+        self.function = function
+        self.script = script
+        self.iterateThroughLists = iterateThroughLists
+        self.iteratorAmount = iteratorAmount
+        self.joinedIndices = joinedIndices
+        self.outputAmount = outputAmount
+
+    def __call__(self, *args):
+        chunks = splitIntoChunks(self.getIterations(args))
+        if len(chunks) >= 2:
+            results = executeChunksInProcesses(self.script, args, chunks)
+            if results is not None: return self.joinResults(results)
+        return self.function(*args)
+
+    def getIterations(self, args):
+        if self.iterateThroughLists:
+            return min((len(iterator) for iterator in args[:self.iteratorAmount]), default = 0)
+        return args[0]
+
+    def joinResults(self, results):
+        '''Iterator outputs and generators only contain the elements of their chunk'''
+        if self.outputAmount == 0: return None
+        if self.outputAmount == 1:
+            if len(self.joinedIndices) == 0: return results[0]
+            return list(chain.from_iterable(results))
+
+        outputs = list(results[0])
+        for index in self.joinedIndices:
+            outputs[index] = list(chain.from_iterable(result[index] for result in results))
+        return tuple(outputs)
+
+def splitIntoChunks(iterations):
+    chunkAmount = min(os.cpu_count() or 1, iterations // minIterationsPerChunk)
+    if chunkAmount < 2: return []
+    bounds = [iterations * i // chunkAmount for i in range(chunkAmount + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def executeChunksInProcesses(script, args, chunks):
+    '''Returns the results of all chunks in order or None when it did not work'''
+    # forking from another thread can copy locks that are held by the main thread
+    if threading.current_thread() is not threading.main_thread(): return None
+
+    pool = getProcessPool()
+    if pool is None: return None
+
+    # arguments that reference Blender data cannot be sent to the processes
+    try: serializedArgs = pickle.dumps(serializeValue(args), protocol = pickle.HIGHEST_PROTOCOL)
+    except: return None
+
+    try:
+        tasks = [(script, serializedArgs, chunk) for chunk in chunks]
+        serializedResults = pool.map(executeChunk, tasks)
+        return [deserializeValue(result) for result in serializedResults]
+    except:
+        terminateProcessPool()
+        return None
+
+def getProcessPool():
+    global _processPool
+    if _processPool is None:
+        try: context = multiprocessing.get_context("fork")
+        except ValueError: return None # e.g. on Windows
+        _processPool = context.Pool(os.cpu_count() or 1)
+    return _processPool
+
+def terminateProcessPool():
+    '''Has to be called whenever Blender data changed that the loops can read'''
+    global _processPool
+    if _processPool is not None:
+        _processPool.terminate()
+        _processPool = None
+
+def executeChunk(task):
+    script, serializedArgs, chunk = task
+    function = getFunctionFromScript(script)
+    args = deserializeValue(pickle.loads(serializedArgs))
+    return serializeValue(function(*args, loop_chunk_range = range(*chunk)))
+
+def getFunctionFromScript(script):
+    # only used in the child processes, they execute the setup script once
+    if script not in _workerFunctions:
+        executionData = {}
+        exec(compile(script, "parallel loop", "exec"), executionData, executionData)
+        _workerFunctions[script] = executionData["main"]
+    return _workerFunctions[script]
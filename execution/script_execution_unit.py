@@ -45,6 +45,8 @@ class ScriptExecutionUnit:
 
         if isCodeValid(userCode):
             codeLines = []
+            codeLines.extend(self.getVectorListConversionLines(node))
+            codeLines.extend(self.getMeshDataConversionLines(node))
             codeLines.extend(userCode.split("\n"))
             codeLines.append(self.getReturnStatement(node))
 
@@ -56,6 +58,22 @@ class ScriptExecutionUnit:
 
         self.setupScript = "\n".join(finalCode)
 
+    def getVectorListConversionLines(self, node):
+        # the user code could change the elements of the vector list in place
+        lines = []
+        for socket in node.inputs[:-1]:
+            if socket.dataType == "Vector List":
+                lines.append("{0} = animation_nodes.data_structures.vector_list.toVectorList({0})".format(socket.text))
+        return lines
+
+    def getMeshDataConversionLines(self, node):
+        # the user code could change the edge and polygon lists in place
+        lines = []
+        for socket in node.inputs[:-1]:
+            if socket.dataType in ("Mesh Data", "Mesh Data List"):
+                lines.append("{0} = animation_nodes.data_structures.mesh.toEditableMeshData({0})".format(socket.text))
+        return lines
+
     def getDebugModeFunctionBody(self, codeLines, node):
         lines = []
         lines.append("try:")
@@ -73,7 +91,12 @@ class ScriptExecutionUnit:
         return header
 
     def getReturnStatement(self, node):
-        outputNames = [socket.text for socket in node.outputs[:-1]]
+        outputNames = []
+        for socket in node.outputs[:-1]:
+            if socket.dataType in ("Mesh Data", "Mesh Data List"):
+                outputNames.append("animation_nodes.data_structures.mesh.toMeshData({})".format(socket.text))
+            else:
+                outputNames.append(socket.text)
         returnList = ", ".join(outputNames)
         return "return " + returnList
 
@@ -13,11 +13,17 @@ from .. problems import ExceptionDuringCodeCreation, CouldNotSetupExecutionUnits
 _mainUnitsByNodeTree = defaultdict(list)
 _subprogramUnitsByIdentifier = {}
 
-def createExecutionUnits():
-    reset()
+def createExecutionUnits(treeNames = None):
+    '''
+    Only the units of the given trees are recreated.
+    None means that all units are recreated.
+    '''
+    if treeNames is None: reset()
+    else: removeUnitsOfTrees(treeNames)
+
     try:
-        createMainUnits()
-        createSubprogramUnits()
+        createMainUnits(treeNames)
+        createSubprogramUnits(treeNames)
     except:
         print("\n"*5)
         traceback.print_exc()
@@ -27,13 +33,21 @@ def reset():
     _mainUnitsByNodeTree.clear()
     _subprogramUnitsByIdentifier.clear()
 
-def createMainUnits():
+def removeUnitsOfTrees(treeNames):
+    for treeName in treeNames:
+        _mainUnitsByNodeTree.pop(treeName, None)
+    for identifier in getSubprogramIdentifiersInTrees(treeNames):
+        del _subprogramUnitsByIdentifier[identifier]
+
+def createMainUnits(treeNames = None):
     for network in getNetworksByType("Main"):
+        if not isInTrees(network, treeNames): continue
         unit = MainExecutionUnit(network)
         _mainUnitsByNodeTree[network.treeName].append(unit)
 
-def createSubprogramUnits():
+def createSubprogramUnits(treeNames = None):
     for network in getSubprogramNetworks():
+        if not isInTrees(network, treeNames): continue
         if network.type == "Group":
             unit = GroupExecutionUnit(network)
         if network.type == "Loop":
@@ -42,6 +56,9 @@ def createSubprogramUnits():
             unit = ScriptExecutionUnit(network)
         _subprogramUnitsByIdentifier[network.identifier] = unit
 
+def isInTrees(network, treeNames):
+    return treeNames is None or network.treeName in treeNames
+
 
 def setupExecutionUnits():
     try:
@@ -82,6 +99,10 @@ def getSubprogramUnitsByName(name):
             programs.append(subprogram)
     return programs
 
+def getSubprogramIdentifiersInTrees(treeNames):
+    return [identifier for identifier, unit in _subprogramUnitsByIdentifier.items()
+            if unit.network.treeName in treeNames]
+
 def getExecutionUnitByNetwork(network):
     for unit in getExecutionUnits():
         if unit.network == network: return unit
@@ -11,6 +11,7 @@ compare_types_items = [(t, t, "") for t in compare_types]
 class CompareNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CompareNode"
     bl_label = "Compare"
+    options = {"Pure"}
 
     def assignedTypeChanged(self, context):
         self.inputIdName = toIdName(self.assignedType)
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class BooleanToIntegerNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_BooleanToIntegerNode"
     bl_label = "Boolean to Integer"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_BooleanSocket", "Boolean", "boolean")
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class InvertNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_InvertNode"
     bl_label = "Invert Boolean"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_BooleanSocket", "Input", "input")
@@ -13,6 +13,7 @@ operationItems = [
 class LogicOperatorsNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_LogicOperatorsNode"
     bl_label = "Logic Operators"
+    options = {"Pure"}
 
     operation = EnumProperty(name = "Operation", default = "AND",
         items = operationItems, update = executionCodeChanged)
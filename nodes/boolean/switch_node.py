@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class SwitchNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SwitchNode"
     bl_label = "Switch"
+    options = {"Pure"}
 
     def assignedTypeChanged(self, context):
         self.socketIdName = toIdName(self.assignedType)
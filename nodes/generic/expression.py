@@ -68,18 +68,44 @@ class ExpressionNode(bpy.types.Node, AnimationNode):
         return {socket.identifier : socket.text for socket in self.inputs}
 
     def getExecutionCode(self):
+        lines = self.getVectorListConversionLines() + self.getMeshDataConversionLines()
+        lines.extend(self.getExpressionLines())
+        if self.usesMeshData():
+            lines.append("result = animation_nodes.data_structures.mesh.toMeshData(result)")
+        return lines
+
+    def getVectorListConversionLines(self):
+        # the expression could change the elements of the vector list in place
+        lines = []
+        for socket in self.inputs[:-1]:
+            if socket.dataType == "Vector List":
+                lines.append("{0} = animation_nodes.data_structures.vector_list.toVectorList({0})".format(socket.text))
+        return lines
+
+    def getMeshDataConversionLines(self):
+        # the expression could change the edge and polygon lists in place
+        lines = []
+        for socket in self.inputs[:-1]:
+            if socket.dataType in ("Mesh Data", "Mesh Data List"):
+                lines.append("{0} = animation_nodes.data_structures.mesh.toEditableMeshData({0})".format(socket.text))
+        return lines
+
+    def usesMeshData(self):
+        return any(socket.dataType in ("Mesh Data", "Mesh Data List") for socket in self.inputs[:-1])
+
+    def getExpressionLines(self):
         expression = self.expression.strip()
 
         if self.debugMode:
             if expression == "" or self.containsSyntaxError:
-                return "result = None"
+                return ["result = None"]
             return ["try:",
                     "    result = " + expression,
                     "    self.executionError = ''",
                     "except:",
                     "    result = None",
                     "    self.executionError = str(sys.exc_info()[1])"]
-        else: return "result = " + expression
+        else: return ["result = " + expression]
 
     def getUsedModules(self):
         moduleNames = re.split("\W+", self.moduleNames)
@@ -1,5 +1,6 @@
 import bpy
 from ... base_types.node import AnimationNode
+from ... data_structures.kd_tree import KDTree
 
 class ConstructKDTreeNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ConstructKDTreeNode"
@@ -9,10 +10,5 @@ class ConstructKDTreeNode(bpy.types.Node, AnimationNode):
         self.inputs.new("an_VectorListSocket", "Vector List", "vectorList")
         self.outputs.new("an_KDTreeSocket", "KDTree", "kdTree")
 
-    def getExecutionCode(self):
-        yield "kdTree = mathutils.kdtree.KDTree(len(vectorList))"
-        yield "for i, vector in enumerate(vectorList): kdTree.insert(vector, i)"
-        yield "kdTree.balance()"
-
-    def getUsedModules(self):
-        return ["mathutils"]
+    def execute(self, vectorList):
+        return KDTree.fromVectors(vectorList)
@@ -1,21 +1,49 @@
 import bpy
+from bpy.props import *
+from ... tree_info import keepNodeState
 from ... base_types.node import AnimationNode
 
 class FindNearestNPointsInKDTreeNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FindNearestNPointsInKDTreeNode"
     bl_label = "Find Nearest Points"
 
+    def useVectorListChanged(self, context):
+        self.generateSockets()
+
+    useVectorList = BoolProperty(name = "Use Vector List", default = False,
+        description = "Search for many vectors at once; the results of all vectors are joined",
+        update = useVectorListChanged)
+
     def create(self):
+        self.generateSockets()
+
+    def draw(self, layout):
+        layout.prop(self, "useVectorList")
+
+    @keepNodeState
+    def generateSockets(self):
+        self.inputs.clear()
+        self.outputs.clear()
+
         self.inputs.new("an_KDTreeSocket", "KDTree", "kdTree")
         self.inputs.new("an_IntegerSocket", "Amount", "amount").value = 5
-        self.inputs.new("an_VectorSocket", "Vector", "searchVector").defaultDrawType = "PROPERTY_ONLY"
+        if self.useVectorList:
+            self.inputs.new("an_VectorListSocket", "Vectors", "searchVectors")
+        else:
+            self.inputs.new("an_VectorSocket", "Vector", "searchVector").defaultDrawType = "PROPERTY_ONLY"
+
         self.outputs.new("an_VectorListSocket", "Vectors", "nearestVectors")
         self.outputs.new("an_FloatListSocket", "Distances", "distances")
         self.outputs.new("an_IntegerListSocket", "Indices", "indices")
 
     def getExecutionCode(self):
-        yield "nearestVectors, distances, indices = [], [], []"
-        yield "for vector, index, distance in kdTree.find_n(searchVector, amount):"
-        yield "    nearestVectors.append(vector)"
-        yield "    indices.append(index)"
-        yield "    distances.append(distance)"
+        if self.useVectorList:
+            yield "indices, distances = kdTree.batchFindN(searchVectors, amount)"
+            yield "nearestVectors = kdTree.getVectors(indices)"
+            yield "indices, distances = indices.ravel().tolist(), distances.ravel().tolist()"
+        else:
+            yield "nearestVectors, distances, indices = [], [], []"
+            yield "for vector, index, distance in kdTree.find_n(searchVector, amount):"
+            yield "    nearestVectors.append(vector)"
+            yield "    indices.append(index)"
+            yield "    distances.append(distance)"
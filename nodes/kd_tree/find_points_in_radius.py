@@ -1,23 +1,53 @@
 import bpy
+from bpy.props import *
+from ... tree_info import keepNodeState
 from ... base_types.node import AnimationNode
 
 class FindPointsInRadiusInKDTreeNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FindPointsInRadiusInKDTreeNode"
     bl_label = "Find Points in Radius"
 
+    def useVectorListChanged(self, context):
+        self.generateSockets()
+
+    useVectorList = BoolProperty(name = "Use Vector List", default = False,
+        description = "Search for many vectors at once; the results of all vectors are joined",
+        update = useVectorListChanged)
+
     def create(self):
+        self.generateSockets()
+
+    def draw(self, layout):
+        layout.prop(self, "useVectorList")
+
+    @keepNodeState
+    def generateSockets(self):
+        self.inputs.clear()
+        self.outputs.clear()
+
         self.inputs.new("an_KDTreeSocket", "KDTree", "kdTree")
         socket = self.inputs.new("an_FloatSocket", "Radius", "radius")
         socket.value = 5
         socket.minValue = 0.0
-        self.inputs.new("an_VectorSocket", "Vector", "searchVector").defaultDrawType = "PROPERTY_ONLY"
+        if self.useVectorList:
+            self.inputs.new("an_VectorListSocket", "Vectors", "searchVectors")
+        else:
+            self.inputs.new("an_VectorSocket", "Vector", "searchVector").defaultDrawType = "PROPERTY_ONLY"
+
         self.outputs.new("an_VectorListSocket", "Vectors", "nearestVectors")
         self.outputs.new("an_FloatListSocket", "Distances", "distances")
         self.outputs.new("an_IntegerListSocket", "Indices", "indices")
+        if self.useVectorList:
+            self.outputs.new("an_IntegerListSocket", "Amounts", "amounts")
 
     def getExecutionCode(self):
-        yield "nearestVectors, distances, indices = [], [], []"
-        yield "for vector, index, distance in kdTree.find_range(searchVector, max(radius, 0)):"
-        yield "    nearestVectors.append(vector)"
-        yield "    indices.append(index)"
-        yield "    distances.append(distance)"
+        if self.useVectorList:
+            yield "amounts, indices, distances = kdTree.batchFindRange(searchVectors, max(radius, 0))"
+            yield "nearestVectors = kdTree.getVectors(indices)"
+            yield "amounts, indices, distances = amounts.tolist(), indices.tolist(), distances.tolist()"
+        else:
+            yield "nearestVectors, distances, indices = [], [], []"
+            yield "for vector, index, distance in kdTree.find_range(searchVector, max(radius, 0)):"
+            yield "    nearestVectors.append(vector)"
+            yield "    indices.append(index)"
+            yield "    distances.append(distance)"
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class GetListLengthNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_GetListLengthNode"
     bl_label = "Get List Length"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_GenericSocket", "List", "list")
@@ -7,6 +7,7 @@ from ... sockets.info import getBaseDataTypeItemsCallback, toListIdName, isBase,
 class SliceListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SliceListNode"
     bl_label = "Slice List"
+    options = {"Pure"}
 
     def assignedTypeChanged(self, context):
         self.listIdName = toListIdName(self.assignedType)
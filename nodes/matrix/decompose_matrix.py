@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class DecomposeMatrixNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_DecomposeMatrixNode"
     bl_label = "Decompose Matrix"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_MatrixSocket", "Matrix", "matrix")
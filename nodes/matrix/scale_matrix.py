@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ScaleMatrixNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ScaleMatrixNode"
     bl_label = "Scale Matrix"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_VectorSocket", "Scale", "scale").value = [1, 1, 1]
@@ -10,6 +10,7 @@ thirdAxisTuple = {"XY": "(0, 0, 1)", "XZ": "(0, 1, 0)", "YZ": "(1, 0, 0)"}
 class ShearMatrixNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ShearMatrixNode"
     bl_label = "Shear Matrix"
+    options = {"Pure"}
 
     plane = EnumProperty(items = planeItems, update = executionCodeChanged)
     useThirdAsScale = BoolProperty(name = "Use Third as Scale", default = True, 
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class TranslationMatrixNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TranslationMatrixNode"
     bl_label = "Translation Matrix"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_VectorSocket", "Translation", "translation")
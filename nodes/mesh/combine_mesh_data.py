@@ -8,8 +8,8 @@ class CombineMeshDataNode(bpy.types.Node, AnimationNode):
 
     def create(self):
         self.inputs.new("an_VectorListSocket", "Vertex Locations", "vertexLocations").dataIsModified = True
-        self.inputs.new("an_EdgeIndicesListSocket", "Edge Indices", "edgeIndices").dataIsModified = True
-        self.inputs.new("an_PolygonIndicesListSocket", "Polygon Indices", "polygonIndices").dataIsModified = True
+        self.inputs.new("an_EdgeIndicesListSocket", "Edge Indices", "edgeIndices")
+        self.inputs.new("an_PolygonIndicesListSocket", "Polygon Indices", "polygonIndices")
         self.outputs.new("an_MeshDataSocket", "Mesh Data", "meshData")
 
     def execute(self, vertexLocations, edgeIndices, polygonIndices):
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class CreateEdgeIndicesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CreateEdgeIndicesNode"
     bl_label = "Create Edge Indices"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_IntegerSocket", "Index 1", "index1").value = 0
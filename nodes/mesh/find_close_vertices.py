@@ -1,6 +1,7 @@
 import bpy
-from mathutils.kdtree import KDTree
 from ... base_types.node import AnimationNode
+from ... algorithms.spatial_hash import findCloseVertexEdges
+from ... data_structures.vector_list import toVector3DList
 
 class FindCloseVerticesNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FindCloseVerticesNode"
@@ -18,22 +19,6 @@ class FindCloseVerticesNode(bpy.types.Node, AnimationNode):
         minDistance = max(0, minDistance)
         maxDistance = max(minDistance, maxDistance)
 
-        verticesAmount = len(vertices)
-        kdTree = KDTree(verticesAmount)
-        for i, vector in enumerate(vertices):
-            kdTree.insert(vector, i)
-        kdTree.balance()
-        edges = []
-        for searchIndex in range(min(verticesAmount, clusters)):
-            added = 0
-            for (vector, foundIndex, distance) in kdTree.find_range(vertices[searchIndex], maxDistance):
-                if searchIndex != foundIndex and distance > minDistance:
-                    if added >= connections: break
-                    if foundIndex > searchIndex:
-                        edge = (searchIndex, foundIndex)
-                    else:
-                        edge = (foundIndex, searchIndex)
-                    edges.append(edge)
-                    added += 1
-
-        return list(set(edges))
+        vertices = toVector3DList(vertices).asNumpyArray()
+        edges = findCloseVertexEdges(vertices, clusters, connections, minDistance, maxDistance)
+        return [tuple(edge) for edge in edges.tolist()]
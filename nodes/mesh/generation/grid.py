@@ -9,6 +9,7 @@ from .... events import executionCodeChanged
 class GridMeshNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_GridMeshNode"
     bl_label = "Grid Mesh"
+    options = {"Pure"}
     bl_width_default = 160
 
     centerGrid = BoolProperty(name = "Center", default = True, update = executionCodeChanged)
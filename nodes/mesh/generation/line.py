@@ -4,6 +4,7 @@ from .... base_types.node import AnimationNode
 class LineMeshNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_LineMeshNode"
     bl_label = "Line Mesh"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_VectorSocket", "Start", "start")
@@ -7,15 +7,8 @@ class JoinMeshDataList(bpy.types.Node, AnimationNode):
     bl_label = "Join Mesh Data List"
 
     def create(self):
-        self.inputs.new("an_MeshDataListSocket", "Mesh Data List", "meshDataList").dataIsModified = True
+        self.inputs.new("an_MeshDataListSocket", "Mesh Data List", "meshDataList")
         self.outputs.new("an_MeshDataSocket", "Mesh Data", "meshData")
 
     def execute(self, meshDataList):
-        meshData = MeshData([], [], [])
-        offset = 0
-        for mesh in meshDataList:
-            meshData.vertices.extend(mesh.vertices)
-            meshData.edges.extend([(index1 + offset, index2 + offset) for index1, index2 in mesh.edges])
-            meshData.polygons.extend([tuple(index + offset for index in poly) for poly in mesh.polygons])
-            offset += len(mesh.vertices)
-        return meshData
+        return MeshData.join(meshDataList)
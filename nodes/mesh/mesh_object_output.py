@@ -5,6 +5,7 @@ from bpy.props import *
 from ... utils.layout import writeText
 from ... tree_info import keepNodeState
 from ... base_types.node import AnimationNode
+from ... data_structures.vector_list import toVector3DList
 
 meshDataTypeItems = [
     ("MESH_DATA", "Mesh Data", "Mesh Data object that contains only vertex locations, edge indices and polygon indices", "", 0),
@@ -107,7 +108,7 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
             checkIndices = self.checkIndices)
 
         if isValidData:
-            mesh.from_pydata(meshData.vertices, meshData.edges, meshData.polygons)
+            setMeshDataArrays(mesh, meshData)
         else:
             self.errorMessage = "The mesh data is invalid"
 
@@ -119,8 +120,7 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
             self.errorMessage = "The vertex amounts are not equal"
             return object
 
-        flatVertices = list(itertools.chain.from_iterable(vertices))
-        mesh.vertices.foreach_set("co", flatVertices)
+        toVector3DList(vertices).applyToMeshVertices(mesh.vertices)
         mesh.update()
 
     def setMaterialIndices(self, mesh, materialIndices):
@@ -133,3 +133,23 @@ class MeshObjectOutputNode(bpy.types.Node, AnimationNode):
         allMaterialIndices = list(itertools.islice(itertools.cycle(materialIndices), len(mesh.polygons)))
         mesh.polygons.foreach_set("material_index", allMaterialIndices)
         mesh.polygons[0].material_index = materialIndices[0]
+
+
+def setMeshDataArrays(mesh, meshData):
+    # same result as mesh.from_pydata without creating python tuples
+    edgeIndices = meshData.edgeIndices
+    polygonIndices = meshData.polygonIndices
+
+    mesh.vertices.add(len(meshData.vertexLocations))
+    mesh.edges.add(len(edgeIndices))
+    mesh.loops.add(len(polygonIndices))
+    mesh.polygons.add(len(meshData.polygonLengths))
+
+    meshData.vertexLocations.applyToMeshVertices(mesh.vertices)
+    mesh.edges.foreach_set("vertices", edgeIndices.ravel())
+    mesh.loops.foreach_set("vertex_index", polygonIndices)
+    mesh.polygons.foreach_set("loop_start", meshData.polygonStarts)
+    mesh.polygons.foreach_set("loop_total", meshData.polygonLengths)
+
+    if len(edgeIndices) > 0 or len(polygonIndices) > 0:
+        mesh.update(calc_edges = True)
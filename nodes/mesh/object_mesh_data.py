@@ -4,10 +4,12 @@ from ... events import isRendering
 from ... utils.math import extractRotation
 from ... base_types.node import AnimationNode
 from ... data_structures.mesh import Polygon, Vertex
+from ... data_structures.vector_list import Vector3DList
 
 class ObjectMeshDataNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectMeshDataNode"
     bl_label = "Object Mesh Data"
+    options = {"No Side Effects"}
 
     def create(self):
         self.inputs.new("an_ObjectSocket", "Object", "object").defaultDrawType = "PROPERTY_ONLY"
@@ -32,7 +34,7 @@ class ObjectMeshDataNode(bpy.types.Node, AnimationNode):
         lines.append("    meshName = mesh.name")
 
         if isLinked["vertexLocations"] or isLinked["polygons"]:
-            lines.append("    vertexLocations = self.getVertexLocations(mesh, object, useWorldSpace, {})".format(repr(isLinked["vertexLocations"])))
+            lines.append("    vertexLocations = self.getVertexLocations(mesh, object, useWorldSpace)")
         if isLinked["edgeIndices"]:
             lines.append("    edgeIndices = self.getEdgeIndices(mesh)")
         if isLinked["polygonIndices"]:
@@ -57,13 +59,13 @@ class ObjectMeshDataNode(bpy.types.Node, AnimationNode):
         if useModifiers and scene is not None: bpy.data.meshes.remove(mesh)
 
 
-    def getVertexLocations(self, mesh, object, useWorldSpace, copyVertices):
+    def getVertexLocations(self, mesh, object, useWorldSpace):
         if useWorldSpace:
-            matrix = object.matrix_world
-            return [matrix * v.co for v in mesh.vertices]
+            vertexLocations = Vector3DList.fromMeshVertices(mesh.vertices)
+            vertexLocations.transform(object.matrix_world)
+            return vertexLocations
         else:
-            if copyVertices: return [v.co.copy() for v in mesh.vertices]
-            else: return [v.co for v in mesh.vertices]
+            return Vector3DList.fromMeshVertices(mesh.vertices)
 
     def getEdgeIndices(self, mesh):
         return [tuple(edge.vertices) for edge in mesh.edges]
@@ -72,14 +74,10 @@ class ObjectMeshDataNode(bpy.types.Node, AnimationNode):
         return [tuple(face.vertices) for face in mesh.polygons]
 
     def getVertices(self, mesh, object, useWorldSpace):
-        vertices = []
         if useWorldSpace:
-            matrix = object.matrix_world
-            rotation = extractRotation(matrix)
-            vertices = [Vertex.fromMeshVertexInWorldSpace(meshVertex, matrix, rotation) for meshVertex in mesh.vertices]
+            return Vertex.listFromMeshVertices(mesh.vertices, object.matrix_world)
         else:
-            vertices = [Vertex.fromMeshVertexInLocalSpace(meshVertex) for meshVertex in mesh.vertices]
-        return vertices
+            return Vertex.listFromMeshVertices(mesh.vertices)
 
     def getPolygons(self, mesh, vertexLocations, object, useWorldSpace):
         polygons = []
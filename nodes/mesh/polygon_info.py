@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class PolygonInfoNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_PolygonInfoNode"
     bl_label = "Polygon Info"
+    options = {"No Side Effects"}
 
     copyVertices = BoolProperty(name = "Copy Vertices", default = False,
         description = "If unchecked the polygon is changed when the output vectors are changed",
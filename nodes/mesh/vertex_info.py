@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class VertexInfoNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_VertexInfoNode"
     bl_label = "Vertex Info"
+    options = {"No Side Effects"}
 
     def create(self):
         self.inputs.new("an_VertexSocket", "Vertex", "vertex")
@@ -10,6 +10,7 @@ conversionTypeItems = [
 class ConvertAngleNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ConvertAngleNode"
     bl_label = "Convert Angle"
+    options = {"Pure"}
 
     searchTags = [(name, {"conversionType" : repr(type)}) for type, name, _ in conversionTypeItems]
 
@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class FloatClampNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FloatClampNode"
     bl_label = "Clamp"
+    options = {"Pure"}
     dynamicLabelType = "HIDDEN_ONLY"
 
     def create(self):
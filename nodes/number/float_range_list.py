@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class FloatRangeListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_FloatRangeListNode"
     bl_label = "Number Range"
+    options = {"Pure"}
     dynamicLabelType = "ALWAYS"
 
     onlySearchTags = True
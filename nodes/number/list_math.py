@@ -13,6 +13,7 @@ operationItems = [
 class NumberListMathNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_NumberListMathNode"
     bl_label = "Number List Math"
+    options = {"Pure"}
 
     operation = EnumProperty(name = "Operation", default = "ADD",
         items = operationItems, update = executionCodeChanged)
@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class MapRangeNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_MapRangeNode"
     bl_label = "Map Range"
+    options = {"Pure"}
     bl_width_default = 170
 
     def settingChanged(self, context):
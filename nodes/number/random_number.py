@@ -8,6 +8,7 @@ from ... algorithms.random import getUniformRandom
 class RandomNumberNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RandomNumberNode"
     bl_label = "Random Number"
+    options = {"Pure", "Random Number Cache"}
 
     def socketUsageChanged(self, context):
         self.inputs["Min"].hide = not self.useMinValue
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class RoundNumberNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RoundNumberNode"
     bl_label = "Round Number"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_FloatSocket", "Number", "number")
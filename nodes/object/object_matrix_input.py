@@ -5,6 +5,7 @@ from ... base_types.node import AnimationNode
 class ObjectMatrixInputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectMatrixInputNode"
     bl_label = "Object Matrix Input"
+    options = {"No Side Effects"}
 
     def create(self):
         self.inputs.new("an_ObjectSocket", "Object", "object").defaultDrawType = "PROPERTY_ONLY"
@@ -12,6 +12,7 @@ frameTypeItems = [
 class ObjectTransformsInputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectTransformsInputNode"
     bl_label = "Object Transforms Input"
+    options = {"No Side Effects"}
     bl_width_default = 165
 
     def useCurrentTransformsChanged(self, context):
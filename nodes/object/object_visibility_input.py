@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class ObjectVisibilityInputNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ObjectVisibilityInputNode"
     bl_label = "Object Visibility Input"
+    options = {"No Side Effects"}
 
     def create(self):
         self.inputs.new("an_ObjectSocket", "Object", "object").defaultDrawType = "PROPERTY_ONLY"
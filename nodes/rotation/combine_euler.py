@@ -6,6 +6,7 @@ from ... base_types.node import AnimationNode
 class CombineEulerNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CombineEulerNode"
     bl_label = "Combine Euler"
+    options = {"Pure"}
 
     useDegree = BoolProperty(name = "Use Degree", default = False,
         update = executionCodeChanged)
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class CombineQuaternionNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_CombineQuaternionNode"
     bl_label = "Combine Quaternion"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_FloatSocket", "W", "w").value = 1
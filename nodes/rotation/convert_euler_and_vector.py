@@ -10,6 +10,7 @@ conversionTypeItems = [
 class ConvertVectorAndEulerNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_ConvertVectorAndEulerNode"
     bl_label = "Convert Vector and Euler"
+    options = {"Pure"}
     dynamicLabelType = "ALWAYS"
 
     onlySearchTags = True
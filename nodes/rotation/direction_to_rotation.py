@@ -11,6 +11,7 @@ guideAxisItems  = [(axis, axis, "") for axis in ("X", "Y", "Z")]
 class DirectionToRotationNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_DirectionToRotationNode"
     bl_label = "Direction to Rotation"
+    options = {"Pure"}
 
     trackAxis = EnumProperty(items = trackAxisItems, update = executionCodeChanged, default = "Z")
     guideAxis = EnumProperty(items = guideAxisItems, update = executionCodeChanged, default = "X")
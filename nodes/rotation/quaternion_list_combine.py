@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class QuaternionListCombineNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_QuaternionListCombineNode"
     bl_label = "Combine Quaternion Rotations"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_QuaternionListSocket", "Quaternions", "quaternions")
@@ -41,6 +41,7 @@ operationsWithStepQuaternion = ["SNAP"]
 class QuaternionMathNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_QuaternionMathNode"
     bl_label = "Quaternion Math"
+    options = {"Pure"}
     dynamicLabelType = "HIDDEN_ONLY"
 
     def operationChanged(self, context):
@@ -8,6 +8,7 @@ from ... base_types.node import AnimationNode
 class RandomEulerNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RandomEulerNode"
     bl_label = "Random Euler"
+    options = {"Pure", "Random Number Cache"}
 
     nodeSeed = IntProperty(name = "Node Seed", update = propertyChanged, max = 1000, min = 0)
 
@@ -7,6 +7,7 @@ from ... base_types.node import AnimationNode
 class RandomQuaternionNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RandomQuaternionNode"
     bl_label = "Random Quaternion"
+    options = {"Pure", "Random Number Cache"}
 
     nodeSeed = IntProperty(name = "Node Seed", update = propertyChanged, max = 1000, min = 0)
 
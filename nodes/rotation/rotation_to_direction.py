@@ -9,6 +9,7 @@ directionAxisItems = [(axis, axis, "") for axis in ("X", "Y", "Z", "-X", "-Y", "
 class RotationToDirectionNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RotationToDirectionNode"
     bl_label = "Rotation to Direction"
+    options = {"Pure"}
 
     directionAxis = EnumProperty(items = directionAxisItems, update = executionCodeChanged, default = "Z")
 
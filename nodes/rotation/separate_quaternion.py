@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class SeparateQuaternionNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_SeparateQuaternionNode"
     bl_label = "Separate Quaternion"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_QuaternionSocket", "Quaternion", "quaternion")
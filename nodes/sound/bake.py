@@ -1,13 +1,19 @@
 import bpy
 import os
+import zlib
+import numpy
+import base64
 from bpy.props import *
+from itertools import chain
 from ... utils.names import getRandomString
+from ... utils.handlers import eventHandler
 from ... tree_info import getNodeByIdentifier
 from ... base_types.node import AnimationNode
 from ... utils.blender_ui import getDpiFactor
 from ... utils.path import getAbsolutePathOfSound
 from ... utils.fcurve import getSingleFCurveWithDataPath
 from ... utils.sequence_editor import getOrCreateSequencer, getEmptyChannel
+from ... algorithms.sound_bake import readSoundFile, iterFrequencyBandBaking, SoundDecodingError
 
 class SoundFrequencyRange(bpy.types.PropertyGroup):
     bl_idname = "an_SoundFrequencyRange"
@@ -153,9 +159,7 @@ class SoundBakeNode(bpy.types.Node, AnimationNode):
 
         soundData = bake(sound, low, high, attack, release)
         bakeDataItem = createSingleDataItem(sound, low, high, attack, release)
-        addSavedSample = bakeDataItem.samples.add
-        for data in soundData:
-            addSavedSample().strength = data
+        bakeDataItem.setSamples(soundData)
 
     def bakeEqualizerData(self):
         bpy.ops.an.bake_sound_equalizer_data("INVOKE_DEFAULT",
@@ -249,9 +253,8 @@ class BakeEqualizerData(bpy.types.Operator):
         try: self.node = getNodeByIdentifier(self.nodeIdentifier)
         except: self.node = None
         self.sound = bpy.data.sounds[self.soundName]
-        self.currentIndex = 0
-        self.equalizerData = []
-        self.counter = 0
+        frequencyRanges = [(item.low, item.high) for item in self.frequencyRanges]
+        self.baking = iterEqualizerBaking(self.sound, frequencyRanges, self.attack, self.release)
         context.window_manager.modal_handler_add(self)
         self.timer = context.window_manager.event_timer_add(0.001, context.window)
         self.setNodeMessage("Baking Started")
@@ -264,25 +267,21 @@ class BakeEqualizerData(bpy.types.Operator):
 
     def modal(self, context, event):
         if "ESC" == event.type: return self.finish()
-        self.counter += 1
-        if self.counter % 20 != 0: return {"RUNNING_MODAL"}
-
-        if self.currentIndex < len(self.frequencyRanges):
-            item = self.frequencyRanges[self.currentIndex]
-            data = bake(self.sound, item.low, item.high, self.attack, self.release)
-            self.equalizerData.append(data)
-            self.currentIndex += 1
-            self.setNodeMessage("Frequency range {}-{} baked".format(item.low, item.high))
+        if event.type != "TIMER": return {"RUNNING_MODAL"}
+
+        try: progress, equalizerData = next(self.baking)
+        except:
+            self.finish()
+            raise
+        if equalizerData is None:
+            self.setNodeMessage("Baking: {}%".format(int(progress * 100)))
         else:
             equalizerItem = self.sound.equalizerData.add()
             equalizerItem.attack = self.attack
             equalizerItem.release = self.release
             equalizerItem.frequencyAmount = len(self.frequencyRanges)
             equalizerItem.identifier = getRandomString(10)
-            for equalizerSampleData in zip(*self.equalizerData):
-                equalizerSampleItem = equalizerItem.samples.add()
-                for sample in equalizerSampleData:
-                    equalizerSampleItem.samples.add().strength = sample
+            equalizerItem.setSamples(equalizerData)
             return self.finish()
 
         context.area.tag_redraw()
@@ -296,7 +295,45 @@ class BakeEqualizerData(bpy.types.Operator):
 ################################
 
 def bake(sound, low = 0.0, high = 100000, attack = 0.005, release = 0.2):
-    '''Returns a float list containing the sampled data'''
+    '''Returns a float array containing the sampled data'''
+    return bakeEqualizer(sound, [(low, high)], attack, release)[:, 0]
+
+def bakeEqualizer(sound, frequencyRanges, attack = 0.005, release = 0.2):
+    '''Returns an array with one row per frame and one column per frequency range'''
+    for progress, result in iterEqualizerBaking(sound, frequencyRanges, attack, release):
+        pass
+    return result
+
+def iterEqualizerBaking(sound, frequencyRanges, attack = 0.005, release = 0.2):
+    '''
+    Yields (progress, None) while baking and (1.0, result) at the end.
+    The sound is decoded only once and all ranges are computed together.
+    Formats that cannot be decoded are baked with the graph editor instead.
+    '''
+    usedUnpacking, filepath = getRealFilePath(sound)
+    try:
+        samples, sampleRate = readSoundFile(filepath)
+    except SoundDecodingError:
+        samples = None
+    finally:
+        if usedUnpacking: os.remove(filepath)
+
+    if samples is not None:
+        yield from iterFrequencyBandBaking(samples, sampleRate, getSceneFps(), frequencyRanges, attack, release)
+        return
+
+    bands = []
+    for low, high in frequencyRanges:
+        bands.append(bakeWithGraphEditor(sound, low, high, attack, release))
+        yield len(bands) / len(frequencyRanges), None
+    if len(bands) == 0: yield 1.0, numpy.zeros((0, 0), dtype = numpy.float32)
+    else: yield 1.0, numpy.array(bands, dtype = numpy.float32).T
+
+def getSceneFps():
+    render = bpy.context.scene.render
+    return render.fps / render.fps_base
+
+def bakeWithGraphEditor(sound, low, high, attack, release):
     object = createObjectWithFCurveAsTarget()
     oldFrame = setCurrentFrame(0)
     oldArea = switchArea("GRAPH_EDITOR")
@@ -341,7 +378,9 @@ def getRealFilePath(sound):
     filepath = getAbsolutePathOfSound(sound)
     if os.path.exists(filepath): return False, filepath
     if not sound.packed_file: raise Exception("Sound file not found")
-    path = os.path.join(os.path.dirname(__file__), "TEMPORARY SOUND FILE")
+    # keep the extension, so that the decoder can be chosen
+    extension = os.path.splitext(filepath)[1]
+    path = os.path.join(os.path.dirname(__file__), "TEMPORARY SOUND FILE" + extension)
     file = open(path, "w+b")
     file.write(sound.packed_file.data)
     file.close()
@@ -434,6 +473,13 @@ def getSingleDataItem(sound, low, high, attack, release):
 # Register
 ################################
 
+# The samples of each bake are stored as compressed float32 blob. Blender strings
+# cannot contain zero bytes, so the blob is base85 encoded. The compression makes
+# the text usually smaller than the raw blob. Uncompressed base64 text and the
+# collections with one item per sample are only read for older files.
+_bakedSamplesCache = {}
+compressedSamplesPrefix = "zlib-b85:"
+
 class SingleFrequencySample(bpy.types.PropertyGroup):
     bl_idname = "an_SingleFrequencySample"
     strength = FloatProperty(precision = 6)
@@ -449,16 +495,71 @@ class SingleData(bpy.types.PropertyGroup):
     attack = FloatProperty(name = "Attack", precision = 3)
     release = FloatProperty(name = "Release", precision = 3)
     samples = CollectionProperty(name = "Samples", type = SingleFrequencySample)
+    packedSamples = StringProperty(name = "Packed Samples", default = "")
     identifier = StringProperty(name = "Identifier", default = "")
 
+    def setSamples(self, samples):
+        setPackedSamples(self, numpy.asarray(samples, dtype = numpy.float32).ravel())
+
+    def getSamples(self):
+        '''Returns a read-only float32 array with one strength per frame'''
+        return getPackedSamples(self, lambda: [sample.strength for sample in self.samples])
+
 class EqualizerData(bpy.types.PropertyGroup):
     bl_idname = "an_SoundEqualizerData"
     attack = FloatProperty(name = "Attack", precision = 3)
     release = FloatProperty(name = "Release", precision = 3)
     frequencyAmount = IntProperty(name = "Frequency Amount")
     samples = CollectionProperty(name = "Samples", type = MultipleFrequenciesSample)
+    packedSamples = StringProperty(name = "Packed Samples", default = "")
     identifier = StringProperty(name = "Identifier", default = "")
 
+    def setSamples(self, samples):
+        setPackedSamples(self, numpy.asarray(samples, dtype = numpy.float32).reshape(-1, self.frequencyAmount))
+
+    def getSamples(self):
+        '''Returns a read-only float32 array with the shape (frames, frequencyAmount)'''
+        samples = getPackedSamples(self, lambda: [sample.strength for item in self.samples for sample in item.samples])
+        return samples.reshape(-1, self.frequencyAmount)
+
+def setPackedSamples(item, samples):
+    # the caller can still change its array
+    samples = samples.copy()
+    data = base64.b85encode(zlib.compress(samples.tobytes()))
+    item.packedSamples = compressedSamplesPrefix + data.decode("ascii")
+    samples.flags.writeable = False
+    if item.identifier != "":
+        _bakedSamplesCache[item.identifier] = samples
+
+def getPackedSamples(item, getLegacySamples):
+    samples = _bakedSamplesCache.get(item.identifier)
+    if samples is None:
+        if item.packedSamples != "":
+            samples = unpackSamples(item.packedSamples)
+        else:
+            samples = numpy.array(getLegacySamples(), dtype = numpy.float32)
+        samples.flags.writeable = False
+        # identifiers are assigned after loading a file, but drawing code cannot do that
+        if item.identifier != "":
+            _bakedSamplesCache[item.identifier] = samples
+    return samples
+
+def unpackSamples(text):
+    if text.startswith(compressedSamplesPrefix):
+        data = zlib.decompress(base64.b85decode(text[len(compressedSamplesPrefix):]))
+    else:
+        data = base64.b64decode(text)
+    return numpy.frombuffer(data, dtype = numpy.float32)
+
+@eventHandler("FILE_LOAD_POST")
+@eventHandler("ADDON_LOAD_POST")
+def assignMissingIdentifiers():
+    # very old bakes have no identifier, so their samples could not be cached
+    for sound in bpy.data.sounds:
+        for item in chain(sound.singleData, sound.equalizerData):
+            if item.identifier == "":
+                item.identifier = getRandomString(10)
+
 def register():
     bpy.types.Sound.singleData = CollectionProperty(name = "Bake Data", type = SingleData)
     bpy.types.Sound.equalizerData = CollectionProperty(name = "Equalizer Data", type = EqualizerData)
@@ -1,4 +1,5 @@
 import bpy
+import numpy
 from bpy.props import *
 from ... utils.layout import writeText
 from ... base_types.node import AnimationNode
@@ -35,56 +36,67 @@ class SoundFromSequencesNode(bpy.types.Node, AnimationNode):
             return None
 
 
-class SingleSoundEvaluator:
+class SoundEvaluator:
+    '''
+    Sums the baked samples of all sequences into one timeline
+    that is aligned to the scene frames.
+    '''
+    def __init__(self, sequenceSamples, valueShape):
+        ranges = [(samples, int(sequence.frame_start)) + getUsedFrameRange(sequence, samples)
+                  for sequence, samples in sequenceSamples]
+        ranges = [(samples, offset, start, end) for samples, offset, start, end in ranges if start < end]
+
+        self.firstFrame = min([start for *_, start, end in ranges], default = 0)
+        lastFrame = max([end for *_, start, end in ranges], default = 0)
+
+        # the last row stays zero and is used for all frames outside of the timeline
+        self.timeline = numpy.zeros((lastFrame - self.firstFrame + 1, ) + valueShape, dtype = numpy.float32)
+        for samples, offset, start, end in ranges:
+            self.timeline[start - self.firstFrame:end - self.firstFrame] += samples[start - offset:end - offset]
+
+    def evaluate(self, frame):
+        return self.evaluateRange([frame])[0].tolist()
+
+    def evaluateRange(self, frames):
+        '''
+        Returns the linearly interpolated values for all frames.
+        The shape is (len(frames), ) or (len(frames), frequencyAmount) for equalizer data.
+        '''
+        frames = numpy.asarray(frames, dtype = numpy.float64).ravel()
+        intFrames = numpy.floor(frames)
+        influences = (frames - intFrames).astype(numpy.float32)
+        indices = intFrames.astype(numpy.int64) - self.firstFrame
+        before = self.getTimelineValues(indices)
+        after = self.getTimelineValues(indices + 1)
+        if self.timeline.ndim == 2: influences = influences[:, numpy.newaxis]
+        return before * (1 - influences) + after * influences
+
+    def getTimelineValues(self, indices):
+        zeroIndex = len(self.timeline) - 1
+        isInside = (indices >= 0) & (indices < zeroIndex)
+        return self.timeline[numpy.where(isInside, indices, zeroIndex)]
+
+class SingleSoundEvaluator(SoundEvaluator):
     type = "SINGLE"
 
     def __init__(self, sequences, index):
-        self.sequenceData = [(sequence, sequence.sound.singleData[index]) for sequence in sequences if getattr(sequence, "type", "") == "SOUND"]
+        sequenceSamples = [(sequence, sequence.sound.singleData[index].getSamples()) for sequence in iterSoundSequences(sequences)]
+        super().__init__(sequenceSamples, ())
 
-    def evaluate(self, frame):
-        intFrame = int(frame)
-        if intFrame == frame:
-            return self.evaluateInt(intFrame)
-        else:
-            before = self.evaluateInt(intFrame)
-            after = self.evaluateInt(intFrame + 1)
-            influence = frame - intFrame
-            return before * (1 - influence) + after * influence
-
-    def evaluateInt(self, frame):
-        evaluate = self.evaluateSequence
-        return sum([evaluate(sequence, data, frame) for sequence, data in self.sequenceData])
-
-    def evaluateSequence(self, sequence, data, frame):
-        if useSequenceForFrame(sequence, data, frame):
-            return data.samples[frame - sequence.frame_start].strength
-        return 0
-
-class EqualizerSoundEvaluator:
+class EqualizerSoundEvaluator(SoundEvaluator):
     type = "EQUALIZER"
 
     def __init__(self, sequences, index):
-        self.sequenceData = [(sequence, sequence.sound.equalizerData[index]) for sequence in sequences if getattr(sequence, "type", "") == "SOUND"]
-
-    def evaluate(self, frame):
-        intFrame = int(frame)
-        if intFrame == frame:
-            return self.evaluateInt(intFrame)
-        else:
-            before = self.evaluateInt(intFrame)
-            after = self.evaluateInt(intFrame + 1)
-            influence = frame - intFrame
-            return [a * (1 - influence) + b * influence for a, b in zip(before, after)]
-
-    def evaluateInt(self, frame):
-        evaluate = self.evaluateSequence
-        strengths = [evaluate(sequence, data, frame) for sequence, data in self.sequenceData]
-        return [sum(s) for s in zip(*strengths)]
-
-    def evaluateSequence(self, sequence, data, frame):
-        if useSequenceForFrame(sequence, data, frame):
-            return [sample.strength for sample in data.samples[frame - sequence.frame_start].samples]
-        return [0.0] * data.frequencyAmount
-
-def useSequenceForFrame(sequence, data, frame):
-    return sequence.frame_final_start <= frame < min(sequence.frame_start + len(data.samples), sequence.frame_final_end)
+        sequenceSamples = [(sequence, sequence.sound.equalizerData[index].getSamples()) for sequence in iterSoundSequences(sequences)]
+        # sequences with different amounts of frequencies only share the first ones
+        amount = min([samples.shape[1] for sequence, samples in sequenceSamples], default = 0)
+        sequenceSamples = [(sequence, samples[:, :amount]) for sequence, samples in sequenceSamples]
+        super().__init__(sequenceSamples, (amount, ))
+
+def iterSoundSequences(sequences):
+    return (sequence for sequence in sequences if getattr(sequence, "type", "") == "SOUND")
+
+def getUsedFrameRange(sequence, samples):
+    start = max(int(sequence.frame_final_start), int(sequence.frame_start))
+    end = min(int(sequence.frame_start) + len(samples), int(sequence.frame_final_end))
+    return start, max(start, end)
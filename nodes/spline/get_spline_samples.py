@@ -36,11 +36,15 @@ class GetSplineSamplesNode(bpy.types.Node, AnimationNode, SplineEvaluationBase):
         add("if spline.isEvaluable:")
 
         if self.parameterType == "UNIFORM":
-            if isLinked["positions"]: add("    positions = spline.getUniformSamples(amount, start, end, self.resolution)")
-            if isLinked["tangents"]: add("    tangents = spline.getUniformTangentSamples(amount, start, end, self.resolution)")
+            if isLinked["positions"] and isLinked["tangents"]:
+                add("    positions, tangents = spline.getUniformSamplesAndTangents(amount, start, end, self.resolution)")
+            elif isLinked["positions"]: add("    positions = spline.getUniformSamples(amount, start, end, self.resolution)")
+            elif isLinked["tangents"]: add("    tangents = spline.getUniformTangentSamples(amount, start, end, self.resolution)")
         elif self.parameterType == "RESOLUTION":
-            if isLinked["positions"]: add("    positions = spline.getSamples(amount, start, end)")
-            if isLinked["tangents"]: add("    tangents = spline.getTangentSamples(amount, start, end)")
+            if isLinked["positions"] and isLinked["tangents"]:
+                add("    positions, tangents = spline.getSamplesAndTangents(amount, start, end)")
+            elif isLinked["positions"]: add("    positions = spline.getSamples(amount, start, end)")
+            elif isLinked["tangents"]: add("    tangents = spline.getTangentSamples(amount, start, end)")
 
         add("else: positions, tangents = [], []")
 
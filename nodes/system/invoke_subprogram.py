@@ -1,12 +1,18 @@
 import bpy
+import numpy
+import hashlib
 from bpy.props import *
+from ... utils.lru_cache import LRUCache, trimCaches
+from ... utils.handlers import eventHandler
+from ... preferences import getSubprogramCacheMemoryLimit
+from ... execution.disk_cache import loadFrame, saveFrame, getFingerprint, clearSubprogramDiskCache
 from ... sockets.info import toDataType
 from ... events import executionCodeChanged
 from ... base_types.node import AnimationNode
 from ... utils.blender_ui import getDpiFactor
 from ... utils.enum_items import enumItemsFromDicts
 from ... utils.nodes import newNodeAtCursor, invokeTranslation
-from ... tree_info import getSubprogramNetworks, getNodeByIdentifier, getNetworkByIdentifier
+from ... tree_info import getSubprogramNetworks, getNodeByIdentifier, getNetworkByIdentifier, getNodesByType
 
 cacheTypeItems = [
     ("DISABLED", "Disabled", ""),
@@ -14,9 +20,14 @@ cacheTypeItems = [
     ("FRAME_BASED", "Once per Frame", ""),
     ("INPUT_BASED", "Once per Input", "")]
 
-oneTimeCache = {}
-frameBasedCache = {}
-inputBasedCache = {}
+# One LRUCache per (cache type, identifier)
+# Input based caches are shared by all nodes that invoke the same subprogram.
+# All caches together are also limited by the memory limit in the preferences.
+subprogramCaches = {}
+uncacheableKey = object()
+
+# Fingerprints of the inputs of a disk cache miss, used again to store the result
+pendingFingerprints = {}
 
 class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_InvokeSubprogramNode"
@@ -31,6 +42,7 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
 
     def cacheTypeChanged(self, context):
         self.clearCache()
+        removeUnusedSubprogramCaches()
         executionCodeChanged()
         self.showCacheOptions = True
 
@@ -41,9 +53,21 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     showCacheOptions = BoolProperty(name = "Show Cache Options", default = False,
     description = "Draw cache options in the node for easier access")
 
+    cacheMemoryLimit = IntProperty(name = "Memory Limit (MB)", default = 256, min = 1,
+        description = "Remove the least recently used results when the cache becomes larger")
+
+    useDiskCache = BoolProperty(name = "Disk Cache", default = False,
+        description = "Also store the results in a folder next to the .blend file, so that other sessions and render machines can reuse them")
+
+    cacheFrameWindow = IntProperty(name = "Frame Window", default = 0, min = 0,
+        description = "Only keep results of frames that are at most this far away from the current frame (0 = keep all)")
+
     def create(self):
         pass
 
+    def delete(self):
+        removeUnusedSubprogramCaches(deletedIdentifier = self.identifier)
+
     @property
     def inputVariables(self):
         return { socket.identifier : "input_" + str(i) for i, socket in enumerate(self.inputs)}
@@ -72,29 +96,47 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
             return lines
 
     def getCachedData(self, *args):
-        if self.cacheType == "ONE_TIME":
-            try: return True, oneTimeCache[self.identifier]
-            except: pass
-        if self.cacheType == "FRAME_BASED":
-            try: return True, frameBasedCache[self.identifier][str(self.nodeTree.scene.frame_current)]
-            except: pass
-        if self.cacheType == "INPUT_BASED":
-            try: return True, inputBasedCache[self.subprogramIdentifier][self.getArgsHash(args)]
-            except: pass
-
-        return False, None
+        key = self.getCacheKey(args)
+        if key is uncacheableKey: return False, None
+        cache = self.getCache()
+        found, data = cache.get(key)
+        if not found and self.usesDiskCache:
+            fingerprint = getFingerprint(self.subprogramIdentifier, args)
+            found, data = loadFrame(self.subprogramIdentifier, key, fingerprint)
+            if found: cache.set(key, data)
+            else: pendingFingerprints[self.identifier] = fingerprint
+        return found, data
 
     def setCacheData(self, data, *args):
-        if self.cacheType == "ONE_TIME": oneTimeCache[self.identifier] = data
-        elif self.cacheType == "FRAME_BASED":
-            if self.identifier not in frameBasedCache: frameBasedCache[self.identifier] = {}
-            frameBasedCache[self.identifier][str(self.nodeTree.scene.frame_current)] = data
-        elif self.cacheType == "INPUT_BASED":
-            if self.subprogramIdentifier not in inputBasedCache: inputBasedCache[self.subprogramIdentifier] = {}
-            inputBasedCache[self.subprogramIdentifier][self.getArgsHash(args)] = data
+        key = self.getCacheKey(args)
+        if key is uncacheableKey: return
+        cache = self.getCache()
+        if self.cacheType == "FRAME_BASED" and self.cacheFrameWindow > 0:
+            window = self.cacheFrameWindow
+            cache.removeWhere(lambda frame: abs(frame - key) > window)
+        cache.set(key, data)
+        trimCaches(subprogramCaches.values(), getSubprogramCacheMemoryLimit())
+        if self.usesDiskCache:
+            if self.identifier in pendingFingerprints: fingerprint = pendingFingerprints.pop(self.identifier)
+            else: fingerprint = getFingerprint(self.subprogramIdentifier, args)
+            saveFrame(self.subprogramIdentifier, key, fingerprint, data)
+
+    def getCacheKey(self, args):
+        if self.cacheType == "FRAME_BASED": return self.nodeTree.scene.frame_current
+        if self.cacheType == "INPUT_BASED":
+            try: return toCacheKey(args)
+            except TypeError: return uncacheableKey
+        return None
 
-    def getArgsHash(self, *args):
-        return tuple(hash(arg) for arg in args)
+    def getCache(self, create = True):
+        identifier = self.subprogramIdentifier if self.cacheType == "INPUT_BASED" else self.identifier
+        key = (self.cacheType, identifier)
+        cache = subprogramCaches.get(key)
+        if cache is None:
+            if not create: return None
+            cache = subprogramCaches[key] = LRUCache()
+        cache.maxBytes = self.cacheMemoryLimit * 1024 ** 2
+        return cache
 
 
     def draw(self, layout):
@@ -122,6 +164,8 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
 
     def drawAdvanced(self, layout):
         self.drawCacheOptions(layout)
+        if self.cacheType != "DISABLED":
+            self.drawCacheStatistics(layout)
         layout.prop(self, "showCacheOptions")
 
     def drawCacheOptions(self, layout):
@@ -133,7 +177,23 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
             col.label("This caching method is not available:")
             if not self.isOutputStorable: col.label("  - The output is not storable")
             if not self.isInputComparable: col.label("  - The input is not comparable")
+        elif self.cacheType != "DISABLED":
+            col = layout.column(align = True)
+            col.prop(self, "cacheMemoryLimit")
+            if self.cacheType == "FRAME_BASED":
+                col.prop(self, "cacheFrameWindow")
+                col.prop(self, "useDiskCache")
         self.invokeFunction(layout, "clearCache", text = "Clear Cache")
+        if self.usesDiskCache:
+            self.invokeFunction(layout, "clearDiskCache", text = "Clear Disk Cache",
+                description = "Remove the stored results of this subprogram from the disk", confirm = True)
+
+    def drawCacheStatistics(self, layout):
+        cache = self.getCache(create = False)
+        if cache is None: return
+        col = layout.column(align = True)
+        col.label("Cached Results: {}  ({:.2f} MB)".format(len(cache), cache.totalBytes / 1024 ** 2))
+        col.label("Hits: {}  Misses: {}  Evictions: {}".format(cache.hits, cache.misses, cache.evictions))
 
 
     def updateSockets(self):
@@ -151,9 +211,12 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
 
 
     def clearCache(self):
-        oneTimeCache.pop(self.identifier, None)
-        frameBasedCache.pop(self.identifier, None)
-        inputBasedCache.pop(self.subprogramIdentifier, None)
+        subprogramCaches.pop(("ONE_TIME", self.identifier), None)
+        subprogramCaches.pop(("FRAME_BASED", self.identifier), None)
+        subprogramCaches.pop(("INPUT_BASED", self.subprogramIdentifier), None)
+
+    def clearDiskCache(self):
+        clearSubprogramDiskCache(self.subprogramIdentifier)
 
 
     @property
@@ -165,6 +228,10 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
     def subprogramNetwork(self):
         return getNetworkByIdentifier(self.subprogramIdentifier)
 
+    @property
+    def usesDiskCache(self):
+        return self.cacheType == "FRAME_BASED" and self.useDiskCache
+
     @property
     def canCache(self):
         if self.cacheType == "DISABLED": return True
@@ -173,6 +240,30 @@ class InvokeSubprogramNode(bpy.types.Node, AnimationNode):
         return False
 
 
+@eventHandler("FILE_LOAD_POST")
+def removeUnusedSubprogramCaches(deletedIdentifier = None):
+    '''Removes the caches of deleted nodes and of cache types that are not used anymore'''
+    usedKeys = set()
+    for node in getNodesByType("an_InvokeSubprogramNode"):
+        if node.identifier == deletedIdentifier: continue
+        identifier = node.subprogramIdentifier if node.cacheType == "INPUT_BASED" else node.identifier
+        usedKeys.add((node.cacheType, identifier))
+    for key in list(subprogramCaches.keys()):
+        if key not in usedKeys: del subprogramCaches[key]
+
+def toCacheKey(value):
+    '''
+    Hashable key that is equal for equal inputs.
+    Lists and arrays are compared by their content instead of their identity.
+    '''
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, ) + tuple(toCacheKey(element) for element in value)
+    if isinstance(value, numpy.ndarray):
+        return ("ndarray", value.dtype.str, value.shape, hashlib.sha1(numpy.ascontiguousarray(value).tobytes()).digest())
+    hash(value)
+    return value
+
+
 def getSubprogramItems(self, context):
     itemDict = []
     for network in getSubprogramNetworks():
@@ -2,11 +2,12 @@ import re
 import bpy
 from bpy.props import *
 from operator import attrgetter
-from ... events import networkChanged
+from ... events import networkChanged, executionCodeChanged
 from ... utils.names import getRandomString
 from ... utils.layout import splitAlignment
 from ... tree_info import getNodeByIdentifier
 from ... base_types.node import AnimationNode
+from ... execution.parallel_loop import canExecuteLoopInParallel
 from . subprogram_base import SubprogramBaseNode
 from ... utils.nodes import newNodeAtCursor, invokeTranslation
 from ... sockets.info import (toBaseIdName, toListDataType, toIdName,
@@ -18,6 +19,12 @@ class LoopInputNode(bpy.types.Node, AnimationNode, SubprogramBaseNode):
     bl_label = "Loop Input"
     bl_width_default = 180
 
+    useParallelExecution = BoolProperty(name = "Parallel Execution", default = False,
+        description = ("Execute parts of the iterations in multiple processes. This only works when "
+                       "all nodes in the loop are pure and there are no break conditions and reassigned "
+                       "parameters, otherwise the loop is executed normally"),
+        update = executionCodeChanged)
+
     def create(self):
         self.randomizeNetworkColor()
         self.subprogramName = "My Loop"
@@ -40,6 +47,13 @@ class LoopInputNode(bpy.types.Node, AnimationNode, SubprogramBaseNode):
 
         layout.separator()
 
+        col = layout.column()
+        col.prop(self, "useParallelExecution")
+        if self.useParallelExecution and not canExecuteLoopInParallel(self, self.network.getAnimationNodes()):
+            col.label("The loop is executed serially", icon = "INFO")
+
+        layout.separator()
+
         col = layout.column()
         col.label("Iterator Sockets:")
         box = col.box()
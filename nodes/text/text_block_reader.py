@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class TextBlockReaderNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TextBlockReaderNode"
     bl_label = "Text Block Reader"
+    options = {"No Side Effects"}
 
     def create(self):
         self.inputs.new("an_TextBlockSocket", "Text Block", "textBlock").defaultDrawType = "PROPERTY_ONLY"
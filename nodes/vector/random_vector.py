@@ -8,6 +8,7 @@ from ... base_types.node import AnimationNode
 class RandomVectorNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_RandomVectorNode"
     bl_label = "Random Vector"
+    options = {"Pure", "Random Number Cache"}
 
     nodeSeed = IntProperty(name = "Node Seed", update = propertyChanged, max = 1000, min = 0)
 
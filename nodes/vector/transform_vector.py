@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class TransformVectorNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TransformVectorNode"
     bl_label = "Transform Vector"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_VectorSocket", "Vector", "vector")
@@ -1,9 +1,11 @@
 import bpy
 from ... base_types.node import AnimationNode
+from ... data_structures.vector_list import Vector3DList
 
 class TransformVectorListNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_TransformVectorListNode"
     bl_label = "Transform Vector List"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_VectorListSocket", "Vector List", "vectors")
@@ -11,4 +13,9 @@ class TransformVectorListNode(bpy.types.Node, AnimationNode):
         self.outputs.new("an_VectorListSocket", "Vector", "transformedVectors")
 
     def getExecutionCode(self):
-        return "transformedVectors = [matrix * vector for vector in vectors]"
+        return "transformedVectors = self.transformVectors(vectors, matrix)"
+
+    def transformVectors(self, vectors, matrix):
+        transformedVectors = Vector3DList.fromValues(vectors)
+        transformedVectors.transform(matrix)
+        return transformedVectors
@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class VectorDistanceNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_VectorDistanceNode"
     bl_label = "Vector Distance"
+    options = {"Pure"}
 
     def create(self):
         self.inputs.new("an_VectorSocket", "A", "a")
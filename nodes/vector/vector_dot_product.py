@@ -4,6 +4,7 @@ from ... base_types.node import AnimationNode
 class VectorDotProductNode(bpy.types.Node, AnimationNode):
     bl_idname = "an_VectorDotProductNode"
     bl_label = "Vector Dot Product"
+    options = {"Pure"}
     
     def create(self):
         self.inputs.new("an_VectorSocket", "A", "a")
@@ -2,8 +2,12 @@ import bpy
 import cProfile
 from io import StringIO
 from .. update import updateEverything
+from .. tree_info import getNodeByIdentifier
 from contextlib import redirect_stdout
 from .. preferences import getDeveloperSettings
+from .. utils.blender_ui import redrawAll
+from .. execution.measurements import resetMeasurements
+from .. execution.memory_profiling import resetMemoryRecords, getMemoryReport, getMemoryReportJSON
 
 class PrintProfileExecutionResult(bpy.types.Operator):
     bl_idname = "an.print_profile_execution_result"
@@ -48,3 +52,42 @@ def getExecutionProfilingResult():
         d = {"context" : bpy.context}
         cProfile.runctx("context.space_data.edit_tree.execute()", d, d, sort = sortMode)
     return f.getvalue()
+
+class ResetNodeTimeMeasurements(bpy.types.Operator):
+    bl_idname = "an.reset_node_time_measurements"
+    bl_label = "Reset Node Time Measurements"
+    bl_description = "Remove all measured node execution times"
+
+    def execute(self, context):
+        resetMeasurements()
+        redrawAll()
+        return {"FINISHED"}
+
+class ResetNodeMemoryRecords(bpy.types.Operator):
+    bl_idname = "an.reset_node_memory_records"
+    bl_label = "Reset Node Memory Records"
+    bl_description = "Remove all recorded node memory usages"
+
+    def execute(self, context):
+        resetMemoryRecords()
+        redrawAll()
+        return {"FINISHED"}
+
+class WriteNodeMemoryReport(bpy.types.Operator):
+    bl_idname = "an.write_node_memory_report"
+    bl_label = "Write Node Memory Report"
+    bl_description = "Write the recorded memory usage of all nodes as JSON into a text block"
+
+    def execute(self, context):
+        nodeNames = {}
+        for item in getMemoryReport():
+            try: nodeNames[item["identifier"]] = getNodeByIdentifier(item["identifier"]).name
+            except: pass
+
+        textBlockName = "Memory Report"
+        textBlock = bpy.data.texts.get(textBlockName)
+        if textBlock is None: textBlock = bpy.data.texts.new(textBlockName)
+
+        textBlock.clear()
+        textBlock.write(getMemoryReportJSON(nodeNames))
+        return {"FINISHED"}
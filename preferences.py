@@ -46,6 +46,28 @@ class DeveloperProperties(bpy.types.PropertyGroup):
     profilingSortMode = EnumProperty(name = "Profiling Sort Mode",
         default = "cumtime", items = profileSortModeItems)
 
+    def measureNodeTimesChanged(self, context):
+        from . events import executionCodeChanged
+        executionCodeChanged()
+
+    measureNodeTimes = BoolProperty(name = "Measure Node Times", default = False,
+        description = "Add timers to the execution code to measure how long every node takes",
+        update = measureNodeTimesChanged)
+
+    showNodeTimes = BoolProperty(name = "Show Node Times", default = True,
+        description = "Draw the measured times above the nodes")
+
+    def profileNodeMemoryChanged(self, context):
+        from . events import executionCodeChanged
+        from . execution.memory_profiling import startTracing, stopTracing
+        if self.profileNodeMemory: startTracing()
+        else: stopTracing()
+        executionCodeChanged()
+
+    profileNodeMemory = BoolProperty(name = "Profile Node Memory", default = False,
+        description = "Trace the memory allocations of every node (makes the execution much slower)",
+        update = profileNodeMemoryChanged)
+
 
 class AddonPreferences(bpy.types.AddonPreferences):
     bl_idname = addonName
@@ -60,6 +82,29 @@ class AddonPreferences(bpy.types.AddonPreferences):
         name = "Generate Compact Code", default = False,
         description = "Avoid comments and blank lines (this has no impact on performance)")
 
+    def executionSettingChanged(self, context):
+        from . events import executionCodeChanged
+        executionCodeChanged()
+
+    incrementalExecution = BoolProperty(
+        name = "Incremental Execution", default = False,
+        description = "Skip pure nodes whose inputs did not change since the last execution",
+        update = executionSettingChanged)
+
+    parallelExecution = BoolProperty(
+        name = "Parallel Execution", default = False,
+        description = "Execute pure nodes of the main networks in a node tree in multiple threads (not used with Incremental Execution)",
+        update = executionSettingChanged)
+
+    constantFolding = BoolProperty(
+        name = "Constant Folding", default = True,
+        description = "Only execute pure nodes without linked inputs from other nodes again when one of their inputs or properties changed",
+        update = executionSettingChanged)
+
+    subprogramCacheMemoryLimit = IntProperty(
+        name = "Cache Memory Limit (MB)", default = 1024, min = 1,
+        description = "Remove the least recently used results of all Invoke Subprogram caches when they become larger together")
+
     nodeColors = PointerProperty(type = NodeColorProperties)
     developer = PointerProperty(type = DeveloperProperties)
 
@@ -80,6 +125,19 @@ class AddonPreferences(bpy.types.AddonPreferences):
         subcol = col.column(align = True)
         subcol.label("Execution Code:")
         subcol.prop(self, "generateCompactCode")
+        subcol.prop(self, "incrementalExecution")
+        subrow = subcol.row()
+        # the incremental execution code cannot be split into parts
+        subrow.active = not self.incrementalExecution
+        subrow.prop(self, "parallelExecution")
+        subrow = subcol.row()
+        # the incremental execution already skips unchanged nodes
+        subrow.active = not self.incrementalExecution
+        subrow.prop(self, "constantFolding")
+
+        subcol = col.column(align = True)
+        subcol.label("Subprogram Caches:")
+        subcol.prop(self, "subprogramCacheMemoryLimit", text = "Memory Limit (MB)")
 
         col = row.column()
 
@@ -99,9 +157,34 @@ def getPreferences():
 def generateCompactCode():
     return getPreferences().generateCompactCode
 
+def incrementalExecutionIsEnabled():
+    return getPreferences().incrementalExecution
+
+def parallelExecutionIsEnabled():
+    prefs = getPreferences()
+    return (prefs.parallelExecution and not prefs.incrementalExecution
+            and not measurementsForceSerialExecution())
+
+def constantFoldingIsEnabled():
+    prefs = getPreferences()
+    return prefs.constantFolding and not prefs.incrementalExecution
+
+def getSubprogramCacheMemoryLimit():
+    return getPreferences().subprogramCacheMemoryLimit * 1024 ** 2
+
+def measurementsForceSerialExecution():
+    # time and memory measurements are process wide, other threads would falsify them
+    return nodeTimeMeasurementIsEnabled() or nodeMemoryProfilingIsEnabled()
+
 def getDeveloperSettings():
     return getPreferences().developer
 
+def nodeTimeMeasurementIsEnabled():
+    return getDeveloperSettings().measureNodeTimes
+
+def nodeMemoryProfilingIsEnabled():
+    return getDeveloperSettings().profileNodeMemory
+
 def nodeColors():
     return getPreferences().nodeColors
 
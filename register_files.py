@@ -6,6 +6,8 @@ from . import id_keys
 from . import draw_handler
 from . ui import node_colors
 from . ui import node_panel
+from . execution import parallel as parallel_execution
+from . execution import parallel_loop
 from . operators import dynamic_operators
 from . base_types import node as node_base
 from . nodes.sound import bake as sound_bake
@@ -38,6 +40,8 @@ def unregisterFiles():
     dynamic_operators.unregister()
     node_panel.unregister()
     utils.handlers.unregisterHandlers()
+    parallel_execution.shutdownThreadPool()
+    parallel_loop.terminateProcessPool()
 
     unregisterMenu()
     keymap.unregister()
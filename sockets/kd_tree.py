@@ -1,5 +1,5 @@
 import bpy
-from mathutils.kdtree import KDTree
+from .. data_structures.kd_tree import KDTree
 from .. base_types.socket import AnimationNodeSocket
 
 class KDTreeSocket(bpy.types.NodeSocket, AnimationNodeSocket):
@@ -12,6 +12,4 @@ class KDTreeSocket(bpy.types.NodeSocket, AnimationNodeSocket):
     storable = True
 
     def getValue(self):
-        kdTree = KDTree(0)
-        kdTree.balance()
-        return kdTree
+        return KDTree.fromVectors([])
@@ -14,4 +14,5 @@ class VectorListSocket(bpy.types.NodeSocket, AnimationNodeSocket):
         return "[]"
 
     def getCopyExpression(self):
-        return "[element.copy() for element in value]"
+        # the value can be a list of vectors or a Vector3DList
+        return "animation_nodes.data_structures.vector_list.copyVectorList(value)"
@@ -0,0 +1,56 @@
+import io
+import numpy
+import unittest
+from mathutils import Vector, Matrix, Euler, Quaternion, Color
+from .. data_structures.vector_list import Vector3DList
+from .. execution.disk_cache import (serializeValue, deserializeValue,
+                                     extractArrays, writeCacheFile, readCacheFile)
+
+def getOutputs():
+    return [
+        None, True, 3, 2.5, "text",
+        (1, [2, "3"]),
+        Vector((1, 2, 3)),
+        Matrix.Translation((1, 2, 3)),
+        Euler((0.1, 0.2, 0.3), "YXZ"),
+        Quaternion((1, 0, 0, 0)),
+        Color((0.1, 0.2, 0.3)),
+        numpy.arange(12, dtype = numpy.float32).reshape(3, 4),
+        [Vector((i, 0, 1)) for i in range(4)],
+        [Matrix.Scale(i, 4) for i in range(1, 4)],
+        Vector3DList.fromNumpyArray(numpy.arange(9, dtype = numpy.float32)),
+        [] ]
+
+class TestSerialization(unittest.TestCase):
+    def assertOutputsEqual(self, outputs, expected):
+        self.assertEqual(len(outputs), len(expected))
+        for output, value in zip(outputs, expected):
+            self.assertEqual(type(output), type(value))
+            if isinstance(value, numpy.ndarray):
+                numpy.testing.assert_array_equal(output, value)
+            elif isinstance(value, Vector3DList):
+                numpy.testing.assert_array_equal(output.asNumpyArray(), value.asNumpyArray())
+            elif isinstance(value, Euler):
+                self.assertEqual((tuple(output), output.order), (tuple(value), value.order))
+            else:
+                self.assertEqual(output, value)
+
+    def testRoundTrip(self):
+        outputs = getOutputs()
+        self.assertOutputsEqual(deserializeValue(serializeValue(outputs)), outputs)
+
+    def testFileRoundTrip(self):
+        outputs = getOutputs()
+        structure, arrays = extractArrays(serializeValue(outputs))
+        self.assertEqual(len(arrays), 4)
+
+        file = io.BytesIO()
+        writeCacheFile(file, structure, arrays)
+        file.seek(0)
+        self.assertOutputsEqual(readCacheFile(file), outputs)
+
+    def testObjectsCannotBeStored(self):
+        with self.assertRaises(TypeError):
+            extractArrays(serializeValue([1, object()]))
+        with self.assertRaises(TypeError):
+            extractArrays(serializeValue(numpy.array([object()])))
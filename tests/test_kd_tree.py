@@ -0,0 +1,68 @@
+import numpy
+import unittest
+from .. data_structures.kd_tree import KDTree
+from .. data_structures.vector_list import Vector3DList
+
+class TestKDTreeBatchQueries(unittest.TestCase):
+    def setUp(self):
+        random = numpy.random.RandomState(0)
+        # some points are duplicated to have equal distances
+        self.points = numpy.concatenate((random.rand(500, 3), random.rand(20, 3).repeat(2, axis = 0)))
+        # the search vectors are converted to float32 by the tree as well
+        self.queries = (random.rand(100, 3) * 1.2 - 0.1).astype(numpy.float32).astype(numpy.float64)
+        self.tree = KDTree.fromVectors(Vector3DList.fromNumpyArray(self.points.astype(numpy.float32)))
+        self.points = self.tree.points
+
+    def getSortedDistances(self, query):
+        distances = numpy.sqrt(numpy.sum((self.points - query) ** 2, axis = 1))
+        order = numpy.lexsort((numpy.arange(len(distances)), distances))
+        return order, distances[order]
+
+    def testFindRange(self):
+        radius = 0.15
+        lengths, indices, distances = self.tree.batchFindRange(self.queries, radius)
+        self.assertEqual(len(lengths), len(self.queries))
+
+        start = 0
+        for query, length in zip(self.queries, lengths):
+            order, expectedDistances = self.getSortedDistances(query)
+            amount = numpy.sum(expectedDistances <= radius)
+            self.assertEqual(length, amount)
+            # points with equal distances can be in any order
+            self.assertEqual(set(indices[start:start + length]), set(order[:amount]))
+            numpy.testing.assert_allclose(distances[start:start + length], expectedDistances[:amount])
+            start += length
+
+    def testFindN(self):
+        for n in (1, 5, 40):
+            indices, distances = self.tree.batchFindN(self.queries, n)
+            self.assertEqual(indices.shape, (len(self.queries), n))
+            for query, foundIndices, foundDistances in zip(self.queries, indices, distances):
+                order, expectedDistances = self.getSortedDistances(query)
+                numpy.testing.assert_allclose(foundDistances, expectedDistances[:n])
+                numpy.testing.assert_allclose(numpy.sqrt(numpy.sum((self.points[foundIndices] - query) ** 2, axis = 1)), foundDistances)
+
+    def testFindNMoreThanPoints(self):
+        indices, distances = self.tree.batchFindN(self.queries[:3], len(self.points) + 10)
+        self.assertEqual(indices.shape, (3, len(self.points)))
+        for row in indices:
+            self.assertEqual(sorted(row), list(range(len(self.points))))
+
+    def testFind(self):
+        indices, distances = self.tree.batchFind(self.queries)
+        for query, index, distance in zip(self.queries, indices, distances):
+            order, expectedDistances = self.getSortedDistances(query)
+            self.assertAlmostEqual(distance, expectedDistances[0])
+            self.assertAlmostEqual(numpy.linalg.norm(self.points[index] - query), expectedDistances[0])
+
+    def testEmptyTree(self):
+        tree = KDTree.fromVectors(Vector3DList())
+        lengths, indices, distances = tree.batchFindRange(self.queries[:2], 1.0)
+        self.assertEqual(list(lengths), [0, 0])
+        self.assertEqual(len(indices), 0)
+        self.assertEqual(tree.batchFindN(self.queries[:2], 3)[0].shape, (2, 0))
+
+    def testTreeIsBuiltOnFirstBatchQuery(self):
+        self.assertIsNone(self.tree.order)
+        self.tree.batchFind(self.queries[:1])
+        self.assertIsNotNone(self.tree.order)
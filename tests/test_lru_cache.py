@@ -0,0 +1,92 @@
+import numpy
+import unittest
+from .. utils.lru_cache import LRUCache, trimCaches
+from .. nodes.system.invoke_subprogram import toCacheKey
+
+def newArray(megabytes):
+    return numpy.zeros(megabytes * 2 ** 20, dtype = numpy.uint8)
+
+class TestLRUCache(unittest.TestCase):
+    def testGetAndSet(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def testRemovesLeastRecentlyUsed(self):
+        cache = LRUCache(maxBytes = 3 * 2 ** 20)
+        cache.set("a", newArray(1))
+        cache.set("b", newArray(1))
+        cache.get("a")
+        cache.set("c", newArray(2))
+        self.assertEqual(list(cache.items), ["a", "c"])
+        self.assertEqual(cache.totalBytes, 3 * 2 ** 20)
+        self.assertEqual(cache.evictions, 1)
+
+    def testKeepsNewestItem(self):
+        cache = LRUCache(maxBytes = 2 ** 20)
+        cache.set("a", newArray(1))
+        cache.set("b", newArray(2))
+        self.assertEqual(list(cache.items), ["b"])
+
+    def testReplaceValue(self):
+        cache = LRUCache()
+        cache.set("a", newArray(1))
+        cache.set("a", newArray(2))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.totalBytes, 2 * 2 ** 20)
+
+    def testRemoveWhere(self):
+        cache = LRUCache()
+        for i in range(5):
+            cache.set(i, i)
+        cache.removeWhere(lambda key: key % 2 == 0)
+        self.assertEqual(list(cache.items), [1, 3])
+        self.assertEqual(cache.totalBytes, sum(cache.sizes.values()))
+
+
+class TestTrimCaches(unittest.TestCase):
+    def testRemovesOldestItemsOfAllCaches(self):
+        first, second = LRUCache(), LRUCache()
+        first.set("a", newArray(1))
+        second.set("b", newArray(1))
+        first.set("c", newArray(1))
+        second.set("d", newArray(1))
+        first.get("a")
+
+        trimCaches([first, second], 2 * 2 ** 20)
+        self.assertEqual(list(first.items), ["a"])
+        self.assertEqual(list(second.items), ["d"])
+
+    def testKeepsNewestItem(self):
+        first, second = LRUCache(), LRUCache()
+        first.set("a", newArray(1))
+        second.set("b", newArray(2))
+        trimCaches([first, second], 2 ** 20)
+        self.assertEqual((len(first), len(second)), (0, 1))
+
+    def testEmptyCaches(self):
+        trimCaches([LRUCache(), LRUCache()], 0)
+
+
+class TestCacheKey(unittest.TestCase):
+    def testEqualInputs(self):
+        inputs = [1, "a", [1.5, (2, 3)], numpy.arange(10)]
+        self.assertEqual(toCacheKey(inputs), toCacheKey([1, "a", [1.5, (2, 3)], numpy.arange(10)]))
+        self.assertEqual(hash(toCacheKey(inputs)), hash(toCacheKey(list(inputs))))
+
+    def testDifferentInputs(self):
+        self.assertNotEqual(toCacheKey([1, 2]), toCacheKey((1, 2)))
+        self.assertNotEqual(toCacheKey(numpy.arange(3)), toCacheKey(numpy.arange(3, dtype = numpy.float32)))
+        self.assertNotEqual(toCacheKey(numpy.zeros(4)), toCacheKey(numpy.zeros((2, 2))))
+        self.assertNotEqual(toCacheKey(numpy.arange(4)), toCacheKey(numpy.arange(1, 5)))
+
+    def testCacheRoundTrip(self):
+        cache = LRUCache()
+        cache.set(toCacheKey([numpy.arange(5), [1, 2]]), "result")
+        self.assertEqual(cache.get(toCacheKey([numpy.arange(5), [1, 2]])), (True, "result"))
+
+    def testUnhashableValue(self):
+        with self.assertRaises(TypeError):
+            toCacheKey([{"a" : 1}])
@@ -0,0 +1,41 @@
+import numpy
+import unittest
+from .. algorithms.spatial_hash import findCloseVertexEdges
+
+def findCloseVertexEdgesBruteForce(points, searchAmount, connections, minDistance, maxDistance):
+    edges = set()
+    for i in range(min(searchAmount, len(points))):
+        distances = numpy.sqrt(numpy.sum((points - points[i]) ** 2, axis = 1))
+        candidates = [j for j in numpy.lexsort((numpy.arange(len(points)), distances))
+                      if j != i and minDistance < distances[j] <= maxDistance]
+        for j in candidates[:connections]:
+            edges.add((min(i, j), max(i, j)))
+    return sorted(edges)
+
+class TestFindCloseVertexEdges(unittest.TestCase):
+    def setUp(self):
+        random = numpy.random.RandomState(1)
+        self.points = random.rand(300, 3) * 2
+
+    def compare(self, searchAmount, connections, minDistance, maxDistance, chunkSize = 20000):
+        edges = findCloseVertexEdges(self.points, searchAmount, connections, minDistance, maxDistance, chunkSize)
+        expected = findCloseVertexEdgesBruteForce(self.points, searchAmount, connections, minDistance, maxDistance)
+        self.assertEqual([tuple(edge) for edge in edges.tolist()], expected)
+
+    def testAllVertices(self):
+        self.compare(len(self.points), 4, 0.0, 0.3)
+
+    def testPartialSearch(self):
+        self.compare(50, 10, 0.1, 0.5)
+
+    def testSmallChunks(self):
+        self.compare(len(self.points), 3, 0.0, 0.4, chunkSize = 7)
+
+    def testNegativeCoordinates(self):
+        self.points -= 1.5
+        self.compare(len(self.points), 2, 0.05, 0.25)
+
+    def testNothingToConnect(self):
+        self.assertEqual(findCloseVertexEdges(self.points, 0, 3, 0, 1).shape, (0, 2))
+        self.assertEqual(findCloseVertexEdges(self.points, 10, 0, 0, 1).shape, (0, 2))
+        self.assertEqual(findCloseVertexEdges(self.points, 10, 3, 0, 0).shape, (0, 2))
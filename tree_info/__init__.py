@@ -7,9 +7,12 @@ def __setup():
     from . forest_data import ForestData
     from . networks import NodeNetworks
 
-    global _needsUpdate, _forestData, _networks
+    global _needsUpdate, _changedTreeNames, _updatedTreeNames, _forestData, _networks
 
     _needsUpdate = True
+    _changedTreeNames = set()
+    # None means that all trees have been updated
+    _updatedTreeNames = None
     _forestData = ForestData()
     _networks = NodeNetworks()
 
@@ -34,16 +37,46 @@ def update():
     _forestData.update()
     _networks.update(_forestData)
 
-    global _needsUpdate
+    global _needsUpdate, _updatedTreeNames
     _needsUpdate = False
+    _changedTreeNames.clear()
+    _updatedTreeNames = None
+
+@measureTime
+def updateTrees(treeNames):
+    global _updatedTreeNames
+    updatedTreeNames = _forestData.updateTrees(treeNames)
+    onlyTreesUpdated = _networks.updateTrees(_forestData, updatedTreeNames)
+    _changedTreeNames.clear()
+
+    if not onlyTreesUpdated:
+        _updatedTreeNames = None
+    elif _updatedTreeNames is not None:
+        _updatedTreeNames.update(updatedTreeNames)
 
 def updateIfNecessary():
     if _needsUpdate:
         update()
-
-def treeChanged():
+    elif len(_changedTreeNames) > 0:
+        updateTrees(_changedTreeNames)
+
+def popUpdatedTreeNames():
+    '''
+    Returns the names of all trees that have been updated since the last call.
+    None means that all trees have been updated.
+    '''
+    global _updatedTreeNames
+    treeNames = _updatedTreeNames
+    _updatedTreeNames = set()
+    return treeNames
+
+def treeChanged(tree = None):
+    '''
+    When the changed tree is known, only its data will be updated.
+    '''
     global _needsUpdate
-    _needsUpdate = True
+    if tree is None: _needsUpdate = True
+    else: _changedTreeNames.add(tree.name)
 
 
 
@@ -21,36 +21,76 @@ class ForestData:
         self.dataTypeBySocket = dict()
         self.socketsThatNeedUpdate = set()
 
+        self.rerouteNodes = self.nodesByType["NodeReroute"]
+        self.nodesByTree = defaultdict(list)
+        self.nodesByIdentifier = defaultdict(list)
+        self.identifierByNode = dict()
+
     def update(self):
         self._reset()
         self.insertNodeTrees()
-        self.rerouteNodes = self.nodesByType["NodeReroute"]
-        self.findLinksSkippingReroutes()
+        self.findLinksSkippingReroutes(self.nodes)
+
+    def updateTrees(self, treeNames):
+        '''
+        Only rebuild the data of the given trees.
+        Trees that have been added or removed are updated as well.
+        Returns the names of all trees that have been updated.
+        '''
+        trees = {tree.name : tree for tree in getAnimationNodeTrees()}
+        knownTreeNames = set(self.nodesByTree.keys())
+        treeNames = set(treeNames)
+        treeNames.update(knownTreeNames.symmetric_difference(trees.keys()))
+
+        for treeName in treeNames:
+            self.removeNodeTree(treeName)
+
+        newNodes = []
+        for treeName in treeNames:
+            if treeName in trees:
+                newNodes.extend(self.insertNodeTree(trees[treeName]))
+
+        self.nodes = list(chain.from_iterable(self.nodesByTree.values()))
+        self.findLinksSkippingReroutes(newNodes)
+        return treeNames
 
     def insertNodeTrees(self):
         for tree in getAnimationNodeTrees():
-            self.insertNodes(tree.nodes)
-            self.insertLinks(tree.links)
+            self.insertNodeTree(tree)
+
+    def insertNodeTree(self, tree):
+        nodeIDs = self.insertNodes(tree.nodes)
+        self.insertLinks(tree.links)
+        self.nodesByTree[tree.name] = nodeIDs
+        return nodeIDs
 
     def insertNodes(self, nodes):
         appendNode = self.nodes.append
         nodesByType = self.nodesByType
         typeByNode = self.typeByNode
         nodeByIdentifier = self.nodeByIdentifier
+        nodesByIdentifier = self.nodesByIdentifier
+        identifierByNode = self.identifierByNode
         socketsByNode = self.socketsByNode
         reroutePairs = self.reroutePairs
         dataTypeBySocket = self.dataTypeBySocket
         socketsThatNeedUpdate = self.socketsThatNeedUpdate
 
+        insertedNodeIDs = []
         for node in nodes:
             nodeID = node.toID()
             inputIDs = [socket.toID() for socket in node.inputs]
             outputIDs = [socket.toID() for socket in node.outputs]
 
             appendNode(nodeID)
+            insertedNodeIDs.append(nodeID)
             typeByNode[nodeID] = node.bl_idname
             nodesByType[node.bl_idname].add(nodeID)
-            nodeByIdentifier[getattr(node, "identifier", None)] = nodeID
+
+            identifier = getattr(node, "identifier", None)
+            nodeByIdentifier[identifier] = nodeID
+            nodesByIdentifier[identifier].append(nodeID)
+            identifierByNode[nodeID] = identifier
 
             socketsByNode[nodeID] = (inputIDs, outputIDs)
 
@@ -65,6 +105,7 @@ class ForestData:
                         if hasattr(socket, "updateProperty"):
                             socketsThatNeedUpdate.add(socketID)
 
+        return insertedNodeIDs
 
     def insertLinks(self, links):
         linkedSocketsWithReroutes = self.linkedSocketsWithReroutes
@@ -76,9 +117,32 @@ class ForestData:
             linkedSocketsWithReroutes[originID].append(targetID)
             linkedSocketsWithReroutes[targetID].append(originID)
 
-    def findLinksSkippingReroutes(self):
+    def removeNodeTree(self, treeName):
+        # links never connect nodes of different trees
+        for nodeID in self.nodesByTree.pop(treeName, []):
+            self.nodesByType[self.typeByNode.pop(nodeID)].discard(nodeID)
+            self.removeNodeIdentifier(nodeID)
+
+            for socketID in chain.from_iterable(self.socketsByNode.pop(nodeID)):
+                self.linkedSockets.pop(socketID, None)
+                self.linkedSocketsWithReroutes.pop(socketID, None)
+                self.reroutePairs.pop(socketID, None)
+                self.dataTypeBySocket.pop(socketID, None)
+                self.socketsThatNeedUpdate.discard(socketID)
+
+    def removeNodeIdentifier(self, nodeID):
+        identifier = self.identifierByNode.pop(nodeID)
+        nodeIDs = self.nodesByIdentifier[identifier]
+        nodeIDs.remove(nodeID)
+        if len(nodeIDs) == 0:
+            del self.nodesByIdentifier[identifier]
+            del self.nodeByIdentifier[identifier]
+        else:
+            self.nodeByIdentifier[identifier] = nodeIDs[-1]
+
+    def findLinksSkippingReroutes(self, nodes):
         rerouteNodes = self.rerouteNodes
-        nonRerouteNodes = filter(lambda n: n not in rerouteNodes, self.nodes)
+        nonRerouteNodes = filter(lambda n: n not in rerouteNodes, nodes)
 
         socketsByNode = self.socketsByNode
         linkedSockets = self.linkedSockets
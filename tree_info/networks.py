@@ -13,23 +13,52 @@ class NodeNetworks:
     def update(self, forestData):
         self._reset()
         self.forestData = forestData
+        self.insertNetworks(self.createNetworks(forestData.nodes))
 
+    def updateTrees(self, forestData, treeNames):
+        '''
+        Only recompute the networks of the given trees.
+        Falls back to a full update when a subprogram would
+        have to be joined with networks of other trees.
+        Returns False when all networks have been recomputed.
+        '''
+        self.forestData = forestData
+
+        remainingNetworks = [network for network in self.networks if network.treeName not in treeNames]
+        nodes = chain.from_iterable(forestData.nodesByTree.get(treeName, []) for treeName in treeNames)
+        newNetworks = self.createNetworks(nodes)
+
+        newIdentifiers = {network.identifier for network in newNetworks}
+        remainingIdentifiers = {network.identifier for network in remainingNetworks}
+        if len(newIdentifiers.intersection(remainingIdentifiers) - {None}) > 0:
+            self.update(forestData)
+            return False
+
+        self._reset()
+        self.insertNetworks(remainingNetworks + newNetworks)
+        return True
+
+    def createNetworks(self, nodes):
+        networks = []
         networksByIdentifier = defaultdict(list)
-        for nodes in self.iterNodeGroups():
-            if not self.groupContainsAnimationNodes(nodes): continue
+        for nodeGroup in self.iterNodeGroups(nodes):
+            if not self.groupContainsAnimationNodes(nodeGroup): continue
 
-            network = NodeNetwork(nodes, self.forestData)
+            network = NodeNetwork(nodeGroup, self.forestData)
             networksByIdentifier[network.identifier].append(network)
 
-        for identifier, networks in networksByIdentifier.items():
+        for identifier, networksWithIdentifier in networksByIdentifier.items():
             if identifier is None:
                 # this are the main networks
-                self.networks.extend(networks)
+                networks.extend(networksWithIdentifier)
             else:
                 # join subprogram networks if they are not connected with links
-                self.networks.append(NodeNetwork.join(networks))
+                networks.append(NodeNetwork.join(networksWithIdentifier))
+        return networks
 
-        for network in self.networks:
+    def insertNetworks(self, networks):
+        self.networks.extend(networks)
+        for network in networks:
             for nodeID in network.nodeIDs:
                 self.networkByNode[nodeID] = network
 
@@ -38,9 +67,9 @@ class NodeNetworks:
         nonAnimationNodes = ("NodeFrame", "NodeReroute")
         return any(typeByNode[node] not in nonAnimationNodes for node in nodes)
 
-    def iterNodeGroups(self):
+    def iterNodeGroups(self, nodes):
         foundNodes = set()
-        for node in self.forestData.nodes:
+        for node in nodes:
             if node not in foundNodes:
                 nodeGroup = self.getAllConnectedNodes(node)
                 foundNodes.update(nodeGroup)
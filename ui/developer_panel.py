@@ -1,5 +1,8 @@
 import bpy
-from .. preferences import getDeveloperSettings
+from .. tree_info import getNodeByIdentifier
+from .. preferences import getDeveloperSettings, measurementsForceSerialExecution
+from .. execution.measurements import getSlowestNodes
+from .. execution.memory_profiling import getMemoryReport, getSortKey
 
 class DeveloperPanel(bpy.types.Panel):
     bl_idname = "an_developer_panel"
@@ -32,3 +35,49 @@ class DeveloperPanel(bpy.types.Panel):
         row.operator("an.print_profile_execution_result", text = "Print", icon = "CONSOLE")
         row.operator("an.write_profile_execution_result", text = "Write", icon = "TEXT")
         layout.prop(getDeveloperSettings(), "profilingSortMode", text = "Sort")
+
+        layout.separator()
+
+        settings = getDeveloperSettings()
+        col = layout.column()
+        col.label("Node Times:")
+        row = col.row(align = True)
+        row.prop(settings, "measureNodeTimes", text = "Measure")
+        row.prop(settings, "showNodeTimes", text = "Show")
+        col.operator("an.reset_node_time_measurements", text = "Reset", icon = "X")
+
+        if settings.measureNodeTimes:
+            self.drawSlowestNodes(layout)
+
+        layout.separator()
+
+        col = layout.column()
+        col.label("Node Memory ({}):".format("Peak" if getSortKey() == "peakBytes" else "Allocated"))
+        col.prop(settings, "profileNodeMemory", text = "Profile")
+        row = col.row(align = True)
+        row.operator("an.reset_node_memory_records", text = "Reset", icon = "X")
+        row.operator("an.write_node_memory_report", text = "Write", icon = "TEXT")
+
+        if settings.profileNodeMemory:
+            self.drawLargestNodes(layout)
+
+        if measurementsForceSerialExecution():
+            layout.label("Measuring: parallel execution is off", icon = "INFO")
+
+    def drawSlowestNodes(self, layout):
+        col = layout.column(align = True)
+        for identifier, measurement in getSlowestNodes(10):
+            try: name = getNodeByIdentifier(identifier).name
+            except: continue
+            row = col.row()
+            row.label(name)
+            row.label("{:.2f} ms".format(measurement.totalTime * 1000))
+
+    def drawLargestNodes(self, layout):
+        col = layout.column(align = True)
+        for item in getMemoryReport(10):
+            try: name = getNodeByIdentifier(item["identifier"]).name
+            except: continue
+            row = col.row()
+            row.label(name)
+            row.label("{:.2f} MB".format(item[getSortKey()] / 1024 ** 2))
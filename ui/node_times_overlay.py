@@ -0,0 +1,32 @@
+import bpy
+from .. graphics.drawing_2d import drawText
+from .. execution.measurements import getNodeMeasurements
+from .. utils.blender_ui import convertToRegionLocation, getDpiFactor
+from .. preferences import getDeveloperSettings, nodeTimeMeasurementIsEnabled
+
+def drawNodeTimes():
+    if not nodeTimeMeasurementIsEnabled(): return
+    if not getDeveloperSettings().showNodeTimes: return
+
+    tree = bpy.context.space_data.node_tree
+    if getattr(tree, "bl_idname", "") != "an_AnimationNodeTree": return
+
+    measurements = getNodeMeasurements()
+    if len(measurements) == 0: return
+    maxTime = max(measurement.totalTime for measurement in measurements.values()) or 1
+
+    region = bpy.context.region
+    for node in tree.nodes:
+        measurement = measurements.get(getattr(node, "identifier", None))
+        if measurement is None or node.hide: continue
+        drawNodeTime(region, node, measurement, measurement.totalTime / maxTime)
+
+def drawNodeTime(region, node, measurement, relativeTime):
+    location = node.viewLocation
+    position = convertToRegionLocation(region, location.x, location.y)
+    text = "{:.2f} ms  ({}x, {:.3f} ms avg)".format(
+        measurement.totalTime * 1000, measurement.calls, measurement.averageTime * 1000)
+
+    # slow nodes are red, fast nodes are white
+    color = (1, 1 - relativeTime * 0.8, 1 - relativeTime * 0.8, 1)
+    drawText(text, position.x, position.y + 5 * getDpiFactor(), size = 11, color = color)
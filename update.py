@@ -1,31 +1,78 @@
 from . import problems
 from . import tree_info
+from itertools import chain
+from collections import defaultdict
 from . ui import node_colors
 from . utils.timing import measureTime
 from . nodes.system import subprogram_sockets
-from . execution.units import createExecutionUnits
 from . node_link_conversion import correctForbiddenNodeLinks
 from . utils.nodes import iterAnimationNodes, getAnimationNodeTrees
+from . execution.units import createExecutionUnits, getSubprogramIdentifiersInTrees
+
+# None means that the units of all trees are outdated
+_treeNamesWithOutdatedUnits = set()
+_nodeProblemsByTree = defaultdict(list)
 
 @measureTime
 def updateEverything():
     '''
     Call when the node tree changed in a way that the execution code does
     not work anymore.
+    Only trees that changed since the last call are updated.
     '''
-    tree_info.update()
+    tree_info.updateIfNecessary()
+    treeNames = tree_info.popUpdatedTreeNames()
     problems.reset()
     enableUseFakeUser()
-    callNodeEditFunctions()
+    callNodeEditFunctions(treeNames)
     correctForbiddenNodeLinks()
     subprogram_sockets.updateIfNecessary()
     checkIfNodeTreeIsLinked()
     checkUndefinedNodes()
-    checkNetworks()
+
+    treeNames = joinTreeNames(treeNames, tree_info.popUpdatedTreeNames())
+    treeNames = extendByInvokingTrees(treeNames)
+
+    checkNetworks(treeNames)
     checkIdentifiers()
 
+    global _treeNamesWithOutdatedUnits
+    _treeNamesWithOutdatedUnits = joinTreeNames(_treeNamesWithOutdatedUnits, treeNames)
     if problems.canCreateExecutionUnits():
-        createExecutionUnits()
+        createExecutionUnits(_treeNamesWithOutdatedUnits)
+        _treeNamesWithOutdatedUnits = set()
+
+
+def joinTreeNames(a, b):
+    if a is None or b is None: return None
+    return a | b
+
+def extendByInvokingTrees(treeNames):
+    '''
+    Trees that invoke a subprogram of a changed tree have to be updated as well.
+    '''
+    if treeNames is None: return None
+
+    identifiers = set(getSubprogramIdentifiersInTrees(treeNames))
+    for network in tree_info.getSubprogramNetworks():
+        if network.treeName in treeNames:
+            identifiers.add(network.identifier)
+    if len(identifiers) == 0: return treeNames
+
+    extendedTreeNames = set(treeNames)
+    for node in tree_info.getNodesByType("an_InvokeSubprogramNode"):
+        if node.subprogramIdentifier in identifiers:
+            extendedTreeNames.add(node.id_data.name)
+    return extendedTreeNames
+
+def iterAnimationNodesInTrees(treeNames):
+    if treeNames is None:
+        yield from iterAnimationNodes()
+    else:
+        for tree in getAnimationNodeTrees():
+            if tree.name not in treeNames: continue
+            for node in tree.nodes:
+                if node.isAnimationNode: yield node
 
 
 def enableUseFakeUser():
@@ -33,22 +80,32 @@ def enableUseFakeUser():
     for tree in getAnimationNodeTrees():
         tree.use_fake_user = True
 
-def callNodeEditFunctions():
+def callNodeEditFunctions(treeNames = None):
     tree_info.updateIfNecessary()
-    for node in iterAnimationNodes():
+    for node in iterAnimationNodesInTrees(treeNames):
         node.edit()
         tree_info.updateIfNecessary()
 
-def checkNetworks():
+def checkNetworks(treeNames = None):
     invalidNetworkExists = False
 
+    if treeNames is None: _nodeProblemsByTree.clear()
+    else:
+        for treeName in treeNames:
+            _nodeProblemsByTree.pop(treeName, None)
+
     for network in tree_info.getNetworks():
         if network.type == "Invalid":
             invalidNetworkExists = True
+        if treeNames is not None and network.treeName not in treeNames: continue
         nodes = network.getAnimationNodes()
         markInvalidNodes(network, nodes)
         node_colors.colorNetwork(network, nodes)
-        checkNodeOptions(network, nodes)
+        _nodeProblemsByTree[network.treeName].extend(checkNodeOptions(network, nodes))
+
+    # problems of unchanged trees are still valid
+    for problem in chain.from_iterable(_nodeProblemsByTree.values()):
+        problem.report()
 
     if invalidNetworkExists:
         problems.InvalidNetworksExist().report()
@@ -61,11 +118,11 @@ def markInvalidNodes(network, nodes):
 def checkNodeOptions(network, nodes):
     for node in nodes:
         if "No Execution" in node.options:
-            problems.NodeDoesNotSupportExecution(node.identifier).report()
+            yield problems.NodeDoesNotSupportExecution(node.identifier)
         if "No Subprogram" in node.options and network.type in ("Group", "Loop"):
-            problems.NodeMustNotBeInSubprogram(node.identifier).report()
+            yield problems.NodeMustNotBeInSubprogram(node.identifier)
         if "No Auto Execution" in node.options:
-            problems.NodeShouldNotBeUsedInAutoExecution(node.identifier).report()
+            yield problems.NodeShouldNotBeUsedInAutoExecution(node.identifier)
 
 def checkIdentifiers():
     identifierAmount = tree_info.getIdentifierAmount()
@@ -82,4 +139,4 @@ def checkIfNodeTreeIsLinked():
 def checkUndefinedNodes():
     undefinedNodes = tree_info.getUndefinedNodes()
     if len(undefinedNodes) > 0:
-        problems.UndefinedNodeExists(undefinedNodes).report()        
+        problems.UndefinedNodeExists(undefinedNodes).report()
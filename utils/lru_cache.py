@@ -0,0 +1,130 @@
+import sys
+import numpy
+import itertools
+from collections import OrderedDict
+
+# orders the usages of the items of all caches
+_usageCounter = itertools.count()
+
+class LRUCache:
+    '''
+    Removes the least recently used items when the
+    estimated size of all values exceeds the memory limit.
+    '''
+    def __init__(self, maxBytes = None):
+        self.maxBytes = maxBytes
+        self.items = OrderedDict()
+        self.sizes = {}
+        self.usages = {}
+        self.totalBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        '''Returns (found, value)'''
+        try: value = self.items[key]
+        except KeyError:
+            self.misses += 1
+            return False, None
+        self.items.move_to_end(key)
+        self.usages[key] = next(_usageCounter)
+        self.hits += 1
+        return True, value
+
+    def set(self, key, value):
+        self.remove(key)
+        size = estimateSize(value)
+        self.items[key] = value
+        self.sizes[key] = size
+        self.usages[key] = next(_usageCounter)
+        self.totalBytes += size
+        self.trim()
+
+    def remove(self, key):
+        if key in self.items:
+            del self.items[key]
+            del self.usages[key]
+            self.totalBytes -= self.sizes.pop(key)
+
+    def removeWhere(self, predicate):
+        for key in [key for key in self.items if predicate(key)]:
+            self.remove(key)
+            self.evictions += 1
+
+    def trim(self):
+        if self.maxBytes is None: return
+        # the newest item is kept even when it is larger than the limit
+        while self.totalBytes > self.maxBytes and len(self.items) > 1:
+            self.removeLeastRecentlyUsed()
+
+    def removeLeastRecentlyUsed(self):
+        key = next(iter(self.items))
+        self.remove(key)
+        self.evictions += 1
+
+    def getOldestUsage(self):
+        return self.usages[next(iter(self.items))]
+
+    def clear(self):
+        self.items.clear()
+        self.sizes.clear()
+        self.usages.clear()
+        self.totalBytes = 0
+
+    def resetStatistics(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+
+def trimCaches(caches, maxBytes):
+    '''
+    Removes the least recently used items of all caches until their
+    values fit into the memory limit together. The newest item is kept.
+    '''
+    caches = [cache for cache in caches if len(cache) > 0]
+    totalBytes = sum(cache.totalBytes for cache in caches)
+    while totalBytes > maxBytes and sum(len(cache) for cache in caches) > 1:
+        cache = min(caches, key = LRUCache.getOldestUsage)
+        oldBytes = cache.totalBytes
+        cache.removeLeastRecentlyUsed()
+        totalBytes -= oldBytes - cache.totalBytes
+        if len(cache) == 0: caches.remove(cache)
+
+
+def estimateSize(value, depth = 0, sampleAmount = 100):
+    '''
+    Rough estimation of the memory a value uses.
+    Long sequences are estimated from their first elements.
+    '''
+    if isinstance(value, numpy.ndarray):
+        return value.nbytes
+
+    size = sys.getsizeof(value)
+    if depth > 4 or isinstance(value, (str, bytes, int, float, bool)): return size
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + estimateSizeOfElements(value, len(value), depth, sampleAmount)
+    if isinstance(value, dict):
+        return size + estimateSizeOfElements(value.items(), len(value), depth, sampleAmount)
+
+    attributes = getattr(type(value), "__slots__", ())
+    if isinstance(attributes, str): attributes = (attributes, )
+    values = [getattr(value, name, None) for name in attributes]
+    values.extend(getattr(value, "__dict__", {}).values())
+    return size + sum(estimateSize(element, depth + 1, sampleAmount) for element in values)
+
+def estimateSizeOfElements(elements, length, depth, sampleAmount):
+    if length == 0: return 0
+    sampleSize = 0
+    for i, element in enumerate(elements):
+        if i == sampleAmount: break
+        sampleSize += estimateSize(element, depth + 1, sampleAmount)
+    return int(sampleSize / min(length, sampleAmount) * length)
@@ -1,3 +1,4 @@
+import numpy
 from mathutils import Matrix, Euler
 
 def composeMatrix(location, rotation, scale):
@@ -31,3 +32,34 @@ def mixEulers(a, b, factor):
     y = a.y * (1 - factor) + b.y * factor
     z = a.z * (1 - factor) + b.z * factor
     return Euler((x, y, z), a.order)
+
+
+# Batched Transformations
+##########################################
+
+def transformVectorArray(vectors, matrix):
+    '''
+    Transform a Nx3 array of locations with a 4x4 matrix.
+    Gives the same result as 'matrix * vector' for every row.
+    '''
+    matrix = numpy.array(matrix, dtype = numpy.float32)
+    result = numpy.dot(vectors, matrix[:3, :3].T)
+    result += matrix[:3, 3]
+    return result
+
+def transformNormalArray(normals, matrix):
+    '''
+    Transform a Nx3 array of normals with the inverse transpose
+    of the matrix and normalize the result.
+    '''
+    result = numpy.dot(normals, getNormalMatrix(matrix).T)
+    lengths = numpy.sqrt(numpy.einsum("ij,ij->i", result, result))
+    lengths[lengths == 0] = 1
+    result /= lengths[:, numpy.newaxis]
+    return result
+
+def getNormalMatrix(matrix):
+    matrix = numpy.array(matrix, dtype = numpy.float64)[:3, :3]
+    try: inverted = numpy.linalg.inv(matrix)
+    except numpy.linalg.LinAlgError: inverted = numpy.linalg.pinv(matrix)
+    return inverted.T.astype(numpy.float32)
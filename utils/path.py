@@ -1,5 +1,6 @@
 import bpy
 import os
+from .. preferences import addonName
 
 def getAbsolutePathOfSound(sound):
     return toAbsolutePath(sound.filepath, library = sound.library)
@@ -10,3 +11,15 @@ def toAbsolutePath(path, start = None, library = None):
 
 def toIDPropertyPath(name):
     return '["' + name + '"]'
+
+def getAddonDataDirectory(name):
+    '''
+    Returns a directory in the user data folder of Blender
+    or None when it cannot be created.
+    '''
+    try:
+        directory = bpy.utils.user_resource("DATAFILES", os.path.join(addonName, name), create = True)
+        if directory and os.path.isdir(directory):
+            return directory
+    except: pass
+    return None